@@ -26,7 +26,14 @@ extensions = [
         extra_compile_args=["/d2FH4-"] if sys.platform == "win32" else [],
         define_macros=[("Py_LIMITED_API", 0x030D0000)] if use_limited_api else [],
         py_limited_api=use_limited_api,
-    )
+    ),
+    Extension(
+        "psd_tools.psd._descriptor",
+        ["src/psd_tools/psd/_descriptor.pyx"],
+        extra_compile_args=["/d2FH4-"] if sys.platform == "win32" else [],
+        define_macros=[("Py_LIMITED_API", 0x030D0000)] if use_limited_api else [],
+        py_limited_api=use_limited_api,
+    ),
 ]
 
 
@@ -0,0 +1,542 @@
+"""
+On-disk cache of parsed document structure.
+
+Re-opening the same large document repeatedly spends most of its time parsing
+layer records and tagged blocks. :py:class:`IndexCache` keeps an index of each
+document in a directory, keyed by the file path, size and modification time,
+so that the layer tree can be rebuilt without parsing the file again.
+
+An index entry is plain binary data: the file header, and for each layer
+record its bounding box, channels, blend mode, opacity, flags, mask, name,
+the undecoded data of its tagged blocks and the byte ranges of its channel
+data. On a hit the records are rebuilt from the index, and tagged blocks are
+decoded on first access as with ``lazy=True``. Pixel data is never cached;
+channel and image data are read from the document on access, as with
+``load_pixels=False``.
+
+Example usage::
+
+    import os
+    from psd_tools import PSDImage
+
+    directory = os.path.expanduser('~/.cache/psd-index')
+    psd = PSDImage.open('template.psb', index_cache=directory)
+
+    # Or, with an explicit size limit and access to the counters.
+    from psd_tools.api.index_cache import IndexCache
+
+    cache = IndexCache(directory, max_size=64 * 1024 * 1024)
+    psd = PSDImage.open('template.psb', index_cache=cache)
+    print(cache.hits, cache.misses)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import time
+from typing import Any
+
+from attrs import astuple
+
+from psd_tools.api.utils import file_signature
+from psd_tools.constants import Tag
+from psd_tools.psd import PSD
+from psd_tools.psd.bin_utils import FileSlice
+from psd_tools.psd.color_mode_data import ColorModeData
+from psd_tools.psd.header import FileHeader
+from psd_tools.psd.image_data import ImageData
+from psd_tools.psd.image_resources import ImageResources
+from psd_tools.psd.layer_and_mask import (
+    ChannelData,
+    ChannelDataList,
+    ChannelImageData,
+    ChannelInfo,
+    GlobalLayerMaskInfo,
+    LayerAndMaskInformation,
+    LayerBlendingRanges,
+    LayerFlags,
+    LayerInfo,
+    LayerInfoBlock,
+    LayerRecord,
+    LayerRecords,
+    MaskData,
+)
+from psd_tools.psd.tagged_blocks import TaggedBlock, TaggedBlocks
+
+logger = logging.getLogger(__name__)
+
+#: Default limit on the total size of the entries in a cache directory.
+DEFAULT_MAX_SIZE: int = 256 * 1024 * 1024
+
+_MAGIC = b"PSDIDX02"
+_SUFFIX = ".idx"
+
+# Size and modification time of the document.
+_STAMP = struct.Struct(">Qq")
+_COUNT = struct.Struct(">I")
+_OFFSET = struct.Struct(">Q")
+# Layer count and number of records.
+_LAYER_INFO = struct.Struct(">hI")
+# Bounding box and number of channels.
+_RECORD = struct.Struct(">4iH")
+_CHANNEL_INFO = struct.Struct(">hQ")
+# Signature, blend mode, opacity, clipping and flags.
+_BLENDING = struct.Struct(">4s4sBB8?")
+# Number of channel blending ranges, or _NO_RANGES.
+_RANGES = struct.Struct(">H")
+_NO_RANGES = 0xFFFF
+# Compression, offset of the channel data block or -1, and data length.
+_CHANNEL = struct.Struct(">HqQ")
+# Kind, signature, key, version, offset and length of a tagged block.
+_BLOCK = struct.Struct(">B4s4sBQQ")
+
+# Tagged block kinds: a byte range of the file or bytes decoded on access,
+# raw bytes of an unknown block, or layer records nested in the block.
+_PENDING_RANGE, _PENDING_BYTES, _RAW, _LAYERS = range(4)
+
+# Header flags of the layer and mask information section.
+_HAS_LAYER_INFO, _HAS_GLOBAL_MASK, _HAS_TAGGED_BLOCKS = 1, 2, 4
+
+_TAGS = {tag.value: tag for tag in Tag}
+
+_caches: dict[str, IndexCache] = {}
+
+
+class IndexCache:
+    """
+    Directory of document indexes.
+
+    Each entry records the size and modification time of the document it was
+    made from; an entry that no longer matches the document is a miss and is
+    replaced. When the total size of the entries exceeds ``max_size``, the
+    least recently used entries are removed.
+
+    :param directory: cache directory, created if missing.
+    :param max_size: limit on the total size of the entries in bytes.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        #: Number of documents read from the cache.
+        self.hits = 0
+        #: Number of documents parsed because no valid entry was found.
+        self.misses = 0
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return "%s(%r, hits=%d, misses=%d)" % (
+            self.__class__.__name__,
+            self.directory,
+            self.hits,
+            self.misses,
+        )
+
+    def read(self, path: str | bytes | os.PathLike, **kwargs: Any) -> PSD:
+        """
+        Read the structure of a document, from the cache when possible.
+
+        Tagged blocks are decoded on access and pixel data is read from the
+        file on access, as with ``lazy=True, load_pixels=False``.
+
+        :param path: path of the document.
+        :param kwargs: options for :py:meth:`PSD.read <psd_tools.psd.PSD.read>`.
+        :return: :py:class:`~psd_tools.psd.PSD`
+        """
+        path = os.path.abspath(os.fsdecode(path))
+        stamp = file_signature(path)
+        entry = self._entry_path(path, kwargs)
+
+        psd = self._load(entry, stamp, path, kwargs.get("encoding", "macroman"))
+        if psd is not None:
+            self.hits += 1
+            _touch(entry)
+            return psd
+
+        self.misses += 1
+        kwargs["lazy"] = True
+        with open(path, "rb") as f:
+            psd = PSD.read(f, load_pixels=False, **kwargs)
+        self._store(entry, stamp, psd)
+        return psd
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in bytes."""
+        return sum(os.path.getsize(entry) for entry in self._entries())
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        for entry in self._entries():
+            _remove(entry)
+
+    def _entry_path(self, path: str, options: dict[str, Any]) -> str:
+        key = repr((path, sorted(options.items()))).encode("utf-8")
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + _SUFFIX)
+
+    def _entries(self) -> list[str]:
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(_SUFFIX)
+        ]
+
+    def _load(
+        self, entry: str, stamp: tuple[int, int], path: str, encoding: str
+    ) -> PSD | None:
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            if data[: len(_MAGIC)] != _MAGIC:
+                raise ValueError("Invalid index header")
+            reader = _Reader(data, len(_MAGIC), path)
+            if reader.unpack(_STAMP) != stamp:
+                logger.debug("Stale index %s", entry)
+                return None
+            return reader.document(encoding)
+        except Exception as e:
+            logger.warning("Failed to read index %s: %s", entry, e)
+            return None
+
+    def _store(self, entry: str, stamp: tuple[int, int], psd: PSD) -> None:
+        try:
+            writer = _Writer()
+            writer.pack(_STAMP, *stamp)
+            writer.document(psd)
+        except Exception as e:
+            logger.warning("Failed to index the document: %s", e)
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_MAGIC)
+                f.write(writer.data)
+            os.replace(temp_path, entry)
+            _touch(entry)
+        except Exception as e:
+            logger.warning("Failed to write index %s: %s", entry, e)
+            _remove(temp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            logger.debug("Evicting index %s", entry)
+            _remove(entry)
+            total -= size
+
+
+def get_index_cache(directory: str | os.PathLike) -> IndexCache:
+    """
+    Get the shared :py:class:`IndexCache` of a directory.
+
+    :py:meth:`PSDImage.open <psd_tools.api.psd_image.PSDImage.open>` uses
+    this when ``index_cache`` is a directory, so the counters accumulate
+    across calls.
+
+    :param directory: cache directory.
+    :return: :py:class:`IndexCache`
+    """
+    key = os.path.abspath(directory)
+    if key not in _caches:
+        _caches[key] = IndexCache(key)
+    return _caches[key]
+
+
+class _Writer:
+    """Encoder of the index of a document read with ``lazy=True, load_pixels=False``."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values: Any) -> None:
+        self.data += fmt.pack(*values)
+
+    def blob(self, value: bytes) -> None:
+        self.pack(_COUNT, len(value))
+        self.data += value
+
+    def document(self, psd: PSD) -> None:
+        self.blob(psd.header.tobytes())
+        self.blob(psd.color_mode_data.value)
+
+        info = psd.layer_and_mask_information
+        flags = (
+            (_HAS_LAYER_INFO if info.layer_info is not None else 0)
+            | (_HAS_GLOBAL_MASK if info.global_layer_mask_info is not None else 0)
+            | (_HAS_TAGGED_BLOCKS if info.tagged_blocks is not None else 0)
+        )
+        self.pack(_COUNT, flags)
+        if info.layer_info is not None:
+            self.layer_info(info.layer_info)
+        if info.global_layer_mask_info is not None:
+            self.blob(info.global_layer_mask_info.tobytes())
+        if info.tagged_blocks is not None:
+            self.tagged_blocks(info.tagged_blocks)
+
+        image_data = psd.image_data
+        self.pack(_COUNT, image_data.compression.value)
+        self.file_slice(image_data._data)
+
+    def file_slice(self, value: Any) -> None:
+        if not isinstance(value, FileSlice):
+            raise ValueError("Expected data in the file, got %s" % type(value))
+        self.pack(_OFFSET, value.offset)
+        self.pack(_OFFSET, value.length)
+
+    def blending_ranges(self, value: LayerBlendingRanges) -> None:
+        if value.composite_ranges is None:
+            self.pack(_RANGES, _NO_RANGES)
+            return
+        ranges = [value.composite_ranges, *value.channel_ranges]
+        self.pack(_RANGES, len(ranges) - 1)
+        self.data += struct.pack(
+            ">%dH" % (4 * len(ranges)),
+            *(x for pair in ranges for item in pair for x in item),
+        )
+
+    def layer_info(self, layer_info: LayerInfo) -> None:
+        records = layer_info.layer_records
+        self.pack(_LAYER_INFO, layer_info.layer_count, len(records))
+        for record, channels in zip(records, layer_info.channel_image_data):
+            self.record(record)
+            self.pack(_COUNT, len(channels))
+            for channel in channels:
+                self.pack(
+                    _CHANNEL,
+                    channel.compression.value,
+                    -1 if channel.offset is None else channel.offset,
+                    len(channel._data),
+                )
+                if channel.offset is None and len(channel._data):
+                    raise ValueError("Expected channel data in the file")
+
+    def record(self, record: LayerRecord) -> None:
+        self.pack(
+            _RECORD,
+            record.top,
+            record.left,
+            record.bottom,
+            record.right,
+            len(record.channel_info),
+        )
+        for info in record.channel_info:
+            self.pack(_CHANNEL_INFO, info.id.value, info.length)
+        self.pack(
+            _BLENDING,
+            record.signature,
+            record.blend_mode.value,
+            record.opacity,
+            record.clipping.value,
+            *astuple(record.flags),
+        )
+        mask_data = record.mask_data
+        self.blob(mask_data.tobytes() if mask_data is not None else b"")  # type: ignore[attr-defined]
+        self.blending_ranges(record.blending_ranges)
+        self.blob(record.name.encode("utf-8"))
+        self.tagged_blocks(record.tagged_blocks)
+
+    def tagged_blocks(self, blocks: TaggedBlocks) -> None:
+        items = list(blocks._items.values())
+        self.pack(_COUNT, len(items))
+        for block in items:
+            key = getattr(block.key, "value", block.key)
+            data = block.data
+            version = block._pending
+            if version is not None and isinstance(data, FileSlice):
+                self.pack(
+                    _BLOCK,
+                    _PENDING_RANGE,
+                    block.signature,
+                    key,
+                    version,
+                    data.offset,
+                    data.length,
+                )
+            elif version is not None or isinstance(
+                data, (bytes, bytearray, memoryview)
+            ):
+                kind = _RAW if version is None else _PENDING_BYTES
+                self.pack(
+                    _BLOCK, kind, block.signature, key, version or 0, 0, len(data)
+                )
+                self.data += data
+            elif isinstance(data, LayerInfo):
+                self.pack(_BLOCK, _LAYERS, block.signature, key, 0, 0, 0)
+                self.layer_info(data)
+            else:
+                raise ValueError("Unexpected decoded block %r" % key)
+
+
+class _Reader:
+    """Decoder of the index of a document."""
+
+    def __init__(self, data: bytes, offset: int, path: str) -> None:
+        self.data = data
+        self.offset = offset
+        # Document the byte ranges refer to.
+        self.path = path
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def blob(self) -> bytes:
+        (length,) = self.unpack(_COUNT)
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.data):
+            raise ValueError("Truncated index")
+        return self.data[start : self.offset]
+
+    def document(self, encoding: str) -> PSD:
+        header = FileHeader.frombytes(self.blob())
+        color_mode_data = ColorModeData(self.blob())
+
+        (flags,) = self.unpack(_COUNT)
+        layer_info = global_layer_mask_info = tagged_blocks = None
+        if flags & _HAS_LAYER_INFO:
+            layer_info = self.layer_info(LayerInfo)
+        if flags & _HAS_GLOBAL_MASK:
+            global_layer_mask_info = GlobalLayerMaskInfo.frombytes(self.blob())
+        if flags & _HAS_TAGGED_BLOCKS:
+            tagged_blocks = self.tagged_blocks()
+
+        (compression,) = self.unpack(_COUNT)
+        image_data = ImageData(compression, self.file_slice())
+        if self.offset != len(self.data):
+            raise ValueError("Trailing data in index")
+
+        # Image resources follow the header and the color mode data.
+        with open(self.path, "rb") as f:
+            f.seek(len(header.tobytes()) + 4 + len(color_mode_data.value))
+            image_resources = ImageResources.read(f, encoding)
+        return PSD(
+            header,
+            color_mode_data,
+            image_resources,
+            LayerAndMaskInformation(layer_info, global_layer_mask_info, tagged_blocks),
+            image_data,
+        )
+
+    def file_slice(self) -> FileSlice:
+        (offset,) = self.unpack(_OFFSET)
+        (length,) = self.unpack(_OFFSET)
+        return FileSlice(self.path, offset, length)
+
+    def layer_info(self, kls: type[LayerInfo]) -> LayerInfo:
+        layer_count, count = self.unpack(_LAYER_INFO)
+        records = []
+        channel_image_data = []
+        for _ in range(count):
+            records.append(self.record())
+            (channel_count,) = self.unpack(_COUNT)
+            channels = []
+            for _ in range(channel_count):
+                compression, offset, length = self.unpack(_CHANNEL)
+                if offset < 0:
+                    channels.append(ChannelData(compression=compression))
+                else:
+                    data = FileSlice(self.path, offset + 2, length)
+                    channels.append(
+                        ChannelData(compression=compression, data=data, offset=offset)
+                    )
+            channel_image_data.append(ChannelDataList(channels))  # type: ignore[arg-type]
+        return kls(
+            layer_count=layer_count,
+            layer_records=LayerRecords(records),  # type: ignore[arg-type]
+            channel_image_data=ChannelImageData(channel_image_data),  # type: ignore[arg-type]
+        )
+
+    def record(self) -> LayerRecord:
+        top, left, bottom, right, channel_count = self.unpack(_RECORD)
+        channel_info = [
+            ChannelInfo(*self.unpack(_CHANNEL_INFO)) for _ in range(channel_count)
+        ]
+        signature, blend_mode, opacity, clipping, *flags = self.unpack(_BLENDING)
+        mask_data = self.blob()
+        blending_ranges = self.blending_ranges()
+        return LayerRecord(
+            top=top,
+            left=left,
+            bottom=bottom,
+            right=right,
+            channel_info=channel_info,
+            signature=signature,
+            blend_mode=blend_mode,
+            opacity=opacity,
+            clipping=clipping,
+            flags=LayerFlags(*flags),
+            mask_data=MaskData.frombytes(mask_data) if mask_data else None,
+            blending_ranges=blending_ranges,
+            name=self.blob().decode("utf-8"),
+            tagged_blocks=self.tagged_blocks(),
+        )
+
+    def blending_ranges(self) -> LayerBlendingRanges:
+        (count,) = self.unpack(_RANGES)
+        if count == _NO_RANGES:
+            return LayerBlendingRanges(None, None)  # type: ignore[arg-type]
+        values = struct.unpack_from(">%dH" % (4 * (count + 1)), self.data, self.offset)
+        self.offset += 8 * (count + 1)
+        ranges = [
+            [values[i : i + 2], values[i + 2 : i + 4]] for i in range(0, len(values), 4)
+        ]
+        return LayerBlendingRanges(ranges[0], ranges[1:])  # type: ignore[arg-type]
+
+    def tagged_blocks(self) -> TaggedBlocks:
+        (count,) = self.unpack(_COUNT)
+        items = []
+        for _ in range(count):
+            kind, signature, key, version, offset, length = self.unpack(_BLOCK)
+            key = _TAGS.get(key, key)
+            if kind == _PENDING_RANGE:
+                data: Any = FileSlice(self.path, offset, length)
+            elif kind == _PENDING_BYTES or kind == _RAW:
+                data = self.data[self.offset : self.offset + length]
+                if len(data) != length:
+                    raise ValueError("Truncated index")
+                self.offset += length
+            elif kind == _LAYERS:
+                data = self.layer_info(LayerInfoBlock)
+            else:
+                raise ValueError("Invalid tagged block kind %d" % kind)
+            block = TaggedBlock(signature, key, data)
+            if kind != _RAW and kind != _LAYERS:
+                block._pending = version
+            items.append((key, block))
+        return TaggedBlocks(items)  # type: ignore[arg-type]
+
+
+def _touch(path: str) -> None:
+    # Set the mtime from the fine-grained clock; the filesystem timestamps
+    # can be too coarse to order entries written in quick succession.
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
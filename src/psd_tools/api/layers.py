@@ -83,6 +83,7 @@ and exposed through the ``kind`` property for easy type checking.
 """
 
 import logging
+from concurrent.futures import Executor
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -102,11 +103,13 @@ if TYPE_CHECKING:
     from psd_tools.api.typesetting import TypeSetting
 
 import numpy as np
+from numpy.typing import DTypeLike
 from PIL import Image, ImageChops
 
 import psd_tools.psd.engine_data as engine_data
 from psd_tools.api import numpy_io, pil_io
 from psd_tools.color_convert import rgb_to_grayscale
+from psd_tools.compression import CompressionPolicy
 from psd_tools.api.effects import Effects
 from psd_tools.api.mask import Mask
 from psd_tools.api.protocols import GroupMixinProtocol, LayerProtocol, PSDProtocol
@@ -130,6 +133,7 @@ from psd_tools.psd.layer_and_mask import (
     ChannelData,
     ChannelDataList,
     ChannelInfo,
+    ChannelLocation,
     LayerRecord,
     MaskData,
     MaskFlags,
@@ -416,6 +420,19 @@ class Layer(LayerProtocol):
         """(left, top, right, bottom) tuple."""
         return self.left, self.top, self.right, self.bottom
 
+    @property
+    def channel_index(self) -> list[ChannelLocation]:
+        """
+        File locations of the layer's channel data.
+
+        When the document is opened with ``load_pixels=False``,
+        :py:meth:`numpy` and :py:meth:`topil` read only these ranges of the
+        file. Channels whose data has been replaced are left out.
+
+        :return: `list` of :py:class:`~psd_tools.psd.layer_and_mask.ChannelLocation`
+        """
+        return self._channels._locations(self._record.channel_info)
+
     def has_pixels(self) -> bool:
         """
         Returns True if the layer has associated pixels. When this is True,
@@ -424,7 +441,7 @@ class Layer(LayerProtocol):
         :return: `bool`
         """
         return any(
-            ci.id >= 0 and cd.data and len(cd.data) > 0
+            ci.id >= 0 and cd._length > 2
             for ci, cd in zip(self._record.channel_info, self._channels)
         )
 
@@ -451,6 +468,7 @@ class Layer(LayerProtocol):
         self,
         image: Image.Image,
         compression: Compression,
+        compression_policy: CompressionPolicy | None = None,
     ) -> tuple[ChannelData, int, int]:
         """Return ``(channel_data, width, height)`` for a mask image.
 
@@ -467,7 +485,9 @@ class Layer(LayerProtocol):
         version = self._psd._record.header.version
 
         channel_data = ChannelData(compression)
-        channel_data.set_data(mask_pixels.tobytes(), width, height, 8, version)
+        channel_data.set_data(
+            mask_pixels.tobytes(), width, height, 8, version, compression_policy
+        )
         return channel_data, width, height
 
     def create_mask(
@@ -476,6 +496,7 @@ class Layer(LayerProtocol):
         top: int | None = None,
         left: int | None = None,
         compression: Compression = Compression.RLE,
+        compression_policy: CompressionPolicy | None = None,
     ) -> Mask:
         """
         Create a pixel mask on this layer from a PIL Image.
@@ -489,6 +510,8 @@ class Layer(LayerProtocol):
         :param top: Top offset of the mask. Defaults to the layer's top.
         :param left: Left offset of the mask. Defaults to the layer's left.
         :param compression: Compression algorithm for the mask data.
+        :param compression_policy: Optional
+            :py:class:`~psd_tools.compression.CompressionPolicy`.
         :return: The new :py:class:`~psd_tools.api.mask.Mask`.
         :raises ValueError: If the layer already has a mask.
         """
@@ -500,7 +523,9 @@ class Layer(LayerProtocol):
         if left is None:
             left = self._record.left
 
-        channel_data, width, height = self._make_mask_channel_data(image, compression)
+        channel_data, width, height = self._make_mask_channel_data(
+            image, compression, compression_policy
+        )
 
         mask_data = MaskData(
             top=top,
@@ -552,6 +577,7 @@ class Layer(LayerProtocol):
         top: int | None = None,
         left: int | None = None,
         compression: Compression = Compression.RLE,
+        compression_policy: CompressionPolicy | None = None,
     ) -> Mask:
         """
         Update the pixel mask of this layer with a new image.
@@ -565,13 +591,17 @@ class Layer(LayerProtocol):
         :param top: New top offset of the mask. Defaults to current mask top.
         :param left: New left offset of the mask. Defaults to current mask left.
         :param compression: Compression algorithm for the mask data.
+        :param compression_policy: Optional
+            :py:class:`~psd_tools.compression.CompressionPolicy`.
         :return: The updated :py:class:`~psd_tools.api.mask.Mask`.
         :raises ValueError: If the layer does not have a mask.
         """
         if not self.has_mask():
             raise ValueError("Layer does not have a mask. Use create_mask() first.")
 
-        channel_data, width, height = self._make_mask_channel_data(image, compression)
+        channel_data, width, height = self._make_mask_channel_data(
+            image, compression, compression_policy
+        )
 
         mask_data = cast(MaskData, self._record.mask_data)
         new_top = top if top is not None else mask_data.top
@@ -729,16 +759,28 @@ class Layer(LayerProtocol):
         return pil_io.convert_layer_to_pil(self, channel, apply_icc)
 
     def numpy(
-        self, channel: str | None = None, real_mask: bool = True
+        self,
+        channel: str | None = None,
+        real_mask: bool = True,
+        dtype: DTypeLike | None = None,
+        viewport: tuple[int, int, int, int] | None = None,
     ) -> np.ndarray | None:
         """
         Get NumPy array of the layer.
 
         :param channel: Which channel to return, can be 'color',
             'shape', 'alpha', or 'mask'. Default is 'color+alpha'.
+        :param dtype: When given, return the stored samples in this type
+            without scaling, such as `uint8` for 8-bit or `uint16` for 16-bit
+            documents. Default is `float32` in [0.0, 1.0].
+        :param viewport: Optional (x1, y1, x2, y2) box in document
+            coordinates. Only the rows of the layer that intersect it are
+            decoded, and the array covers the intersection.
         :return: :py:class:`numpy.ndarray` or None if there is no pixel.
         """
-        return numpy_io.get_array(self, channel, real_mask=real_mask)
+        return numpy_io.get_array(
+            self, channel, real_mask=real_mask, dtype=dtype, viewport=viewport
+        )
 
     def composite(
         self,
@@ -748,6 +790,9 @@ class Layer(LayerProtocol):
         alpha: float | np.ndarray = 0.0,
         layer_filter: Callable | None = None,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image | None:
         """
         Composite layer and masks (mask, vector mask, and clipping layers).
@@ -762,6 +807,14 @@ class Layer(LayerProtocol):
         :param layer_filter: Callable that takes a layer as argument and
             returns whether if the layer is composited. Default is
             :py:func:`~psd_tools.api.layers.PixelLayer.is_visible`.
+        :param tile_size: Optional (width, height) of tiles to composite one
+            at a time, which bounds the working memory of large layers.
+        :param workers: Optional number of tiles to composite concurrently,
+            on a thread pool unless ``executor`` is given.
+        :param executor: Optional :py:class:`concurrent.futures.Executor` to
+            composite the tiles on. With a process pool, each worker opens
+            the file of the document; see
+            :py:func:`~psd_tools.composite.composite`.
         :return: :py:class:`PIL.Image.Image` or `None`.
         """
         from psd_tools.composite import composite_pil  # noqa: PLC0415
@@ -770,7 +823,16 @@ class Layer(LayerProtocol):
             force = True
 
         return composite_pil(
-            self, color, alpha, viewport, layer_filter, force, apply_icc=apply_icc
+            self,
+            color,
+            alpha,
+            viewport,
+            layer_filter,
+            force,
+            apply_icc=apply_icc,
+            tile_size=tile_size,
+            workers=workers,
+            executor=executor,
         )
 
     def has_clip_layers(self, visible: bool = False) -> bool:
@@ -1419,6 +1481,9 @@ class Group(GroupMixin, Layer):
         alpha: float | np.ndarray = 0.0,
         layer_filter: Callable | None = None,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image | None:
         """
         Composite layer and masks (mask, vector mask, and clipping layers).
@@ -1433,6 +1498,14 @@ class Group(GroupMixin, Layer):
         :param layer_filter: Callable that takes a layer as argument and
             returns whether if the layer is composited. Default is
             :py:func:`~psd_tools.api.layers.PixelLayer.is_visible`.
+        :param tile_size: Optional (width, height) of tiles to composite one
+            at a time, which bounds the working memory of large layers.
+        :param workers: Optional number of tiles to composite concurrently,
+            on a thread pool unless ``executor`` is given.
+        :param executor: Optional :py:class:`concurrent.futures.Executor` to
+            composite the tiles on. With a process pool, each worker opens
+            the file of the document; see
+            :py:func:`~psd_tools.composite.composite`.
         :return: :py:class:`PIL.Image.Image`.
         """
         from psd_tools.composite import composite_pil  # noqa: PLC0415
@@ -1446,6 +1519,9 @@ class Group(GroupMixin, Layer):
             force,
             as_layer=True,
             apply_icc=apply_icc,
+            tile_size=tile_size,
+            workers=workers,
+            executor=executor,
         )
 
     @staticmethod
@@ -1620,6 +1696,9 @@ class Artboard(Group):
         alpha: float | np.ndarray | None = None,
         layer_filter: Callable | None = None,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image | None:
         """
         Composite layer, automatically applying the artboard's background color.
@@ -1644,6 +1723,9 @@ class Artboard(Group):
             alpha=alpha,
             layer_filter=layer_filter,
             apply_icc=apply_icc,
+            tile_size=tile_size,
+            workers=workers,
+            executor=executor,
         )
 
     def _artboard_background_defaults(
@@ -1794,6 +1876,7 @@ class PixelLayer(Layer):
         top: int = 0,
         left: int = 0,
         compression: Compression = Compression.RLE,
+        compression_policy: CompressionPolicy | None = None,
         **kwargs: Any,
     ) -> "PixelLayer":
         """
@@ -1805,6 +1888,9 @@ class PixelLayer(Layer):
         :param top: Pixelwise offset from the top of the canvas for the new layer.
         :param left: Pixelwise offset from the left of the canvas for the new layer.
         :param compression: Compression algorithm to use for the data.
+        :param compression_policy: Optional
+            :py:class:`~psd_tools.compression.CompressionPolicy` that sets the
+            zlib level and compresses the channels concurrently.
 
         :return: A :py:class:`~psd_tools.api.layers.PixelLayer` object
         :raises TypeError: If image is not a PIL Image
@@ -1841,6 +1927,7 @@ class PixelLayer(Layer):
             top,
             compression,
             version=parent._psd._record.header.version,
+            compression_policy=compression_policy,
         )
         self = cls(parent, layer_record, channel_data_list)
         parent.append(self)
@@ -1851,7 +1938,11 @@ class PixelLayer(Layer):
         # stored as the transparency channel, so no extra mask is needed.
         if "A" in original_image.getbands() and "A" not in image.getbands():
             self.create_mask(
-                original_image, top=top, left=left, compression=compression
+                original_image,
+                top=top,
+                left=left,
+                compression=compression,
+                compression_policy=compression_policy,
             )
 
         return self
@@ -1886,6 +1977,7 @@ class PixelLayer(Layer):
         top: int,
         compression: Compression,
         version: int = 1,
+        compression_policy: CompressionPolicy | None = None,
         **kwargs: Any,
     ) -> tuple[LayerRecord, ChannelDataList]:
         """Build layer record and channel data list from a PIL image."""
@@ -1907,38 +1999,34 @@ class PixelLayer(Layer):
         depth = pil_io.get_pil_depth(image.mode.rstrip("A"))
 
         # Transparency channel.
-        transparency_data = ChannelData(compression)
         if image.has_transparency_data:
             # TODO: Need check for other types of transparency, palette for "indexed" mode
             image_bytes = image.getchannel(image.getbands().index("A")).tobytes()
         else:
             image_bytes = b"\xff" * (image.width * image.height)
-        transparency_data.set_data(
-            image_bytes,
-            image.width,
-            image.height,
-            depth,
-            version,
-        )
-        transparency_info = ChannelInfo(
-            ChannelID.TRANSPARENCY_MASK, len(transparency_data.data) + 2
-        )
-        layer_record.channel_info.append(transparency_info)
-        channel_data_list.append(transparency_data)
+        planes = [(ChannelID.TRANSPARENCY_MASK, image_bytes)]
 
         # Color channels.
         for channel_index in range(pil_io.get_pil_channels(image.mode.rstrip("A"))):
+            planes.append(
+                (ChannelID(channel_index), image.getchannel(channel_index).tobytes())
+            )
+
+        def _compress(plane: tuple[ChannelID, bytes]) -> ChannelData:
             channel_data = ChannelData(compression)
             channel_data.set_data(
-                image.getchannel(channel_index).tobytes(),
+                plane[1],
                 image.width,
                 image.height,
                 depth,
                 version,
+                compression_policy,
             )
-            channel_info = ChannelInfo(
-                id=ChannelID(channel_index), length=len(channel_data.data) + 2
-            )
+            return channel_data
+
+        policy = compression_policy or CompressionPolicy()
+        for (channel_id, _), channel_data in zip(planes, policy.map(_compress, planes)):
+            channel_info = ChannelInfo(id=channel_id, length=len(channel_data.data) + 2)
             channel_data_list.append(channel_data)
             layer_record.channel_info.append(channel_info)
 
@@ -2007,9 +2095,11 @@ class TypeLayer(Layer):
                 index += length
     """
 
-    def __init__(self, *args: Any):
-        super(TypeLayer, self).__init__(*args)
-        self._data = self.tagged_blocks.get_data(Tag.TYPE_TOOL_OBJECT_SETTING)
+    @property
+    def _data(self) -> Any:
+        # Decoded on first access, so that opening a document does not parse
+        # the engine data of every type layer.
+        return self.tagged_blocks.get_data(Tag.TYPE_TOOL_OBJECT_SETTING)
 
     @property
     def text(self) -> str:
@@ -1,7 +1,8 @@
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Literal, cast
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, cast
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 if TYPE_CHECKING:
     from psd_tools.api.protocols import LayerProtocol, PSDProtocol
@@ -12,7 +13,9 @@ from psd_tools.api.utils import (
     get_transparency_index,
     has_transparency,
 )
+from psd_tools.compression import decode_map
 from psd_tools.constants import ChannelID, ColorMode
+from psd_tools.psd.layer_and_mask import ChannelData
 from psd_tools.psd.patterns import Pattern
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,7 @@ def get_array(
     from psd_tools.api.psd_image import PSDImage  # noqa: PLC0415
 
     if isinstance(layer, PSDImage):
-        return get_image_data(layer, channel)
+        return get_image_data(layer, channel, **kwargs)
     elif isinstance(layer, Layer):
         return get_layer_data(layer, channel, **kwargs)
     raise TypeError(
@@ -34,33 +37,51 @@ def get_array(
     )
 
 
-def get_image_data(psdimage: "PSDProtocol", channel: str | None) -> np.ndarray:
+def get_image_data(
+    psdimage: "PSDProtocol",
+    channel: str | None,
+    viewport: tuple[int, int, int, int] | None = None,
+) -> np.ndarray:
+    width, height = psdimage.width, psdimage.height
+    if viewport is None:
+        x0, y0, x1, y1 = 0, 0, width, height
+    else:
+        region = _crop_region(viewport, 0, 0, width, height)
+        if region is None:
+            raise ValueError("Viewport %r is outside of the canvas" % (viewport,))
+        x0, y0, x1, y1 = region
     check_pixel_size(
-        psdimage.width,
-        psdimage.height,
+        x1 - x0,
+        y1 - y0,
         psdimage.channels,
         max_alloc_bytes=psdimage._max_alloc_bytes,
     )
 
     if (channel == "mask") or (channel == "shape" and not has_transparency(psdimage)):
-        return np.ones((psdimage.height, psdimage.width, 1), dtype=np.float32)
+        return np.ones((y1 - y0, x1 - x0, 1), dtype=np.float32)
 
     lut = None
     if psdimage.color_mode == ColorMode.INDEXED:
         lut = np.frombuffer(psdimage._record.color_mode_data.value, np.uint8)
         lut = lut.reshape((3, -1)).transpose()
-    image_bytes = psdimage._record.image_data.get_data(psdimage._record.header, False)
+    rows = (y0, y1) if viewport is not None and psdimage.depth != 1 else None
+    image_bytes = psdimage._record.image_data.get_data(
+        psdimage._record.header, False, rows=rows
+    )
     if not isinstance(image_bytes, bytes):
         raise TypeError(f"Expected bytes, got {type(image_bytes).__name__}")
     array = _parse_array(
-        image_bytes, cast(Literal[1, 8, 16, 32], psdimage.depth), lut=lut
+        image_bytes, cast(Literal[1, 8, 16, 32], psdimage.depth), lut=lut, width=width
     )
+    row_count = height if rows is None else y1 - y0
     if lut is not None:
-        array = array.reshape((psdimage.height, psdimage.width, -1))
+        array = array.reshape((row_count, width, -1))
     else:
-        array = array.reshape((-1, psdimage.height, psdimage.width)).transpose(
-            (1, 2, 0)
-        )
+        array = array.reshape((-1, row_count, width)).transpose((1, 2, 0))
+    if viewport is not None:
+        if rows is None:
+            array = array[y0:y1]
+        array = array[:, x0:x1]
     array = _remove_background(array, psdimage)
 
     if channel == "shape":
@@ -74,27 +95,79 @@ def get_image_data(psdimage: "PSDProtocol", channel: str | None) -> np.ndarray:
     return array
 
 
+def iter_image_bands(psdimage: "PSDProtocol", band_height: int) -> Iterator[np.ndarray]:
+    header = psdimage._record.header
+    check_pixel_size(
+        psdimage.width,
+        min(band_height, psdimage.height),
+        psdimage.channels,
+        max_alloc_bytes=psdimage._max_alloc_bytes,
+    )
+    lut = None
+    if psdimage.color_mode == ColorMode.INDEXED:
+        lut = np.frombuffer(psdimage._record.color_mode_data.value, np.uint8)
+        lut = lut.reshape((3, -1)).transpose()
+    scale = {8: 255.0, 16: 65535.0}.get(psdimage.depth)
+    for band in psdimage._record.image_data.iter_bands(header, band_height):
+        if lut is not None:
+            band = lut[band[:, :, 0]]
+        array = band.astype(np.float32)
+        if scale is not None:
+            array /= scale
+        yield _remove_background(array, psdimage)
+
+
 def get_layer_data(
-    layer: "LayerProtocol", channel: str | None, real_mask: bool = True
+    layer: "LayerProtocol",
+    channel: str | None,
+    real_mask: bool = True,
+    dtype: DTypeLike | None = None,
+    viewport: tuple[int, int, int, int] | None = None,
 ) -> np.ndarray | None:
     def _find_channel(
         layer: "LayerProtocol",
+        left: int,
+        top: int,
         width: int,
         height: int,
         condition: Callable[[Any], bool],
     ) -> np.ndarray | None:
         depth, version = layer._psd.depth, layer._psd.version
+        cache = layer._psd._channel_cache
+        x0, y0, x1, y1 = 0, 0, width, height
+        rows = None
+        if viewport is not None:
+            region = _crop_region(viewport, left, top, width, height)
+            if region is None:
+                return None
+            x0, y0, x1, y1 = region
+            rows = (y0, y1) if depth != 1 else None
+
+        def _get_array(data: ChannelData) -> np.ndarray:
+            if dtype is not None:
+                array = data.get_array(
+                    width, height, depth, version, dtype, rows, cache
+                )
+            else:
+                array = _parse_array(
+                    data.get_data(width, height, depth, version, rows, cache),
+                    cast(Literal[1, 8, 16, 32], depth),
+                    width=width,
+                )
+            if viewport is None:
+                return array.ravel()
+            array = array.reshape((-1, width))
+            if rows is None:
+                array = array[y0:y1]
+            return array[:, x0:x1].ravel()
+
         iterator = zip(layer._record.channel_info, layer._channels)
-        channels = [
-            _parse_array(
-                data.get_data(width, height, depth, version),
-                cast(Literal[1, 8, 16, 32], depth),
-            )
-            for info, data in iterator
-            if condition(info) and len(data.data) > 0
-        ]
+        channels = decode_map(
+            _get_array,
+            [data for info, data in iterator if condition(info) and data._length > 2],
+        )
         if len(channels) and channels[0].size > 0:
-            result = np.stack(channels, axis=1).reshape((height, width, -1))
+            result = np.stack(channels, axis=1).reshape((y1 - y0, x1 - x0, -1))
             expected_channels = EXPECTED_CHANNELS.get(layer._psd.color_mode)
             if expected_channels is not None and result.shape[2] > expected_channels:
                 logger.debug("Extra channel found")
@@ -103,10 +176,14 @@ def get_layer_data(
         return None
 
     if channel == "color":
-        return _find_channel(layer, layer.width, layer.height, lambda x: x.id >= 0)
+        return _find_channel(
+            layer, layer.left, layer.top, layer.width, layer.height, lambda x: x.id >= 0
+        )
     elif channel == "shape":
         return _find_channel(
             layer,
+            layer.left,
+            layer.top,
             layer.width,
             layer.height,
             lambda x: x.id == ChannelID.TRANSPARENCY_MASK,
@@ -119,12 +196,24 @@ def get_layer_data(
         else:
             channel_id = ChannelID.USER_LAYER_MASK
         return _find_channel(
-            layer, layer.mask.width, layer.mask.height, lambda x: x.id == channel_id
+            layer,
+            layer.mask.left,
+            layer.mask.top,
+            layer.mask.width,
+            layer.mask.height,
+            lambda x: x.id == channel_id,
         )
 
-    color = _find_channel(layer, layer.width, layer.height, lambda x: x.id >= 0)
+    color = _find_channel(
+        layer, layer.left, layer.top, layer.width, layer.height, lambda x: x.id >= 0
+    )
     shape = _find_channel(
-        layer, layer.width, layer.height, lambda x: x.id == ChannelID.TRANSPARENCY_MASK
+        layer,
+        layer.left,
+        layer.top,
+        layer.width,
+        layer.height,
+        lambda x: x.id == ChannelID.TRANSPARENCY_MASK,
     )
     if shape is None:
         return color
@@ -137,7 +226,7 @@ def get_pattern(pattern: Pattern) -> np.ndarray:
     height, width = bottom - top, right - left
     return np.stack(
         [
-            _parse_array(c.get_data(), c.pixel_depth)  # type: ignore
+            _parse_array(c.get_data(), c.pixel_depth, width=width)  # type: ignore
             for c in pattern.data.channels
             if c.is_written
         ],
@@ -145,10 +234,22 @@ def get_pattern(pattern: Pattern) -> np.ndarray:
     ).reshape((height, width, -1))
 
 
+def _crop_region(
+    viewport: tuple[int, int, int, int], left: int, top: int, width: int, height: int
+) -> tuple[int, int, int, int] | None:
+    """Intersect a viewport with a box; return it relative to the box."""
+    x0, y0 = max(viewport[0] - left, 0), max(viewport[1] - top, 0)
+    x1, y1 = min(viewport[2] - left, width), min(viewport[3] - top, height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
 def _parse_array(
     data: bytes | bytearray,
     depth: Literal[1, 8, 16, 32],
     lut: np.ndarray | None = None,
+    width: int | None = None,
 ) -> np.ndarray:
     if depth == 8:
         parsed = np.frombuffer(data, ">u1")
@@ -160,7 +261,12 @@ def _parse_array(
     elif depth == 32:
         return np.frombuffer(data, ">f4")
     elif depth == 1:
-        return np.unpackbits(np.frombuffer(data, np.uint8)).astype(np.float32)
+        # Rows of 1-bit data are padded to whole bytes.
+        packed = np.frombuffer(data, np.uint8)
+        if width is not None and width > 0:
+            packed = packed.reshape((-1, (width + 7) // 8))
+            return np.unpackbits(packed, axis=1, count=width).astype(np.float32)
+        return np.unpackbits(packed).astype(np.float32)
     else:
         raise ValueError("Unsupported depth: %g" % depth)
 
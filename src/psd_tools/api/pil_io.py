@@ -13,6 +13,7 @@ from psd_tools.api.utils import (
     get_transparency_index,
     has_transparency,
 )
+from psd_tools.compression import decode_map
 from psd_tools.constants import ChannelID, ColorMode, Resource
 from psd_tools.psd.image_resources import ThumbnailResource, ThumbnailResourceV4
 from psd_tools.psd.patterns import Pattern
@@ -236,11 +237,10 @@ def _merge_channels(layer: "LayerProtocol") -> Image.Image | None:
     if layer._psd is None:
         return None
     mode = get_pil_mode(layer._psd.color_mode)
-    channel_images = [
-        _get_channel(layer, info.id)
-        for info in layer._record.channel_info
-        if info.id >= 0
-    ]
+    channel_images = decode_map(
+        lambda channel: _get_channel(layer, channel),
+        [info.id for info in layer._record.channel_info if info.id >= 0],
+    )
     if any(image is None for image in channel_images):
         return None
     channels = _check_channels(
@@ -272,9 +272,11 @@ def _get_channel(layer: "LayerProtocol", channel: int) -> Image.Image | None:
         return None
     depth = layer._psd.depth
     channel_data = layer._channels[index[cast(ChannelID, channel)]]
-    if width == 0 or height == 0 or len(channel_data.data) == 0:
+    if width == 0 or height == 0 or channel_data._length <= 2:
         return None
-    channel_bytes = channel_data.get_data(width, height, depth, layer._psd.version)
+    channel_bytes = channel_data.get_data(
+        width, height, depth, layer._psd.version, cache=layer._psd._channel_cache
+    )
     return _create_image((width, height), channel_bytes, depth)
 
 
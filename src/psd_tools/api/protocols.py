@@ -6,15 +6,19 @@ PSDImage without requiring concrete imports. These protocols allow other modules
 to properly type hint their parameters while avoiding circular dependency issues.
 """
 
-from typing import TYPE_CHECKING, Callable, Iterator, Literal, Protocol
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, Protocol
 
 if TYPE_CHECKING:
     from psd_tools.api.layers import Layer
+    from psd_tools.composite.render_cache import RenderCache
 
 import numpy as np
+from numpy.typing import DTypeLike
 from PIL import Image
 
 from psd_tools.constants import BlendMode, ChannelID, ColorMode, CompatibilityMode
+from psd_tools.psd.channel_cache import ChannelCache
 from psd_tools.psd.document import PSD
 from psd_tools.psd.image_resources import ImageResources
 from psd_tools.psd.layer_and_mask import ChannelDataList, LayerRecord, MaskData
@@ -255,13 +259,19 @@ class LayerProtocol(Protocol):
         ...
 
     def numpy(
-        self, channel: str | None = None, real_mask: bool = True
+        self,
+        channel: str | None = None,
+        real_mask: bool = True,
+        dtype: DTypeLike | None = None,
+        viewport: tuple[int, int, int, int] | None = None,
     ) -> np.ndarray | None:
         """
         Get NumPy array of the layer.
 
         :param channel: Which channel to return.
         :param real_mask: Whether to use real mask.
+        :param dtype: Sample type for unscaled values; default scales to float32.
+        :param viewport: Box in document coordinates to crop to.
         :return: NumPy array.
         """
         ...
@@ -274,6 +284,9 @@ class LayerProtocol(Protocol):
         alpha: float | np.ndarray = 0.0,
         layer_filter: Callable | None = None,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image | None:
         """
         Composite the layer.
@@ -284,6 +297,9 @@ class LayerProtocol(Protocol):
         :param alpha: Backdrop alpha (float or ndarray).
         :param layer_filter: Layer filter callable.
         :param apply_icc: Whether to apply ICC profile conversion.
+        :param tile_size: Size of tiles to composite one at a time.
+        :param workers: Number of tiles to composite concurrently.
+        :param executor: Executor to composite the tiles on.
         :return: PIL Image, or None if composition not available.
         """
         ...
@@ -350,6 +366,9 @@ class PSDProtocol(GroupMixinProtocol, Protocol):
     # Internal attributes accessed by related classes
     _record: PSD  # psd_tools.psd.PSD
     _max_alloc_bytes: int | None  # per-document allocation budget
+    _channel_cache: ChannelCache | None  # per-document decoded channel cache
+    _render_cache: "RenderCache | None"  # per-document rendered layer cache
+    _origin: tuple[str, tuple[int, int], dict[str, Any]] | None  # file to reopen
 
     @property
     def name(self) -> str:
@@ -463,16 +482,28 @@ class PSDProtocol(GroupMixinProtocol, Protocol):
         ...
 
     def numpy(
-        self, channel: Literal["color", "shape", "alpha", "mask"] | None = None
+        self,
+        channel: Literal["color", "shape", "alpha", "mask"] | None = None,
+        viewport: tuple[int, int, int, int] | None = None,
     ) -> np.ndarray:
         """
         Get NumPy array of the document.
 
         :param channel: Which channel to return.
+        :param viewport: Box to crop to.
         :return: NumPy array.
         """
         ...
 
+    def iter_rows(self, band_height: int = 256) -> Iterator[np.ndarray]:
+        """
+        Iterate over the merged image in bands of rows.
+
+        :param band_height: Number of rows in a band.
+        :return: Iterator of NumPy arrays.
+        """
+        ...
+
     def composite(
         self,
         viewport: tuple[int, int, int, int] | None = None,
@@ -482,6 +513,9 @@ class PSDProtocol(GroupMixinProtocol, Protocol):
         layer_filter: Callable | None = None,
         ignore_preview: bool = False,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image:
         """
         Composite the PSD document.
@@ -493,6 +527,9 @@ class PSDProtocol(GroupMixinProtocol, Protocol):
         :param layer_filter: Layer filter callable.
         :param ignore_preview: Whether to skip using pre-composed preview.
         :param apply_icc: Whether to apply ICC profile conversion.
+        :param tile_size: Size of tiles to composite one at a time.
+        :param workers: Number of tiles to composite concurrently.
+        :param executor: Executor to composite the tiles on.
         :return: PIL Image.
         """
         ...
@@ -53,9 +53,11 @@ group-like behavior for accessing child layers.
 from __future__ import annotations
 
 import logging
+import mmap
 import os
 from collections.abc import Sequence
-from typing import IO, Any, Callable, Iterable, Literal
+from concurrent.futures import Executor
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal
 
 from typing_extensions import Self
 
@@ -63,13 +65,16 @@ import numpy as np
 from PIL import Image
 
 from psd_tools.api import adjustments, layers, numpy_io, pil_io
+from psd_tools.api.index_cache import IndexCache, get_index_cache
 from psd_tools.api.protocols import PSDProtocol
 from psd_tools.api.utils import (
     EXPECTED_CHANNELS,
     ColorInput,
     denormalize_color,
+    file_signature,
     normalize_color,
 )
+from psd_tools.compression import CompressionPolicy
 from psd_tools.constants import (
     BlendMode,
     ChannelID,
@@ -80,6 +85,8 @@ from psd_tools.constants import (
     SectionDivider,
     Tag,
 )
+from psd_tools.psd.bin_utils import BufferReader
+from psd_tools.psd.channel_cache import ChannelCache
 from psd_tools.psd.document import PSD
 from psd_tools.psd.header import FileHeader
 from psd_tools.psd.image_data import ImageData
@@ -93,6 +100,9 @@ from psd_tools.psd.layer_and_mask import (
 from psd_tools.psd.patterns import Patterns
 from psd_tools.psd.tagged_blocks import TaggedBlocks
 
+if TYPE_CHECKING:
+    from psd_tools.composite.render_cache import RenderCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,6 +133,15 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         self._updated: bool = False  # Flag to check if the layer tree is edited.
         # Per-document allocation budget (bytes); set via open(max_alloc_bytes=...).
         self._max_alloc_bytes: int | None = None
+        # Cache of decoded channels; set via open(channel_cache=...).
+        self._channel_cache: ChannelCache | None = None
+        # Cache of rendered layers; set via open(render_cache=...).
+        self._render_cache: RenderCache | None = None
+        # File that skipped data is read from; set via open(load_pixels=False).
+        self._source: str | None = None
+        # File, size and mtime, and parsing options the document was opened
+        # with; set via open() with a filename, to reopen it in other processes.
+        self._origin: tuple[str, tuple[int, int], dict[str, Any]] | None = None
 
         self._psd = self  # For GroupMixin protocol compatibility.
         self._init()
@@ -215,11 +234,23 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         cls,
         fp: IO[bytes] | str | bytes | os.PathLike,
         max_alloc_bytes: int | None = None,
+        mmap: bool = False,
+        index_cache: str | os.PathLike | IndexCache | None = None,
+        incremental: bool = False,
+        channel_cache: ChannelCache | None = None,
+        render_cache: RenderCache | None = None,
         **kwargs: Any,
     ) -> Self:
         """
         Open a PSD document.
 
+        With ``mmap=True``, the file is memory-mapped and channel, image and
+        linked layer data are kept as `memoryview` slices of the mapping
+        instead of being copied, so opening a large document costs little
+        memory until pixels are decoded, and the OS page cache is shared
+        between processes. The mapping stays alive as long as the document
+        does; the file must not be truncated while it is open.
+
         :param fp: filename or file-like object.
         :param max_alloc_bytes: optional per-document cap (bytes) on the buffer
             that :py:meth:`composite`/:py:meth:`numpy`/:py:meth:`topil` allocate
@@ -228,30 +259,101 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
             env var (or :data:`psd_tools.api.utils.MAX_ALLOC_BYTES`) when ``None``.
         :param encoding: charset encoding of the pascal string within the file,
             default 'macroman'. Some psd files need explicit encoding option.
+        :param mmap: memory-map the file and avoid copying pixel data. ``fp``
+            must be a filename or a file object backed by a file descriptor.
+        :param lazy: defer parsing of tagged blocks (descriptors, effects,
+            text engine data, ...) until they are first accessed. Blocks that
+            are never accessed are saved back verbatim.
+        :param load_pixels: read channel and merged image data. With
+            ``load_pixels=False``, only the structure (layer records, tagged
+            blocks and image resources) is parsed; pixel data is skipped and
+            read back from the file on access, so the file must stay
+            available. See :py:attr:`Layer.channel_index
+            <psd_tools.api.layers.Layer.channel_index>` for the ranges.
+        :param index_cache: directory or
+            :py:class:`~psd_tools.api.index_cache.IndexCache` that keeps the
+            parsed structure of documents, so that reopening an unchanged file
+            skips parsing. Tagged blocks are then decoded on access as with
+            ``lazy=True``, and pixel data is read on access as with
+            ``load_pixels=False``. ``fp`` must be a filename.
+        :param incremental: shortcut for ``lazy=True, load_pixels=False``.
+            Tagged blocks and channel data that are not modified keep their
+            byte ranges in the file, and :py:meth:`save` copies those ranges
+            instead of serializing them again, with ``copy_file_range`` or
+            ``sendfile`` when saving to a file.
+        :param channel_cache:
+            :py:class:`~psd_tools.psd.channel_cache.ChannelCache` that keeps
+            decoded channels of this document, so that compositing and
+            repeated :py:meth:`numpy`/:py:meth:`topil` calls decode each
+            channel once. Defaults to the process-wide cache, if any.
+        :param render_cache:
+            :py:class:`~psd_tools.composite.render_cache.RenderCache` that
+            keeps rendered layers and groups of this document, so that
+            compositing again after an edit only renders the edited layer
+            and the groups that contain it. Defaults to the process-wide
+            cache, if any.
         :return: A :py:class:`~psd_tools.api.psd_image.PSDImage` object.
         """
-        if isinstance(fp, (str, bytes, os.PathLike)):
+        if incremental:
+            kwargs.setdefault("lazy", True)
+            kwargs["load_pixels"] = False
+        if index_cache is not None:
+            if mmap or not isinstance(fp, (str, bytes, os.PathLike)):
+                raise ValueError("index_cache requires a filename without mmap")
+            if not isinstance(index_cache, IndexCache):
+                index_cache = get_index_cache(index_cache)
+            kwargs.pop("load_pixels", None)
+            self = cls(index_cache.read(fp, **kwargs))
+        elif mmap:
+            self = cls(PSD.read(_open_mmap(fp), **kwargs))
+        elif isinstance(fp, (str, bytes, os.PathLike)):
             with open(fp, "rb") as f:
                 self = cls(PSD.read(f, **kwargs))
         else:
             self = cls(PSD.read(fp, **kwargs))
         self._max_alloc_bytes = max_alloc_bytes
+        self._channel_cache = channel_cache
+        self._render_cache = render_cache
+        if mmap or index_cache is not None or not kwargs.get("load_pixels", True):
+            name: Any = fp
+            if not isinstance(fp, (str, bytes, os.PathLike)):
+                name = getattr(fp, "name", None)
+            if isinstance(name, (str, bytes, os.PathLike)):
+                self._source = os.path.abspath(os.fsdecode(name))
+        if isinstance(fp, (str, bytes, os.PathLike)):
+            filename = os.path.abspath(os.fsdecode(fp))
+            options = {k: v for k, v in kwargs.items() if k != "load_pixels"}
+            self._origin = (filename, file_signature(filename), options)
         return self
 
     def save(
         self,
         fp: IO[bytes] | str | bytes | os.PathLike,
         mode: str = "wb",
+        compression_policy: CompressionPolicy | None = None,
         **kwargs: Any,
     ) -> None:
         """
         Save the PSD file. Updates the ImageData section if the layer structure has been updated.
 
-        :param fp: filename or file-like object.
+        :param fp: filename or file-like object. The file-like object does not
+            need to be seekable; pipes, sockets and compressed streams are
+            written to in order without buffering the document.
         :param encoding: charset encoding of the pascal string within the file,
             default 'macroman'.
         :param mode: file open mode, default 'wb'.
-        """
+        :param compression_policy: Optional
+            :py:class:`~psd_tools.compression.CompressionPolicy` used to
+            compress the updated ImageData section.
+        :raise ValueError: if the document reads pixel data from the file it
+            was opened from (``mmap``, ``load_pixels=False``, ``incremental``
+            or ``index_cache``) and ``fp`` names that file.
+        """
+        if isinstance(fp, (str, bytes, os.PathLike)) and self._is_source(fp):
+            raise ValueError(
+                "Cannot save over %r, the document reads pixel data from it"
+                % self._source
+            )
         if self.is_updated():
             # Update the preview image if the layer structure has been changed.
             # TODO: Set a `has_composite` flag in VersionInfo resource.
@@ -265,6 +367,7 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
                 self._record.image_data.set_data(
                     [channel.tobytes() for channel in composited_psd.split()],
                     self._record.header,
+                    compression_policy,
                 )
             except ImportError as e:
                 logger.warning(
@@ -297,19 +400,40 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         return None
 
     def numpy(
-        self, channel: Literal["color", "shape", "alpha", "mask"] | None = None
+        self,
+        channel: Literal["color", "shape", "alpha", "mask"] | None = None,
+        viewport: tuple[int, int, int, int] | None = None,
     ) -> np.ndarray:
         """
         Get NumPy array of the layer.
 
         :param channel: Which channel to return, can be 'color',
             'shape', 'alpha', or 'mask'. Default is 'color+alpha'.
+        :param viewport: Optional (x1, y1, x2, y2) box to crop to. Only the
+            rows of the merged image that intersect it are decoded.
         :return: :py:class:`numpy.ndarray`
+        :raises ValueError: if the viewport is outside of the canvas.
         """
-        array = numpy_io.get_array(self, channel)
+        array = numpy_io.get_array(self, channel, viewport=viewport)
         assert array is not None
         return array
 
+    def iter_rows(self, band_height: int = 256) -> Iterator[np.ndarray]:
+        """
+        Iterate over the merged image in bands of rows.
+
+        Bands are decoded one at a time, so that a document opened with
+        ``load_pixels=False`` or ``mmap=True`` can be converted without
+        holding the whole image in memory. Concatenating the bands gives
+        :py:meth:`numpy`.
+
+        :param band_height: number of rows in a band. The last band may have
+            fewer rows.
+        :return: iterator of :py:class:`numpy.ndarray` of shape
+            ``(rows, width, channels)``.
+        """
+        return numpy_io.iter_image_bands(self, band_height)
+
     def composite(
         self,
         viewport: tuple[int, int, int, int] | None = None,
@@ -319,6 +443,9 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         layer_filter: Callable | None = None,
         ignore_preview: bool = False,
         apply_icc: bool = True,
+        tile_size: tuple[int, int] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
     ) -> Image.Image:
         """
         Composite the PSD image.
@@ -335,6 +462,14 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         :param layer_filter: Callable that takes a layer as argument and
             returns whether if the layer is composited. Default is
             :py:func:`~psd_tools.api.layers.PixelLayer.is_visible`.
+        :param tile_size: Optional (width, height) of tiles to composite one
+            at a time, which bounds the working memory of large documents.
+        :param workers: Optional number of tiles to composite concurrently,
+            on a thread pool unless ``executor`` is given.
+        :param executor: Optional :py:class:`concurrent.futures.Executor` to
+            composite the tiles on. With a process pool, each worker opens
+            the file of the document; see
+            :py:func:`~psd_tools.composite.composite`.
         :return: :py:class:`PIL.Image`.
         """
         from psd_tools.composite import composite_pil  # noqa: PLC0415
@@ -356,11 +491,23 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
             layer_filter,
             force,
             apply_icc=apply_icc,
+            tile_size=tile_size,
+            workers=workers,
+            executor=executor,
         )
         if result is None:
             raise ValueError("Failed to composite PSD image")
         return result
 
+    def _is_source(self, path: str | bytes | os.PathLike) -> bool:
+        """Check if ``path`` is the file that skipped data is read from."""
+        if self._source is None:
+            return False
+        try:
+            return os.path.samefile(path, self._source)
+        except OSError:
+            return False
+
     def _mark_updated(self) -> None:
         """Mark the layer tree as updated."""
         self._updated = True
@@ -697,6 +844,7 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         compression: Compression = Compression.RLE,
         opacity: int = 255,
         blend_mode: BlendMode = BlendMode.NORMAL,
+        compression_policy: CompressionPolicy | None = None,
     ) -> layers.PixelLayer:
         """
         Create a new pixel layer and add it to the PSDImage.
@@ -713,10 +861,19 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
         :param compression: Compression method for the layer image data.
         :param opacity: Opacity of the new layer (0-255).
         :param blend_mode: Blend mode of the new layer, default is ``BlendMode.NORMAL``.
+        :param compression_policy: Optional
+            :py:class:`~psd_tools.compression.CompressionPolicy` that sets the
+            zlib level and compresses the channels concurrently.
         :return: The created :py:class:`~psd_tools.api.layers.PixelLayer` object.
         """
         layer = layers.PixelLayer.frompil(
-            image, parent=self, name=name, top=top, left=left, compression=compression
+            image,
+            parent=self,
+            name=name,
+            top=top,
+            left=left,
+            compression=compression,
+            compression_policy=compression_policy,
         )
         layer.opacity = opacity
         layer.blend_mode = blend_mode
@@ -967,6 +1124,27 @@ class PSDImage(layers.GroupMixin, PSDProtocol):
                         target_patterns.append(pattern)
 
 
+def _open_mmap(fp: IO[bytes] | str | bytes | os.PathLike) -> IO[bytes]:
+    """Memory-map the file and return a zero-copy reader at its position."""
+    if isinstance(fp, (str, bytes, os.PathLike)):
+        with open(fp, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        position = 0
+    else:
+        try:
+            fileno = fp.fileno()
+        except (AttributeError, OSError) as e:
+            raise ValueError(
+                "mmap=True requires a filename or a file object with a file "
+                "descriptor, got %s" % type(fp).__name__
+            ) from e
+        buffer = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        position = fp.tell()
+    reader = BufferReader(buffer)
+    reader.seek(position)
+    return reader
+
+
 def _build_record_tree(
     layer_group: layers.GroupMixin,
 ) -> tuple[LayerRecords, ChannelImageData]:
@@ -207,7 +207,7 @@ class SmartObject:
         if self._data is None:
             raise ValueError("Smart object data not found")
         if self.kind == "data":
-            return self._data.data
+            return bytes(self._data.data)
         else:
             with self.open() as f:
                 return f.read()
@@ -38,6 +38,12 @@ MAX_PIXELS_PSB: int = 300_000 * 300_000
 MAX_ALLOC_BYTES_ENV: str = "PSD_TOOLS_MAX_ALLOC_BYTES"
 
 
+def file_signature(filename: str | bytes | os.PathLike) -> tuple[int, int]:
+    """Size and modification time of a file, to tell if it has changed."""
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
 def _env_alloc_budget() -> int | None:
     """Default :data:`MAX_ALLOC_BYTES` from ``$PSD_TOOLS_MAX_ALLOC_BYTES``.
 
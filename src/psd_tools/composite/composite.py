@@ -1,7 +1,17 @@
 """Composite implementation for layer rendering and blending."""
 
+import copy
 import logging
-from typing import Callable, cast
+import os
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Iterable, Iterator, cast
 
 import numpy as np
 from PIL import Image
@@ -9,15 +19,29 @@ from PIL import Image
 from psd_tools.api import pil_io
 from psd_tools.api.layers import AdjustmentLayer, GroupMixin, Layer
 from psd_tools.api.psd_image import PSDImage
-from psd_tools.api.utils import EXPECTED_CHANNELS, check_pixel_size
+from psd_tools.api.protocols import PSDProtocol
+from psd_tools.api.utils import EXPECTED_CHANNELS, check_pixel_size, file_signature
 from psd_tools.composite import paint, utils, vector
 from psd_tools.composite.adjustments import ADJUSTMENT_FUNC
 from psd_tools.composite.blend import BLEND_FUNC, normal
 from psd_tools.composite.effects import draw_stroke_effect
-from psd_tools.constants import BlendMode, ColorMode, Resource, Tag
+from psd_tools.composite.render_cache import (
+    RenderCache,
+    digest,
+    fingerprint,
+    get_render_cache,
+)
+from psd_tools.constants import BlendMode, ChannelID, ColorMode, Resource, Tag
 
 logger = logging.getLogger(__name__)
 
+#: Tile size used when tiles are composited in parallel without a tile size.
+DEFAULT_TILE_SIZE = (512, 512)
+
+# Documents reopened in a worker process, most recently used last.
+_worker_documents: "OrderedDict[tuple, PSDImage]" = OrderedDict()
+_MAX_WORKER_DOCUMENTS = 4
+
 
 def composite_pil(
     layer: Layer | PSDImage,
@@ -28,6 +52,9 @@ def composite_pil(
     force: bool,
     as_layer: bool = False,
     apply_icc: bool = True,
+    tile_size: tuple[int, int] | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
 ) -> Image.Image | None:
     """
     Composite layers and return a PIL Image.
@@ -44,6 +71,9 @@ def composite_pil(
         force: If True, force re-rendering of all layers (ignore cached pixels)
         as_layer: If True, apply layer blend modes (default: False for document-level compositing)
         apply_icc: If True, apply ICC profile color correction (default: True)
+        tile_size: Optional (width, height) of tiles to composite one at a time
+        workers: Optional number of tiles to composite concurrently
+        executor: Optional executor to composite the tiles on
 
     Returns:
         PIL Image with composited result, or None if viewport is empty
@@ -72,6 +102,9 @@ def composite_pil(
         layer_filter=layer_filter,
         force=force,
         as_layer=as_layer,
+        tile_size=tile_size,
+        workers=workers,
+        executor=executor,
     )
 
     mode = pil_io.get_pil_mode(color_mode)
@@ -116,6 +149,9 @@ def composite(
     layer_filter: Callable[[Layer], bool] | None = None,
     force: bool = False,
     as_layer: bool = False,
+    tile_size: tuple[int, int] | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Composite layers and return NumPy arrays.
@@ -133,6 +169,23 @@ def composite(
         layer_filter: Optional callable(layer) -> bool to filter which layers to composite
         force: If True, force re-rendering of all layers including vector shapes and fills
         as_layer: If True, treat the group as a layer (apply blend mode to backdrop)
+        tile_size: Optional (width, height) of tiles. The viewport is then
+            composited one tile at a time, skipping layers outside of the
+            tile, so that working memory depends on the tile size rather than
+            on the viewport. The result matches the full-frame composite.
+        workers: Optional number of tiles to composite concurrently. Without
+            an executor, tiles are composited on a thread pool of this size.
+            The threads share the document, and documents opened with
+            ``load_pixels=False`` read their pixels from the shared file.
+        executor: Optional :py:class:`concurrent.futures.Executor` to
+            composite the tiles on, such as a
+            :py:class:`~concurrent.futures.ProcessPoolExecutor` to use all
+            cores. Executors other than a thread pool get a reference to the
+            document instead of a copy: each worker process opens the file
+            once, memory-mapped, so the document must be opened from a
+            filename and not modified since, and ``layer_filter`` must be
+            picklable. Tiles are :py:data:`DEFAULT_TILE_SIZE` unless
+            ``tile_size`` is given.
 
     Returns:
         Tuple of (color, shape, alpha) as float32 ndarrays with shape (height, width, channels):
@@ -150,12 +203,20 @@ def composite(
         >>> color, shape, alpha = composite(psd, force=True)
         >>> # Composite only visible layers
         >>> color, shape, alpha = composite(psd, layer_filter=lambda l: l.visible)
+        >>> # Composite a large document in 1024x1024 tiles
+        >>> color, shape, alpha = composite(psd, tile_size=(1024, 1024))
+        >>> # Composite the tiles on all cores
+        >>> with ProcessPoolExecutor() as executor:
+        ...     color, shape, alpha = composite(psd, executor=executor)
 
     Note:
         - Requires optional composite dependencies (aggdraw, scipy, scikit-image)
           for vector shape rendering, gradient fills, and layer effects.
         - Adjustment layers have limited support.
         - Text rendering is not supported (text layers show as raster if available).
+        - Rendered layers are kept in the
+          :py:class:`~psd_tools.composite.render_cache.RenderCache` of the
+          document or of the process, if any.
     """
     if viewport is None:
         if isinstance(group, PSDImage):
@@ -167,16 +228,45 @@ def composite(
                 viewport = group._psd.viewbox
     assert viewport is not None
 
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1, got %d" % workers)
+    if executor is not None or (workers is not None and workers > 1):
+        tile_size = tile_size or DEFAULT_TILE_SIZE
+    else:
+        workers = None
+    if tile_size is not None:
+        return _composite_tiles(
+            group,
+            color,
+            alpha,
+            viewport,
+            layer_filter,
+            force,
+            as_layer,
+            tile_size,
+            workers,
+            executor,
+        )
+
     if isinstance(group, PSDImage) and len(group) == 0:
         # group.numpy() applies check_pixel_size(group.width, group.height) internally
         # for each call (color + shape), so skip the viewport-based check here to
         # avoid an additional warning/raise on top of those already emitted.
         backdrop_color = color
         backdrop_alpha = alpha
-        color, shape = group.numpy("color"), group.numpy("shape")
-        if viewport != group.viewbox:
-            color = paste(viewport, group.bbox, color, 1.0)
-            shape = paste(viewport, group.bbox, shape)
+        if viewport == group.viewbox:
+            color, shape = group.numpy("color"), group.numpy("shape")
+        else:
+            # Only decode the rows of the merged image within the viewport.
+            region = utils.intersect(viewport, group.bbox)
+            if region == (0, 0, 0, 0):
+                color = np.ones((0, 0, 1), dtype=np.float32)
+                shape = np.zeros((0, 0, 1), dtype=np.float32)
+            else:
+                color = group.numpy("color", viewport=region)
+                shape = group.numpy("shape", viewport=region)
+            color = paste(viewport, region, color, 1.0)
+            shape = paste(viewport, region, shape)
         if not (isinstance(backdrop_alpha, (int, float)) and backdrop_alpha == 0.0):
             color, shape = _blend_backdrop(
                 color, shape, backdrop_color, backdrop_alpha, group.color_mode
@@ -204,14 +294,262 @@ def composite(
         isolated = group.blend_mode != BlendMode.PASS_THROUGH
 
     layer_filter = layer_filter or Layer.is_visible
-
-    compositor = Compositor(viewport, color, alpha, isolated, layer_filter, force)
+    render_cache = _psd._render_cache if _psd is not None else None
+    if render_cache is None:
+        render_cache = get_render_cache()
+
+    compositor = Compositor(
+        viewport,
+        color,
+        alpha,
+        isolated,
+        layer_filter,
+        force,
+        render_cache=render_cache,
+    )
     target_group = group if isinstance(group, GroupMixin) and not as_layer else [group]
     for layer in target_group:  # type: ignore
         compositor.apply(layer)  # type: ignore[arg-type]
     return compositor.finish()
 
 
+def _composite_tiles(
+    group: Layer | PSDImage,
+    color: float | tuple[float, ...] | np.ndarray,
+    alpha: float | np.ndarray,
+    viewport: tuple[int, int, int, int],
+    layer_filter: Callable[[Layer], bool] | None,
+    force: bool,
+    as_layer: bool,
+    tile_size: tuple[int, int],
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Composite the viewport tile by tile and assemble the result."""
+    tile_width, tile_height = tile_size
+    if tile_width < 1 or tile_height < 1:
+        raise ValueError("Invalid tile size %r" % (tile_size,))
+    _w = viewport[2] - viewport[0]
+    _h = viewport[3] - viewport[1]
+    _psd = group if isinstance(group, PSDImage) else group._psd
+    check_pixel_size(
+        _w,
+        _h,
+        _psd.channels if _psd is not None else 1,
+        max_alloc_bytes=_psd._max_alloc_bytes if _psd is not None else None,
+    )
+
+    # Stroke effects are drawn from the shape of the whole layer. Tiles that
+    # touch such a layer are composited in a region that covers it, aligned to
+    # the tiles so that the tiles sharing a region composite it once.
+    layers = list(group.descendants()) if isinstance(group, GroupMixin) else []
+    if isinstance(group, Layer):
+        layers.append(group)
+    x0, y0 = viewport[0], viewport[1]
+    whole_boxes = []
+    for layer in layers:
+        box = utils.intersect(viewport, layer.bbox)
+        if box != (0, 0, 0, 0) and any(True for _ in layer.effects.find("stroke")):
+            aligned = (
+                x0 + (box[0] - x0) // tile_width * tile_width,
+                y0 + (box[1] - y0) // tile_height * tile_height,
+                min(x0 - (x0 - box[2]) // tile_width * tile_width, viewport[2]),
+                min(y0 - (y0 - box[3]) // tile_height * tile_height, viewport[3]),
+            )
+            whole_boxes.append((box, aligned))
+
+    regions: dict[tuple[int, int, int, int], list[tuple[int, int, int, int]]] = {}
+    for top in range(viewport[1], viewport[3], tile_height):
+        for left in range(viewport[0], viewport[2], tile_width):
+            tile = (
+                left,
+                top,
+                min(left + tile_width, viewport[2]),
+                min(top + tile_height, viewport[3]),
+            )
+            region = tile
+            for box, aligned in whole_boxes:
+                if utils.intersect(tile, box) != (0, 0, 0, 0):
+                    region = (
+                        min(region[0], aligned[0]),
+                        min(region[1], aligned[1]),
+                        max(region[2], aligned[2]),
+                        max(region[3], aligned[3]),
+                    )
+            regions.setdefault(region, []).append(tile)
+
+    result_color = np.ones((_h, _w, 1), dtype=np.float32)
+    result_shape = np.zeros((_h, _w, 1), dtype=np.float32)
+    result_alpha = np.zeros((_h, _w, 1), dtype=np.float32)
+    renders = _render_regions(
+        group,
+        [
+            (
+                region,
+                _crop_backdrop(color, viewport, region),
+                _crop_backdrop(alpha, viewport, region),
+            )
+            for region in regions
+        ],
+        layer_filter,
+        force,
+        as_layer,
+        workers,
+        executor,
+    )
+    for region, (color_r, shape_r, alpha_r) in renders:
+        if result_color.shape[2] < color_r.shape[2]:
+            result_color = np.repeat(result_color, color_r.shape[2], axis=2)
+        for tile in regions[region]:
+            tile_index = (
+                slice(tile[1] - viewport[1], tile[3] - viewport[1]),
+                slice(tile[0] - viewport[0], tile[2] - viewport[0]),
+            )
+            crop = (
+                slice(tile[1] - region[1], tile[3] - region[1]),
+                slice(tile[0] - region[0], tile[2] - region[0]),
+            )
+            result_color[tile_index] = color_r[crop]
+            result_shape[tile_index] = shape_r[crop]
+            result_alpha[tile_index] = alpha_r[crop]
+    return result_color, result_shape, result_alpha
+
+
+def _crop_backdrop(
+    value: Any, viewport: tuple[int, int, int, int], region: tuple[int, int, int, int]
+) -> Any:
+    """Crop an ndarray backdrop of the viewport to a region of it."""
+    if not isinstance(value, np.ndarray):
+        return value
+    return value[
+        region[1] - viewport[1] : region[3] - viewport[1],
+        region[0] - viewport[0] : region[2] - viewport[0],
+    ]
+
+
+def _render_regions(
+    group: Layer | PSDImage,
+    tasks: list[tuple[tuple[int, int, int, int], Any, Any]],
+    layer_filter: Callable[[Layer], bool] | None,
+    force: bool,
+    as_layer: bool,
+    workers: int | None,
+    executor: Executor | None,
+) -> Iterator[
+    tuple[tuple[int, int, int, int], tuple[np.ndarray, np.ndarray, np.ndarray]]
+]:
+    """
+    Composite regions, serially or on an executor, in order of completion.
+
+    At most twice as many regions as workers are in flight, so that finished
+    regions do not pile up in memory.
+    """
+    if workers is None and executor is None:
+        for region, color, alpha in tasks:
+            yield (
+                region,
+                composite(group, color, alpha, region, layer_filter, force, as_layer),
+            )
+        return
+
+    if executor is None:
+        assert workers is not None
+        with ThreadPoolExecutor(
+            workers, thread_name_prefix="psd-tools-composite"
+        ) as pool:
+            yield from _render_regions(
+                group, tasks, layer_filter, force, as_layer, workers, pool
+            )
+        return
+
+    if isinstance(executor, ThreadPoolExecutor):
+        func: Callable[..., Any] = composite
+        target: Any = group
+    else:
+        # Other processes open the file instead of unpickling the document.
+        func, target = _composite_reference, _document_reference(group)
+    limit = 2 * (workers or os.cpu_count() or 1)
+    pending: dict[Future, tuple[int, int, int, int]] = {}
+    try:
+        for region, color, alpha in tasks:
+            while len(pending) >= limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+            future = executor.submit(
+                func, target, color, alpha, region, layer_filter, force, as_layer
+            )
+            pending[future] = region
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _document_reference(group: Layer | PSDImage) -> tuple:
+    """Reference to the file of a document and the index path of a layer."""
+    psd = group if isinstance(group, PSDImage) else group._psd
+    assert psd is not None
+    if (
+        psd._origin is None
+        or psd.is_updated()
+        or _has_modified_channels(psd)
+        or file_signature(psd._origin[0]) != psd._origin[1]
+    ):
+        raise ValueError(
+            "Compositing on worker processes requires a document opened from "
+            "a filename and not modified since"
+        )
+    path = []
+    layer: Any = group
+    while isinstance(layer, Layer):
+        parent = layer.parent
+        assert parent is not None
+        path.append(next(i for i, child in enumerate(parent) if child is layer))
+        layer = parent
+    return psd._origin + (psd._max_alloc_bytes, tuple(reversed(path)))
+
+
+def _has_modified_channels(psd: PSDProtocol) -> bool:
+    """Whether channel data has been set since the document was read.
+
+    Channel data read from a file records its offset, which setting the data
+    resets.
+    """
+    return any(
+        channel.offset is None
+        for layer in psd.descendants()
+        for channel in layer._channels
+    )
+
+
+def _composite_reference(
+    reference: tuple, *args: Any
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Composite a region of a referenced document in a worker process."""
+    filename, signature, options, max_alloc_bytes, path = reference
+    key = (filename, signature, tuple(sorted(options.items())), max_alloc_bytes)
+    psd = _worker_documents.get(key)
+    if psd is None:
+        if file_signature(filename) != signature:
+            raise ValueError("%r has changed since it was opened" % filename)
+        psd = PSDImage.open(
+            filename, max_alloc_bytes=max_alloc_bytes, mmap=True, **options
+        )
+        _worker_documents[key] = psd
+        while len(_worker_documents) > _MAX_WORKER_DOCUMENTS:
+            _worker_documents.popitem(last=False)
+    else:
+        _worker_documents.move_to_end(key)
+    group: Any = psd
+    for index in path:
+        group = group[index]
+    return composite(group, *args)
+
+
 def paste(
     viewport: tuple[int, int, int, int],
     bbox: tuple[int, int, int, int],
@@ -266,6 +604,18 @@ def _blend_backdrop(
     return result_color, result_alpha
 
 
+# Color, shape and alpha of a layer, its shape mask and mask, and whether
+# adjustments are isolated in a group.
+_Source = tuple[
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+    float | np.ndarray,
+    float | np.ndarray,
+    bool | None,
+]
+
+
 class Compositor(object):
     """Composite context.
 
@@ -286,6 +636,7 @@ class Compositor(object):
         layer_filter: Callable[[Layer], bool] | None = None,
         force: bool = False,
         adjustment_isolated: bool = False,
+        render_cache: RenderCache | None = None,
     ):
         self._viewport = viewport
         self._layer_filter = layer_filter
@@ -314,6 +665,20 @@ class Compositor(object):
         self._alpha_g = np.zeros((self.height, self.width, 1), dtype=np.float32)
         self._color = self._color_0
         self._alpha = self._alpha_0
+        # Whether the color is 1 where alpha is 0, as left by _apply_source.
+        self._transparent_reset = False
+        # Scratch arrays of the viewport reused by the blends.
+        self._buffers: dict[tuple, np.ndarray] = {}
+        self._render_cache = render_cache
+        # Fingerprints of the layers, shared with the nested compositors.
+        self._fingerprints: dict[int, bytes] = {}
+        # Digest of the backdrop and of the layers applied so far, which
+        # identifies the state in the render cache.
+        self._state = b""
+        if render_cache is not None:
+            self._state = digest(
+                viewport, color, alpha, isolated, force, adjustment_isolated
+            )
 
     def apply(self, layer: Layer, clip_compositing: bool = False) -> None:
         logger.debug("Compositing %s" % layer)
@@ -329,28 +694,25 @@ class Compositor(object):
         if not clip_compositing and layer.clipping:
             return
 
-        is_adjustment_isolated = None
+        region = self._local_region(layer)
+        if region is not None:
+            # Blend the layer only over its bbox, in a compositor whose state
+            # is a view of this one.
+            local = self._crop(region)
+            local.apply(layer, clip_compositing)
+            self._paste_local(local, region)
+            self._state = local._state
+            return
+
         knockout = bool(layer.tagged_blocks.get_data(Tag.KNOCKOUT_SETTING, 0))
         if isinstance(layer, AdjustmentLayer):
             self._apply_adjustment(layer)
+            self._advance(layer)
             return
-        elif isinstance(layer, GroupMixin):
-            color, shape, alpha, is_adjustment_isolated = self._get_group(
-                layer, knockout
-            )
-        else:
-            color, shape, alpha = self._get_object(layer)
-
-        # Composite clip layers.
-        if layer.has_clip_layers():
-            color = self._apply_clip_layers(layer, color, alpha)
-
-        # Apply masks and opacity.
-        shape_mask, opacity_mask = self._get_mask(layer)
-        shape_const, opacity_const = self._get_const(layer)
-        mask = shape_mask * opacity_mask * opacity_const
-        shape *= shape_mask
-        alpha *= mask
+        color, shape, alpha, shape_mask, mask, is_adjustment_isolated = (
+            self._get_source(layer, knockout)
+        )
+        shape_const, _ = self._get_const(layer)
 
         # TODO: Tag.BLEND_INTERIOR_ELEMENTS controls how inner effects apply.
 
@@ -383,6 +745,159 @@ class Compositor(object):
             self._apply_stroke_effect(layer, color, shape_mask, alpha)
         else:
             self._apply_stroke_effect(layer, color, shape, alpha)
+        self._advance(layer)
+
+    def _get_source(self, layer: Layer, knockout: bool) -> _Source:
+        """
+        Get the color, shape and alpha of a layer with its clip layers and
+        masks applied, from the render cache if any.
+        """
+        if self._render_cache is None:
+            return self._render_source(layer, knockout)
+        # Other than pass-through groups, layers do not depend on the backdrop.
+        backdrop = b""
+        if isinstance(layer, GroupMixin) and layer.blend_mode == BlendMode.PASS_THROUGH:
+            backdrop = self._state
+        key = digest(
+            self._fingerprint(layer),
+            self._viewport,
+            knockout,
+            self._force,
+            self._adjustment_isolated,
+            backdrop,
+        )
+        return cast(
+            _Source,
+            self._render_cache.get(key, lambda: self._render_source(layer, knockout)),
+        )
+
+    def _render_source(self, layer: Layer, knockout: bool) -> _Source:
+        is_adjustment_isolated = None
+        if isinstance(layer, GroupMixin):
+            color, shape, alpha, is_adjustment_isolated = self._get_group(
+                layer, knockout
+            )
+        else:
+            color, shape, alpha = self._get_object(layer)
+
+        # Composite clip layers.
+        if layer.has_clip_layers():
+            color = self._apply_clip_layers(layer, color, alpha)
+
+        # Apply masks and opacity.
+        shape_mask, opacity_mask = self._get_mask(layer)
+        _, opacity_const = self._get_const(layer)
+        mask = shape_mask * opacity_mask * opacity_const
+        shape *= shape_mask
+        alpha *= mask
+        return color, shape, alpha, shape_mask, mask, is_adjustment_isolated
+
+    def _fingerprint(self, layer: Layer) -> bytes:
+        return fingerprint(layer, self._layer_filter, self._fingerprints)
+
+    def _advance(self, layer: Layer) -> None:
+        """Chain the digest of the state with a layer that has been applied."""
+        if self._render_cache is not None:
+            self._state = digest(self._state, self._fingerprint(layer))
+
+    def _nest(self, compositor: "Compositor", *parts: Any) -> "Compositor":
+        """Share the render cache with a compositor derived from this state."""
+        if self._render_cache is not None:
+            compositor._render_cache = self._render_cache
+            compositor._fingerprints = self._fingerprints
+            compositor._state = digest(self._state, self._viewport, *parts)
+        return compositor
+
+    def _local_region(self, layer: Layer) -> tuple[int, int, int, int] | None:
+        """
+        Get the part of the viewport a layer is blended in, when the layer
+        leaves the pixels outside of its bbox unchanged. Otherwise, None.
+        """
+        if isinstance(layer, AdjustmentLayer):
+            return None
+        if isinstance(layer, GroupMixin):
+            # Adjustments in pass-through groups apply to the whole backdrop.
+            if layer.blend_mode == BlendMode.PASS_THROUGH:
+                return None
+        elif (
+            layer.has_pixels()
+            and not (self._force and utils.has_fill(layer))
+            and not any(
+                info.id == ChannelID.TRANSPARENCY_MASK and data._length > 2
+                for info, data in zip(layer._record.channel_info, layer._channels)
+            )
+        ):
+            # Without transparency, the layer covers the whole viewport.
+            return None
+        if layer.tagged_blocks.get_data(Tag.KNOCKOUT_SETTING, 0):
+            return None
+        region = utils.intersect(self._viewport, layer.bbox)
+        if region in ((0, 0, 0, 0), self._viewport):
+            return None
+        # Stroke effects of clip layers see the shape within the viewport.
+        if layer.has_clip_layers() and _has_stroke_effect(layer.clip_layers):
+            return None
+        return region
+
+    def _crop(self, region: tuple[int, int, int, int]) -> "Compositor":
+        """Get a compositor over a region whose state is a view of this one."""
+        self._own()
+        index = self._index(region)
+        local = copy.copy(self)
+        local._viewport = region
+        local._buffers = {key: buffer[index] for key, buffer in self._buffers.items()}
+        local._color_0 = self._color_0[index]
+        local._alpha_0 = self._alpha_0[index]
+        local._shape_g = self._shape_g[index]
+        local._alpha_g = self._alpha_g[index]
+        local._color = self._color[index]
+        local._alpha = self._alpha[index]
+        return local
+
+    def _paste_local(
+        self, local: "Compositor", region: tuple[int, int, int, int]
+    ) -> None:
+        """Update the state of this compositor within a region from another."""
+        channels = local._color.shape[2]
+        if self._color_0.shape[2] < local._color_0.shape[2]:
+            self._color_0 = np.repeat(self._color_0, channels, axis=2)
+        if self._color.shape[2] < channels:
+            self._color = np.repeat(self._color, channels, axis=2)
+        if not self._transparent_reset:
+            # The full-frame blend divides by alpha, which sets the color of
+            # transparent pixels outside of the region to 1.
+            np.copyto(self._color, 1.0, where=self._alpha == 0)
+            self._transparent_reset = True
+
+        # The local state is mostly updated in place, in which case these
+        # copy the region onto itself.
+        index = self._index(region)
+        self._color[index] = local._color
+        self._alpha[index] = local._alpha
+        self._shape_g[index] = local._shape_g
+        self._alpha_g[index] = local._alpha_g
+
+    def _own(self) -> None:
+        """Copy the state shared with the backdrop before updating it in place."""
+        if self._color is self._color_0:
+            self._color = self._color.copy()
+        if self._alpha is self._alpha_0:
+            self._alpha = self._alpha.copy()
+
+    def _buffer(self, index: int, like: np.ndarray) -> np.ndarray:
+        """Get a scratch array of the viewport with the channels of ``like``."""
+        key = (index, like.shape[2], like.dtype)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = np.empty((self.height, self.width, like.shape[2]), like.dtype)
+            self._buffers[key] = buffer
+        return buffer
+
+    def _index(self, region: tuple[int, int, int, int]) -> tuple[slice, slice]:
+        return (
+            slice(region[1] - self._viewport[1], region[3] - self._viewport[1]),
+            slice(region[0] - self._viewport[0], region[2] - self._viewport[0]),
+        )
 
     def _apply_passthrough_source(
         self,
@@ -391,21 +906,33 @@ class Compositor(object):
         alpha: np.ndarray,
         mask: float | np.ndarray,
     ) -> None:
-        new_shape = cast(np.ndarray, utils.union(self._shape_g, shape))
+        if self._color.shape[2] == 1 and 1 < color.shape[2]:
+            self._color = np.repeat(self._color, color.shape[2], axis=2)
+        self._own()
+        source = self._buffer(0, self._color)
+        product = self._buffer(1, self._color)
+        weight = self._buffer(2, self._alpha)
+        np.multiply(color, mask, out=source)
 
         # this step is used to use over composing when no pixels are found in the backdrop, instead of linear interpolation composing
-        color_support = utils.clip(
-            utils.divide(
-                color * mask * (1.0 - self._shape_g) + self._color * self._shape_g,
-                new_shape,
-            )
-        )
-
-        self._shape_g = new_shape
-        self._alpha_g = cast(np.ndarray, utils.union(self._alpha_g, alpha))
-        self._alpha = cast(np.ndarray, utils.union(self._alpha_0, self._alpha_g))
-
-        self._color = utils.clip((color * mask + (1 - mask) * color_support))
+        # color_support = (source * (1 - shape_g) + color * shape_g) / new_shape
+        np.subtract(1.0, self._shape_g, out=weight)
+        np.multiply(source, weight, out=product)
+        self._color *= self._shape_g
+        self._color += product
+        _union(self._shape_g, shape, weight)
+        utils.divide(self._color, self._shape_g, out=self._color)
+        utils.clip(self._color, out=self._color)
+
+        _union(self._alpha_g, alpha, weight)
+        self._update_alpha(weight)
+
+        # color = source + (1 - mask) * color_support
+        np.subtract(1.0, mask, out=weight)
+        self._color *= weight
+        self._color += source
+        utils.clip(self._color, out=self._color)
+        self._transparent_reset = False
 
     def _apply_source(
         self,
@@ -419,29 +946,57 @@ class Compositor(object):
             self._color_0 = np.repeat(self._color_0, color.shape[2], axis=2)
         if self._color.shape[2] == 1 and 1 < color.shape[2]:
             self._color = np.repeat(self._color, color.shape[2], axis=2)
+        self._own()
 
-        self._shape_g = cast(np.ndarray, utils.union(self._shape_g, shape))
+        alpha_b = self._alpha_0 if knockout else self._alpha
+        color_b = self._color_0 if knockout else self._color
+
+        blend_fn = BLEND_FUNC.get(blend_mode, normal)
+        blended = blend_fn(color_b, color)
+
+        # color_t = (shape - alpha) * alpha_b * color_b
+        #     + alpha * ((1 - alpha_b) * color + alpha_b * blended)
+        color_t = self._buffer(0, self._color)
+        product = self._buffer(1, self._color)
+        weight = self._buffer(2, self._alpha)
+        np.subtract(1.0, alpha_b, out=weight)
+        np.multiply(weight, color, out=color_t)
+        np.multiply(alpha_b, blended, out=product)
+        color_t += product
+        color_t *= alpha
+        np.subtract(shape, alpha, out=weight)
+        weight *= alpha_b
+        np.multiply(weight, color_b, out=product)
+        color_t += product
+
+        # color = ((1 - shape) * alpha_previous * color + color_t) / alpha
+        np.subtract(1.0, shape, out=weight)
+        weight *= self._alpha
+        self._color *= weight
+        self._color += color_t
+
+        _union(self._shape_g, shape, weight)
         if knockout:
-            self._alpha_g = (
-                (1.0 - shape) * self._alpha_g + (shape - alpha) * self._alpha_0 + alpha
-            )
+            # alpha_g = (1 - shape) * alpha_g + (shape - alpha) * alpha_0 + alpha
+            np.subtract(1.0, shape, out=weight)
+            self._alpha_g *= weight
+            np.subtract(shape, alpha, out=weight)
+            weight *= self._alpha_0
+            self._alpha_g += weight
+            self._alpha_g += alpha
         else:
-            self._alpha_g = cast(np.ndarray, utils.union(self._alpha_g, alpha))
-        alpha_previous = self._alpha
-        self._alpha = cast(np.ndarray, utils.union(self._alpha_0, self._alpha_g))
+            _union(self._alpha_g, alpha, weight)
+        self._update_alpha(weight)
 
-        alpha_b = self._alpha_0 if knockout else alpha_previous
-        color_b = self._color_0 if knockout else self._color
+        utils.divide(self._color, self._alpha, out=self._color)
+        utils.clip(self._color, out=self._color)
+        self._transparent_reset = True
 
-        blend_fn = BLEND_FUNC.get(blend_mode, normal)
-        color_t = (shape - alpha) * alpha_b * color_b + alpha * (
-            (1.0 - alpha_b) * color + alpha_b * blend_fn(color_b, color)
-        )
-        self._color = utils.clip(
-            utils.divide(
-                (1.0 - shape) * alpha_previous * self._color + color_t, self._alpha
-            )
-        )
+    def _update_alpha(self, scratch: np.ndarray) -> None:
+        """Set alpha to the union of the backdrop and group alpha in place."""
+        np.multiply(self._alpha_0, self._alpha_g, out=scratch)
+        np.add(self._alpha_0, self._alpha_g, out=self._alpha)
+        self._alpha -= scratch
 
     def _apply_adjustment(self, layer: AdjustmentLayer) -> None:
         adjustment_fn = ADJUSTMENT_FUNC.get(layer.kind)
@@ -481,6 +1036,7 @@ class Compositor(object):
             self._color = utils.clip(
                 backdrop_color + opacity * (blended - backdrop_color)
             )
+        self._transparent_reset = False
 
     def finish(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         return self.color, self.shape, self.alpha
@@ -533,14 +1089,21 @@ class Compositor(object):
         shape_const, _ = self._get_const(layer)
         isolate_adjustments = shape_const < 1.0 or layer.has_clip_layers()
 
-        group_compositor = Compositor(
+        group_compositor = self._nest(
+            Compositor(
+                viewport,
+                color=paste(viewport, self._viewport, color_b, 1.0),
+                alpha=paste(viewport, self._viewport, alpha_b),
+                isolated=(not is_passthrough),
+                layer_filter=self._layer_filter,
+                force=self._force,
+                adjustment_isolated=self._adjustment_isolated or isolate_adjustments,
+            ),
+            b"group",
             viewport,
-            color=paste(viewport, self._viewport, color_b, 1.0),
-            alpha=paste(viewport, self._viewport, alpha_b),
-            isolated=(not is_passthrough),
-            layer_filter=self._layer_filter,
-            force=self._force,
-            adjustment_isolated=self._adjustment_isolated or isolate_adjustments,
+            knockout,
+            is_passthrough,
+            isolate_adjustments,
         )
 
         for sublayer in cast(GroupMixin, layer):
@@ -564,9 +1127,23 @@ class Compositor(object):
 
     def _get_object(self, layer: Layer) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Get object attributes."""
-        color, shape = layer.numpy("color"), layer.numpy("shape")
+        # Only decode the part of the layer within the viewport.
+        bbox = layer.bbox
+        region = utils.intersect(self._viewport, bbox)
+        if region in ((0, 0, 0, 0), bbox) or bbox != (
+            layer.left,
+            layer.top,
+            layer.right,
+            layer.bottom,
+        ):
+            region = bbox
+            color, shape = layer.numpy("color"), layer.numpy("shape")
+        else:
+            color = layer.numpy("color", viewport=region)
+            shape = layer.numpy("shape", viewport=region)
         if (self._force or not layer.has_pixels()) and utils.has_fill(layer):
             color, shape = paint.create_fill(layer, layer.bbox)
+            region = layer.bbox
             if shape is None:
                 shape = np.ones((layer.height, layer.width, 1), dtype=np.float32)
 
@@ -578,11 +1155,11 @@ class Compositor(object):
         if color is None:
             color = np.ones((self.height, self.width, 1), dtype=np.float32)
         else:
-            color = paste(self._viewport, layer.bbox, color, 1.0)
+            color = paste(self._viewport, region, color, 1.0)
         if shape is None:
             shape = np.ones((self.height, self.width, 1), dtype=np.float32)
         else:
-            shape = paste(self._viewport, layer.bbox, shape)
+            shape = paste(self._viewport, region, shape)
 
         alpha = shape * 1.0  # Constant factor is always 1.
 
@@ -607,12 +1184,16 @@ class Compositor(object):
         self, layer: Layer, color: np.ndarray, alpha: np.ndarray
     ) -> np.ndarray:
         # TODO: Consider Tag.BLEND_CLIPPING_ELEMENTS.
-        compositor = Compositor(
-            self._viewport,
-            color,
-            alpha,
-            layer_filter=self._layer_filter,
-            force=self._force,
+        compositor = self._nest(
+            Compositor(
+                self._viewport,
+                color,
+                alpha,
+                layer_filter=self._layer_filter,
+                force=self._force,
+            ),
+            b"clip",
+            self._fingerprint(layer),
         )
         for clip_layer in layer.clip_layers:
             compositor.apply(clip_layer, clip_compositing=True)
@@ -624,11 +1205,17 @@ class Compositor(object):
         opacity: float = 1.0
         if layer.mask is not None and not layer.mask.disabled:
             # TODO: When force, ignore real mask.
-            mask = layer.numpy("mask", real_mask=not self._force)
+            bbox = layer.mask.bbox
+            region = utils.intersect(self._viewport, bbox)
+            if region in ((0, 0, 0, 0), bbox):
+                region = bbox
+                mask = layer.numpy("mask", real_mask=not self._force)
+            else:
+                mask = layer.numpy("mask", real_mask=not self._force, viewport=region)
             if mask is not None:
                 shape = paste(
                     self._viewport,
-                    layer.mask.bbox,
+                    region,
                     mask,
                     layer.mask.background_color / 255.0,
                 )
@@ -768,3 +1355,22 @@ class Compositor(object):
             shape = paste(self._viewport, layer.bbox, shape_in_bbox)
             opacity = effect.opacity / 100.0
             self._apply_source(color, shape, shape * opacity, effect.blend_mode)
+
+
+def _union(
+    backdrop: np.ndarray, source: float | np.ndarray, scratch: np.ndarray
+) -> None:
+    """Update ``backdrop`` to :py:func:`utils.union` with ``source`` in place."""
+    np.multiply(backdrop, source, out=scratch)
+    backdrop += source
+    backdrop -= scratch
+
+
+def _has_stroke_effect(layers: Iterable[Layer]) -> bool:
+    """Check if any of the layers or their descendants has a stroke effect."""
+    for layer in layers:
+        if any(True for _ in layer.effects.find("stroke")):
+            return True
+        if isinstance(layer, GroupMixin) and _has_stroke_effect(layer.descendants()):
+            return True
+    return False
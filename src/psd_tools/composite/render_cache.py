@@ -0,0 +1,143 @@
+"""
+In-memory cache of rendered layers.
+
+Compositing renders each layer and group into color, shape and alpha arrays,
+with its clip layers and masks applied, before blending them onto the
+backdrop. :py:class:`RenderCache` keeps these arrays, keyed by a fingerprint
+of the layer content: the layer record with its tagged blocks and mask, the
+identity of the channel data, and the fingerprints of the layers inside a
+group and of the clip layers. When a document is composited again after an
+edit, such as toggling the visibility of a layer or replacing its pixels,
+only the edited layer and the groups that contain it are rendered again, and
+the other layers are blended from the cache. Pass-through groups depend on
+the backdrop, and are also rendered again when a layer below them changes.
+
+Caching is opt-in, either for the whole process or for one document::
+
+    from psd_tools import PSDImage
+    from psd_tools.composite.render_cache import RenderCache, set_render_cache
+
+    set_render_cache(RenderCache(max_bytes=1024 * 1024 * 1024))
+
+    # Or, for a single document.
+    cache = RenderCache()
+    psd = PSDImage.open('example.psd', render_cache=cache)
+    psd.composite(force=True)
+    psd[0].visible = False
+    psd.composite(force=True)
+    print(cache.hits, cache.misses, cache.evictions)
+
+Document-wide data such as patterns is not part of the fingerprint; clear the
+cache after modifying it. Arrays returned from a cache are read-only; see
+:py:class:`~psd_tools.lru_cache.LRUCache`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from psd_tools.api.layers import GroupMixin, Layer
+from psd_tools.lru_cache import LRUCache
+
+#: Default limit on the total size of the entries in a cache.
+DEFAULT_MAX_BYTES: int = 512 * 1024 * 1024
+
+_render_cache: RenderCache | None = None
+
+
+class RenderCache(LRUCache):
+    """
+    Least recently used cache of rendered layers.
+
+    Entries larger than ``max_bytes`` are not cached. The cache is safe to
+    share between the threads compositing tiles.
+
+    :param max_bytes: limit on the total size of the entries in bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        super().__init__(max_bytes)
+
+    def get(self, key: Hashable, render: Callable[[], tuple]) -> tuple:
+        """
+        Get a rendered layer, rendering it on a miss.
+
+        :param key: fingerprint of the layer and of the rendering context.
+        :param render: function that renders the layer into a tuple of
+            arrays and scalars.
+        :return: the cached or rendered tuple.
+        """
+        return self._get(key, render)
+
+
+def set_render_cache(cache: RenderCache | None) -> None:
+    """
+    Set the process-wide :py:class:`RenderCache`.
+
+    The cache is used for documents that do not have their own. The default
+    of `None` disables caching.
+
+    :param cache: :py:class:`RenderCache` or `None`.
+    """
+    global _render_cache
+    _render_cache = cache
+
+
+def get_render_cache() -> RenderCache | None:
+    """Get the process-wide :py:class:`RenderCache`, or `None`."""
+    return _render_cache
+
+
+def digest(*parts: Any) -> bytes:
+    """Digest of bytes, arrays and values with a stable `repr`."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(repr((part.shape, part.dtype.str)).encode())
+            part = np.ascontiguousarray(part).data
+        elif not isinstance(part, bytes):
+            part = repr(part).encode()
+        h.update(part)
+    return h.digest()
+
+
+def fingerprint(
+    layer: Layer,
+    layer_filter: Callable[[Layer], bool] | None,
+    memo: dict[int, bytes],
+) -> bytes:
+    """
+    Fingerprint of what compositing a layer depends on.
+
+    It covers the layer record with its tagged blocks and mask, the identity
+    of the channel data, whether ``layer_filter`` accepts the layer, the
+    layers inside a group, the clip layers, and the geometry and color mode
+    of the document.
+
+    :param layer: layer to fingerprint.
+    :param layer_filter: filter of the layers to composite.
+    :param memo: fingerprints by layer id, valid while the layers are not
+        modified.
+    """
+    value = memo.get(id(layer))
+    if value is not None:
+        return value
+    psd = layer._psd
+    record = io.BytesIO()
+    layer._record.write(record, encoding="utf-8", version=2)
+    parts: list[Any] = [
+        layer_filter is None or bool(layer_filter(layer)),
+        (psd.color_mode, psd.depth, psd.width, psd.height) if psd else None,
+        record.getvalue(),
+    ]
+    parts.extend(data._identity for data in layer._channels)
+    if isinstance(layer, GroupMixin):
+        parts.extend(fingerprint(child, layer_filter, memo) for child in layer)
+    parts.append(b"clip")
+    parts.extend(fingerprint(clip, layer_filter, memo) for clip in layer.clip_layers)
+    value = memo[id(layer)] = digest(*parts)
+    return value
@@ -9,10 +9,14 @@ from psd_tools.api.layers import Layer
 from psd_tools.constants import Tag
 
 
-def divide(a: NDArray[np.floating], b: NDArray[np.floating]) -> NDArray[np.floating]:
-    """Safe division for color ops."""
+def divide(
+    a: NDArray[np.floating],
+    b: NDArray[np.floating],
+    out: NDArray[np.floating] | None = None,
+) -> NDArray[np.floating]:
+    """Safe division for color ops. ``out`` may be ``a`` to divide in place."""
     with np.errstate(divide="ignore", invalid="ignore"):
-        c = np.true_divide(a, b)
+        c = np.true_divide(a, b, out=out)
         c[~np.isfinite(c)] = 1.0
     return c
 
@@ -64,6 +68,8 @@ def union(
     return backdrop + source - (backdrop * source)
 
 
-def clip(x: NDArray[np.floating]) -> NDArray[np.floating]:
-    """Clip between [0, 1]."""
-    return np.clip(x, 0.0, 1.0)
+def clip(
+    x: NDArray[np.floating], out: NDArray[np.floating] | None = None
+) -> NDArray[np.floating]:
+    """Clip between [0, 1]. ``out`` may be ``x`` to clip in place."""
+    return np.clip(x, 0.0, 1.0, out=out)
@@ -21,8 +21,12 @@ Key functions:
 
 - :py:func:`compress`: Compress raw pixel data using specified method
 - :py:func:`decompress`: Decompress pixel data back to raw bytes
+- :py:func:`decompress_into`: Decompress pixel data into a NumPy array
 - :py:func:`encode_rle`: RLE encoding for a single channel
 - :py:func:`decode_rle`: RLE decoding for a single channel
+- :py:func:`set_decode_workers`: Number of threads used for decoding
+- :py:class:`CompressionPolicy`: zlib level and threads used for encoding
+- :py:func:`select_compression`: Choice of compression for ``Compression.AUTO``
 
 Example usage::
 
@@ -55,6 +59,11 @@ Performance notes:
 - ZIP with prediction works well for continuous-tone images
 - The Cython RLE codec can be 10-100x faster than pure Python
 - Compression method is chosen per-channel when saving PSD files
+- With :py:func:`set_decode_workers`, the channels of a layer and the row
+  bands of large RLE channels are decoded on a thread pool; zlib and the
+  Cython RLE decoder release the GIL
+- A :py:class:`CompressionPolicy` compresses channels, and blocks of large
+  ZIP streams, on a thread pool when saving
 
 The compression module handles various bit depths (8, 16, 32-bit per channel)
 and implements delta encoding for improved compression ratios on certain
@@ -62,21 +71,23 @@ image types.
 """
 
 import array
+import importlib
 import io
+import itertools
 import logging
+import os
+import sys
+import threading
 import warnings
+import weakref
 import zlib
-from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
 
-from PIL import Image
+import numpy as np
 
 from psd_tools.constants import Compression
-from psd_tools.psd.bin_utils import (
-    be_array_from_bytes,
-    be_array_to_bytes,
-    read_be_array,
-    write_be_array,
-)
+from psd_tools.psd.bin_utils import read_be_array
 
 try:
     from . import _rle as rle_impl  # type: ignore[import-not-found,attr-defined]
@@ -85,6 +96,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class PSDDecompressionWarning(UserWarning):
     """Issued when channel data cannot be fully decompressed.
@@ -109,6 +123,262 @@ _MAX_DIMENSION: int = 300_000  # PSD/PSB hard limit per the Adobe spec
 MAX_DEGRADED_BYTES: int | None = 16 * 1024 * 1024
 MAX_DEGRADED_RATIO: int = 1000
 
+# RLE channels smaller than this are not split into row bands.
+_MIN_BAND_BYTES: int = 1024 * 1024
+
+_decode_workers: int = 1
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def set_decode_workers(workers: int | None = None) -> None:
+    """Set the number of threads used to decode channel data.
+
+    With more than one worker, the channels of a layer are decoded
+    concurrently, and large RLE channels, including the merged image data,
+    are decoded in row bands. The default of 1 decodes serially.
+
+    :param workers: number of threads, or `None` for :py:func:`os.cpu_count`.
+    """
+    global _decode_workers, _executor
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers < 1:
+        raise ValueError("workers must be at least 1, got %d" % workers)
+    with _executor_lock:
+        if workers != _decode_workers:
+            # Decodes in flight may still submit to the old pool, so it is not
+            # shut down; its threads exit once it is garbage collected.
+            _executor = None
+        _decode_workers = workers
+
+
+def get_decode_workers() -> int:
+    """Get the number of threads used to decode channel data."""
+    return _decode_workers
+
+
+def decode_map(func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """Apply a decoding *func* to *items*, on the decode thread pool if enabled.
+
+    Calls made from a pool thread run serially, so that nested decoding never
+    waits on its own pool.
+    """
+    items = list(items)
+    if len(items) < 2 or _decode_workers < 2 or _in_worker():
+        return [func(item) for item in items]
+    return list(_get_executor().map(func, items))
+
+
+def _in_worker() -> bool:
+    return getattr(_worker_state, "active", False)
+
+
+def _mark_worker() -> None:
+    _worker_state.active = True
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                _decode_workers,
+                thread_name_prefix="psd-tools-decode",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+
+class CompressionPolicy:
+    """
+    Options for compressing channel data.
+
+    The policy sets the zlib level used by ZIP and ZIP_WITH_PREDICTION, the
+    number of threads that compress the channels of a layer concurrently, and
+    the deflate implementation. With more than one worker, large ZIP streams
+    are also split into blocks that are deflated in parallel, and joined into
+    a single zlib stream that any reader can decode.
+
+    Example::
+
+        from psd_tools.compression import CompressionPolicy
+
+        policy = CompressionPolicy(level=1, workers=8, backend="auto")
+        psdimage.create_pixel_layer(
+            image, compression=Compression.ZIP, compression_policy=policy
+        )
+        psdimage.save("output.psd", compression_policy=policy)
+
+    :param level: zlib compression level from 0 to 9, or -1 for the default.
+    :param workers: number of threads, or `None` for :py:func:`os.cpu_count`.
+    :param backend: deflate implementation, one of 'zlib', 'zlib-ng' or
+        'isal', or 'auto' for the fastest one installed. A backend that is
+        not installed falls back to :py:mod:`zlib`.
+    :param objective: what :py:attr:`Compression.AUTO
+        <psd_tools.constants.Compression.AUTO>` optimizes for: 'size' for the
+        smallest file, 'speed' for the fastest decoding, or 'balanced'.
+    """
+
+    def __init__(
+        self,
+        level: int = -1,
+        workers: int | None = 1,
+        backend: str = "zlib",
+        objective: str = "balanced",
+    ) -> None:
+        if not -1 <= level <= 9:
+            raise ValueError("level must be between -1 and 9, got %d" % level)
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        if workers < 1:
+            raise ValueError("workers must be at least 1, got %d" % workers)
+        if backend != "auto" and backend not in _DEFLATE_BACKENDS:
+            raise ValueError("Unknown deflate backend %r" % backend)
+        if objective not in _OBJECTIVE_COSTS:
+            raise ValueError("Unknown compression objective %r" % objective)
+        self.level = level
+        self.workers = workers
+        self.backend = backend
+        self.objective = objective
+        self._zlib = _load_deflate_backend(backend)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_workers = 0
+        self._finalizer: weakref.finalize | None = None
+        self._executor_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return "%s(level=%d, workers=%d, backend=%r, objective=%r)" % (
+            self.__class__.__name__,
+            self.level,
+            self.workers,
+            self.backend,
+            self.objective,
+        )
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Apply *func* to *items*, on a thread pool when there are workers.
+
+        The pool is created on first use and kept until :py:meth:`shutdown`
+        or until the policy is garbage collected. Calls made from a pool
+        thread run serially.
+        """
+        items = list(items)
+        if len(items) < 2 or self.workers < 2 or _in_worker():
+            return [func(item) for item in items]
+        return list(self._get_executor().map(func, items))
+
+    def shutdown(self) -> None:
+        """Shut down the thread pool of :py:meth:`map`, if any."""
+        with self._executor_lock:
+            executor = self._release_executor()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is not None and self._executor_workers != self.workers:
+                # Workers changed since the pool was created. Calls in flight
+                # may still submit to the old pool; it exits once collected.
+                self._release_executor()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.workers,
+                    thread_name_prefix="psd-tools-encode",
+                    initializer=_mark_worker,
+                )
+                self._executor_workers = self.workers
+                self._finalizer = weakref.finalize(
+                    self, self._executor.shutdown, wait=False
+                )
+            return self._executor
+
+    def _release_executor(self) -> ThreadPoolExecutor | None:
+        """Forget the pool and its finalizer; return the pool."""
+        executor, self._executor = self._executor, None
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        return executor
+
+    def deflate(self, data: bytes | bytearray) -> bytes:
+        """Compress *data* into a zlib stream."""
+        level = self.level if self.level >= 0 else self._zlib.Z_DEFAULT_COMPRESSION
+        level = min(level, self._zlib.Z_BEST_COMPRESSION)
+        blocks = min(self.workers, len(data) // _MIN_BAND_BYTES)
+        if blocks < 2 or _in_worker():
+            return self._zlib.compress(data, level)
+
+        view = memoryview(data)
+        edges = [len(data) * i // blocks for i in range(blocks + 1)]
+
+        def deflate_block(block: int) -> bytes:
+            # Each block is a raw deflate stream primed with the window that
+            # precedes it; sync flushes keep the blocks byte-aligned.
+            start, stop = edges[block], edges[block + 1]
+            kwargs = {"zdict": bytes(view[max(start - _WINDOW, 0) : start])}
+            compressor = self._zlib.compressobj(
+                level, zlib.DEFLATED, -zlib.MAX_WBITS, **(kwargs if start else {})
+            )
+            mode = zlib.Z_FINISH if block == blocks - 1 else zlib.Z_SYNC_FLUSH
+            return compressor.compress(view[start:stop]) + compressor.flush(mode)
+
+        header = 0x7800 | _zlib_level_flags(self.level) << 6
+        header += 31 - header % 31
+        return b"".join(
+            [
+                header.to_bytes(2, "big"),
+                *self.map(deflate_block, range(blocks)),
+                zlib.adler32(data).to_bytes(4, "big"),
+            ]
+        )
+
+
+#: Deflate implementations by name, fastest first.
+_DEFLATE_BACKENDS: dict[str, str] = {
+    "isal": "isal.isal_zlib",
+    "zlib-ng": "zlib_ng.zlib_ng",
+    "zlib": "zlib",
+}
+
+# Size of the deflate window that primes each parallel block.
+_WINDOW: int = 32 * 1024
+
+# Decoding cost of each mode of Compression.AUTO, in compressed bytes per raw
+# byte, for each objective. Modes missing from an objective are not selected.
+_OBJECTIVE_COSTS: dict[str, dict[Compression, float]] = {
+    "size": {
+        Compression.RAW: 0.0,
+        Compression.RLE: 0.0,
+        Compression.ZIP_WITH_PREDICTION: 0.0,
+    },
+    "balanced": {
+        Compression.RAW: 0.0,
+        Compression.RLE: 0.05,
+        Compression.ZIP_WITH_PREDICTION: 0.25,
+    },
+    "speed": {Compression.RAW: 0.0, Compression.RLE: 0.05},
+}
+
+# Number of rows that Compression.AUTO compresses to estimate the sizes.
+_SAMPLE_ROWS: int = 32
+
+
+def _load_deflate_backend(backend: str) -> Any:
+    names = list(_DEFLATE_BACKENDS) if backend == "auto" else [backend]
+    for name in names:
+        try:
+            return importlib.import_module(_DEFLATE_BACKENDS[name])
+        except ImportError:
+            logger.debug("Deflate backend %r is not installed", name)
+    return zlib
+
+
+def _zlib_level_flags(level: int) -> int:
+    """Return the FLEVEL bits of the zlib header for *level*."""
+    if level in (-1, 6):
+        return 2
+    return 0 if level < 2 else 1 if level < 6 else 3
+
 
 def _warn_decompress_failure(
     codec: str,
@@ -128,14 +398,19 @@ def _warn_decompress_failure(
     warnings.warn(msg, PSDDecompressionWarning, stacklevel=3)
 
 
-def _safe_zlib_decompress(data: bytes, max_length: int) -> bytes:
+def _safe_zlib_decompress(
+    data: bytes | memoryview, max_length: int, truncate: bool = False
+) -> bytes:
     """Decompress *data* with a hard upper bound on output size.
 
     Unlike :func:`zlib.decompress`, this function raises :exc:`ValueError`
     if the decompressed output would exceed *max_length* bytes, preventing
-    memory exhaustion from crafted ZIP-bomb payloads.
+    memory exhaustion from crafted ZIP-bomb payloads. With *truncate*,
+    decompression instead stops after *max_length* bytes.
     """
     d = zlib.decompressobj()
+    if truncate:
+        return d.decompress(data, max_length) if max_length > 0 else b""
     out = d.decompress(data, max_length + 1)
     if d.unconsumed_tail:
         raise ValueError(
@@ -152,6 +427,7 @@ def compress(
     height: int,
     depth: int,
     version: int = 1,
+    policy: CompressionPolicy | None = None,
 ) -> bytes:
     """Compress raw data.
 
@@ -161,69 +437,79 @@ def compress(
     :param height: height.
     :param depth: bit depth of the pixel.
     :param version: psd file version.
+    :param policy: optional :py:class:`CompressionPolicy` for ZIP streams.
     :return: compressed data bytes.
     """
+    _check_stored(compression)
+    deflate = policy.deflate if policy is not None else zlib.compress
     if compression == Compression.RAW:
         result = data
     elif compression == Compression.RLE:
         result = encode_rle(data, width, height, depth, version)
     elif compression == Compression.ZIP:
-        result = zlib.compress(data)
+        result = deflate(data)
     else:
         encoded = encode_prediction(data, width, height, depth)
-        result = zlib.compress(encoded)
+        result = deflate(encoded)
 
     return result
 
 
 def decompress(
-    data: bytes,
+    data: bytes | memoryview,
     compression: Compression,
     width: int,
     height: int,
     depth: int,
     version: int = 1,
+    rows: tuple[int, int] | None = None,
 ) -> bytes:
     """Decompress raw data.
 
-    :param data: compressed data bytes.
+    :param data: compressed data bytes, or a `memoryview` of them.
     :param compression: compression type,
             see :py:class:`~psd_tools.constants.Compression`.
     :param width: width in pixels; must be in [1, 300000].
     :param height: height in pixels; must be in [1, 300000].
     :param depth: bit depth of the pixel; must be one of 1, 8, 16, 32.
     :param version: psd file version.
+    :param rows: optional `(start, stop)` range of rows to decode. RLE data
+        is only decoded for these rows, and ZIP data is only inflated up to
+        *stop*. Not supported for 1-bit depth.
     :return: decompressed data bytes.
-    :raises ValueError: if *width*, *height*, or *depth* are out of range.
+    :raises ValueError: if *width*, *height*, *depth* or *rows* are out of
+        range.
     """
-    if width < 1 or width > _MAX_DIMENSION:
-        raise ValueError("width %d out of range [1, %d]" % (width, _MAX_DIMENSION))
-    if height < 1 or height > _MAX_DIMENSION:
-        raise ValueError("height %d out of range [1, %d]" % (height, _MAX_DIMENSION))
-    if depth not in _VALID_DEPTHS:
-        raise ValueError("depth %d not in %s" % (depth, sorted(_VALID_DEPTHS)))
+    _check_stored(compression)
+    _check_dimensions(width, height, depth)
+    start, stop = _check_rows(rows, height, depth)
 
-    length = width * height * max(1, depth // 8)
+    row_size = width * max(1, depth // 8)
+    length = (stop - start) * row_size
 
     result: bytes | None = None
     if compression == Compression.RAW:
-        result = data[:length]
+        result = bytes(data[start * row_size : stop * row_size])
     elif compression == Compression.RLE:
         try:
-            result = decode_rle(data, width, height, depth, version)
+            result = decode_rle(data, width, height, depth, version, rows=rows)
         except (ValueError, IndexError) as e:
             _warn_decompress_failure("RLE", e, width, height, depth, version)
             result = None
     elif compression == Compression.ZIP:
         try:
-            result = _safe_zlib_decompress(data, length)
+            result = _safe_zlib_decompress(
+                data, stop * row_size, truncate=rows is not None
+            )[start * row_size :]
         except (ValueError, zlib.error) as e:
             _warn_decompress_failure("ZIP", e, width, height, depth, version)
             result = None
     else:
         try:
-            decompressed = _safe_zlib_decompress(data, length)
-            result = decode_prediction(decompressed, width, height, depth)
+            decompressed = _safe_zlib_decompress(
+                data, stop * row_size, truncate=rows is not None
+            )[start * row_size :]
+            result = decode_prediction(decompressed, width, stop - start, depth)
         except (ValueError, zlib.error) as e:
             _warn_decompress_failure(
                 "ZIP_WITH_PREDICTION", e, width, height, depth, version
@@ -232,19 +518,8 @@ def decompress(
 
     if depth >= 8:
         if result is None:
-            if (
-                MAX_DEGRADED_BYTES is not None
-                and length > MAX_DEGRADED_BYTES
-                and length > len(data) * MAX_DEGRADED_RATIO
-            ):
-                raise ValueError(
-                    "Refusing to allocate %d bytes for a channel that failed to "
-                    "decode from %d input bytes (width=%d height=%d); set "
-                    "psd_tools.compression.MAX_DEGRADED_BYTES = None to allow it."
-                    % (length, len(data), width, height)
-                )
-            mode = "L" if depth == 8 else "RGB" if depth == 24 else "RGBA"
-            result = Image.new(mode, (width, height), color=0).tobytes()
+            _check_degraded(length, data, width, stop - start)
+            result = bytes(length)
             logger.warning("Failed channel has been replaced by black")
         else:
             if len(result) != length:
@@ -258,29 +533,224 @@ def decompress(
     return result
 
 
-def encode_rle(data: bytes, width: int, height: int, depth: int, version: int) -> bytes:
+def decompress_into(
+    out: np.ndarray,
+    data: bytes | memoryview,
+    compression: Compression,
+    width: int,
+    height: int,
+    depth: int,
+    version: int = 1,
+    rows: tuple[int, int] | None = None,
+) -> np.ndarray:
+    """Decompress raw data into an array.
+
+    Decoded samples are written straight into *out*: RAW and RLE data need no
+    intermediate buffer, and ZIP data only the inflated stream. Big-endian
+    samples are swapped in place when *out* has a native byte order. Failed
+    channels are filled with zeros, as in :py:func:`decompress`.
+
+    :param out: writable C-contiguous array of ``width * height`` samples, or
+        of ``width`` times the number of *rows*; `uint8` for 8-bit, `uint16`
+        for 16-bit and `float32` for 32-bit depth, in either byte order.
+    :param data: compressed data bytes, or a `memoryview` of them.
+    :param compression: compression type,
+            see :py:class:`~psd_tools.constants.Compression`.
+    :param width: width in pixels; must be in [1, 300000].
+    :param height: height in pixels; must be in [1, 300000].
+    :param depth: bit depth of the pixel; must be one of 8, 16, 32.
+    :param version: psd file version.
+    :param rows: optional `(start, stop)` range of rows to decode, see
+        :py:func:`decompress`.
+    :return: *out*.
+    :raises ValueError: if the arguments or *out* do not match.
+    """
+    _check_stored(compression)
+    _check_dimensions(width, height, depth)
+    if depth == 1:
+        raise ValueError("decompress_into() does not support 1-bit depth")
+    start, stop = _check_rows(rows, height, depth)
+    kind = "f" if depth == 32 else "u"
+    if (
+        out.dtype.kind != kind
+        or out.dtype.itemsize != depth // 8
+        or out.size != width * (stop - start)
+        or not out.flags.c_contiguous
+        or not out.flags.writeable
+    ):
+        raise ValueError(
+            "Expected a writable contiguous %s%d array of %d samples, got %s%r"
+            % (kind, depth // 8, width * (stop - start), out.dtype, out.shape)
+        )
+
+    raw = out.reshape(-1).view(np.uint8)
     row_size = width * depth // 8
-    with io.BytesIO(data) as fp:
-        rows = [rle_impl.encode(fp.read(row_size)) for _ in range(height)]
-    bytes_counts = array.array(("H", "I")[version - 1], map(len, rows))
-    encoded = b"".join(rows)
+    length = len(raw)
+    result_length: int | None = length
+    if compression == Compression.RAW:
+        view = memoryview(data)[start * row_size : stop * row_size]
+        result_length = len(view)
+        raw[:result_length] = np.frombuffer(view, np.uint8)
+    elif compression == Compression.RLE:
+        try:
+            bytes_counts, offset = _read_rle_counts(data, height, version)
+            offset += sum(bytes_counts[:start])
+            bytes_counts = bytes_counts[start:stop]
+            result_length = len(bytes_counts) * row_size
+            if result_length == length:
+                _decode_rle_rows(memoryview(data)[offset:], bytes_counts, row_size, raw)
+        except (ValueError, IndexError) as e:
+            _warn_decompress_failure("RLE", e, width, height, depth, version)
+            result_length = None
+    else:
+        codec = "ZIP" if compression == Compression.ZIP else "ZIP_WITH_PREDICTION"
+        try:
+            decompressed = _safe_zlib_decompress(
+                data, stop * row_size, truncate=rows is not None
+            )[start * row_size :]
+            if compression == Compression.ZIP:
+                result_length = len(decompressed)
+                if result_length == length:
+                    raw[:] = np.frombuffer(decompressed, np.uint8)
+            else:
+                _decode_prediction_into(decompressed, raw, width, stop - start, depth)
+        except (ValueError, zlib.error) as e:
+            _warn_decompress_failure(codec, e, width, height, depth, version)
+            result_length = None
+
+    if result_length is None:
+        raw.fill(0)
+        logger.warning("Failed channel has been replaced by black")
+        return out
+    if result_length != length:
+        raise ValueError(
+            "Decompressed length mismatch: got %d, expected %d"
+            % (result_length, length)
+        )
+    if depth > 8 and out.dtype.isnative and sys.byteorder == "little":
+        out.byteswap(inplace=True)
+    return out
 
-    with io.BytesIO() as fp:
-        write_be_array(fp, bytes_counts)
-        fp.write(encoded)
-        result = fp.getvalue()
 
-    return result
+def select_compression(
+    data: bytes | bytearray,
+    width: int,
+    height: int,
+    depth: int,
+    version: int = 1,
+    policy: CompressionPolicy | None = None,
+) -> Compression:
+    """Select the compression of channel data for :py:attr:`Compression.AUTO
+    <psd_tools.constants.Compression.AUTO>`.
+
+    RAW, RLE and ZIP_WITH_PREDICTION are tried on evenly spaced rows of the
+    data, and the mode with the lowest size plus decoding cost for the policy
+    objective is returned. Uniform channels such as masks usually select RLE,
+    and continuous-tone channels ZIP_WITH_PREDICTION.
+
+    :param data: raw data bytes.
+    :param width: width.
+    :param height: height.
+    :param depth: bit depth of the pixel.
+    :param version: psd file version.
+    :param policy: :py:class:`CompressionPolicy` that sets the objective and
+        the zlib level.
+    :return: :py:class:`~psd_tools.constants.Compression`
+    """
+    policy = policy or CompressionPolicy()
+    costs = _OBJECTIVE_COSTS[policy.objective]
+    row_size = (width * depth + 7) // 8
+    if row_size == 0 or height == 0:
+        return Compression.RAW
+
+    rows = np.frombuffer(data, np.uint8, row_size * height).reshape((height, row_size))
+    if height > _SAMPLE_ROWS:
+        rows = rows[np.linspace(0, height - 1, _SAMPLE_ROWS).astype(np.intp)]
+    sample, count = rows.tobytes(), len(rows)
+
+    sizes = {Compression.RAW: len(sample)}
+    if Compression.RLE in costs:
+        # 1-bit rows are packed bytes; they are run-length encoded as such.
+        rle_width, rle_depth = (row_size, 8) if depth == 1 else (width, depth)
+        sizes[Compression.RLE] = len(
+            encode_rle(sample, rle_width, count, rle_depth, version)
+        )
+    if Compression.ZIP_WITH_PREDICTION in costs and depth != 1:
+        encoded = encode_prediction(sample, width, count, depth)
+        sizes[Compression.ZIP_WITH_PREDICTION] = len(policy.deflate(encoded))
+    return min(sizes, key=lambda kind: sizes[kind] + costs[kind] * len(sample))
+
+
+def _check_stored(compression: Compression) -> None:
+    if compression == Compression.AUTO:
+        raise ValueError(
+            "Compression.AUTO must be resolved with select_compression() first"
+        )
+
+
+def _check_dimensions(width: int, height: int, depth: int) -> None:
+    if width < 1 or width > _MAX_DIMENSION:
+        raise ValueError("width %d out of range [1, %d]" % (width, _MAX_DIMENSION))
+    if height < 1 or height > _MAX_DIMENSION:
+        raise ValueError("height %d out of range [1, %d]" % (height, _MAX_DIMENSION))
+    if depth not in _VALID_DEPTHS:
+        raise ValueError("depth %d not in %s" % (depth, sorted(_VALID_DEPTHS)))
+
+
+def _check_rows(
+    rows: tuple[int, int] | None, height: int, depth: int
+) -> tuple[int, int]:
+    if rows is None:
+        return 0, height
+    start, stop = rows
+    if not 0 <= start <= stop <= height:
+        raise ValueError("rows %r out of range [0, %d]" % (rows, height))
+    if depth == 1:
+        raise ValueError("rows are not supported for 1-bit depth")
+    return start, stop
 
 
-def decode_rle(data: bytes, width: int, height: int, depth: int, version: int) -> bytes:
+def _check_degraded(
+    length: int, data: bytes | memoryview, width: int, height: int
+) -> None:
+    """Refuse the black-fill fallback when it dwarfs the input (CWE-789)."""
+    if (
+        MAX_DEGRADED_BYTES is not None
+        and length > MAX_DEGRADED_BYTES
+        and length > len(data) * MAX_DEGRADED_RATIO
+    ):
+        raise ValueError(
+            "Refusing to allocate %d bytes for a channel that failed to "
+            "decode from %d input bytes (width=%d height=%d); set "
+            "psd_tools.compression.MAX_DEGRADED_BYTES = None to allow it."
+            % (length, len(data), width, height)
+        )
+
+
+def encode_rle(data: bytes, width: int, height: int, depth: int, version: int) -> bytes:
+    return rle_impl.encode_rows(data, height, (width * depth + 7) // 8, 2 * version)
+
+
+def decode_rle(
+    data: bytes | memoryview,
+    width: int,
+    height: int,
+    depth: int,
+    version: int,
+    rows: tuple[int, int] | None = None,
+) -> bytes:
     try:
-        row_size = max(width * depth // 8, 1)
-        with io.BytesIO(data) as fp:
-            bytes_counts = read_be_array(("H", "I")[version - 1], height, fp)
-            return b"".join(
-                rle_impl.decode(fp.read(count), row_size) for count in bytes_counts
-            )
+        row_size = max((width * depth + 7) // 8, 1)
+        bytes_counts, offset = _read_rle_counts(data, height, version)
+        if rows is not None:
+            start, stop = rows
+            offset += sum(bytes_counts[:start])
+            bytes_counts = bytes_counts[start:stop]
+        result = bytearray(len(bytes_counts) * row_size)
+        _decode_rle_rows(
+            memoryview(data)[offset:], bytes_counts, row_size, memoryview(result)
+        )
+        return bytes(result)
     except ValueError as e:
         logger.error(f"An error occurred during RLE decoding: {e}")
         logger.info(
@@ -290,66 +760,112 @@ def decode_rle(data: bytes, width: int, height: int, depth: int, version: int) -
         raise
 
 
+def _read_rle_counts(
+    data: bytes | memoryview, height: int, version: int
+) -> tuple[array.array, int]:
+    """Read the row byte counts; return them as an ``I`` array and the offset
+    of the first row."""
+    # Only the table is wrapped, so that a memoryview is not copied whole.
+    with io.BytesIO(data[: height * 2 * version]) as fp:
+        bytes_counts = read_be_array(("H", "I")[version - 1], height, fp)
+        offset = fp.tell()
+    if bytes_counts.typecode != "I":
+        bytes_counts = array.array("I", bytes_counts)
+    return bytes_counts, offset
+
+
+def _decode_rle_rows(
+    view: memoryview,
+    bytes_counts: array.array,
+    row_size: int,
+    out: memoryview | np.ndarray,
+) -> None:
+    """Decode RLE rows into *out*, in row bands on the decode thread pool."""
+    rows = len(bytes_counts)
+    bands = min(_decode_workers, len(out) // _MIN_BAND_BYTES, rows)
+    if bands < 2 or _in_worker():
+        rle_impl.decode_rows(view, bytes_counts, row_size, out)
+        return
+
+    offsets = [0, *itertools.accumulate(bytes_counts)]
+    edges = [rows * i // bands for i in range(bands + 1)]
+
+    def decode_band(band: int) -> None:
+        start, stop = edges[band], edges[band + 1]
+        rle_impl.decode_rows(
+            view[offsets[start] :],
+            bytes_counts[start:stop],
+            row_size,
+            out[start * row_size : stop * row_size],
+        )
+
+    decode_map(decode_band, range(bands))
+
+
 def encode_prediction(data: bytes | bytearray, w: int, h: int, depth: int) -> bytes:
     if depth == 8:
-        arr = array.array("B", data)
-        arr = _delta_encode(arr, 0x100, w, h)
-        return be_array_to_bytes(arr)
+        arr = np.frombuffer(data, np.uint8).reshape((h, w))
+        return _delta_encode(arr).tobytes()
     elif depth == 16:
-        arr = array.array("H", data)
-        arr = _delta_encode(arr, 0x10000, w, h)
-        return be_array_to_bytes(arr)
+        arr = np.frombuffer(data, ">u2").reshape((h, w)).astype(np.uint16)
+        return _delta_encode(arr).astype(">u2").tobytes()
     elif depth == 32:
-        arr = array.array("B", data)
+        arr = np.frombuffer(data, np.uint8).reshape((h, w * 4))
         arr = _shuffle_byte_order(arr, w, h)
-        arr = _delta_encode(arr, 0x100, w * 4, h)
-        return arr.tobytes()
+        return _delta_encode(arr).tobytes()
     else:
         raise ValueError("Invalid pixel size %d" % (depth))
 
 
 def decode_prediction(data: bytes, w: int, h: int, depth: int) -> bytes:
     if depth == 8:
-        arr = be_array_from_bytes("B", data)
-        arr = _delta_decode(arr, 0x100, w, h)
+        arr = np.frombuffer(data, np.uint8).reshape((h, w))
+        return _delta_decode(arr).tobytes()
     elif depth == 16:
-        arr = be_array_from_bytes("H", data)
-        arr = _delta_decode(arr, 0x10000, w, h)
+        arr = np.frombuffer(data, ">u2").reshape((h, w)).astype(np.uint16)
+        return _delta_decode(arr).astype(">u2").tobytes()
     elif depth == 32:
-        arr = array.array("B", data)
-        arr = _delta_decode(arr, 0x100, w * 4, h)
-        arr = _restore_byte_order(arr, w, h)
+        arr = np.frombuffer(data, np.uint8).reshape((h, w * 4))
+        arr = _delta_decode(arr)
+        return _restore_byte_order(arr, w, h).tobytes()
     else:
         raise ValueError("Invalid pixel size %d" % (depth))
 
-    return arr.tobytes()
+
+def _decode_prediction_into(
+    data: bytes, out: np.ndarray, w: int, h: int, depth: int
+) -> None:
+    """Delta decode *data* into the big-endian sample bytes of *out*."""
+    if depth == 8:
+        arr = np.frombuffer(data, np.uint8).reshape((h, w))
+        np.cumsum(arr, axis=1, dtype=np.uint8, out=out.reshape((h, w)))
+    elif depth == 16:
+        arr = np.frombuffer(data, ">u2").reshape((h, w))
+        np.cumsum(arr, axis=1, dtype=np.uint16, out=out.view(">u2").reshape((h, w)))
+    elif depth == 32:
+        arr = np.frombuffer(data, np.uint8).reshape((h, w * 4))
+        restored = _restore_byte_order(_delta_decode(arr), w, h)
+        out.reshape((h, w * 4))[:] = restored
+    else:
+        raise ValueError("Invalid pixel size %d" % (depth))
 
 
-def _delta_encode(arr: array.array, mod: int, w: int, h: int) -> array.array:
-    arr.byteswap()
-    for y in reversed(range(h)):
-        offset = y * w
-        for x in reversed(range(w - 1)):
-            pos = offset + x
-            next_value = (arr[pos + 1] - arr[pos]) % mod
-            arr[pos + 1] = next_value
-    return arr
+def _delta_encode(arr: np.ndarray) -> np.ndarray:
+    """Row-wise difference of unsigned samples, wrapping modulo the dtype."""
+    result = np.empty_like(arr)
+    result[:, :1] = arr[:, :1]
+    np.subtract(arr[:, 1:], arr[:, :-1], out=result[:, 1:])
+    return result
 
 
-def _delta_decode(arr: array.array, mod: int, w: int, h: int) -> array.array:
-    for y in range(h):
-        offset = y * w
-        for x in range(w - 1):
-            pos = offset + x
-            next_value = (arr[pos + 1] + arr[pos]) % mod
-            arr[pos + 1] = next_value
-    arr.byteswap()
-    return arr
+def _delta_decode(arr: np.ndarray) -> np.ndarray:
+    """Row-wise cumulative sum of unsigned samples, wrapping modulo the dtype."""
+    return np.cumsum(arr, axis=1, dtype=arr.dtype)
 
 
-def _shuffled_order(w: int, h: int) -> Iterator[int]:
+def _shuffle_byte_order(arr: np.ndarray, w: int, h: int) -> np.ndarray:
     """
-    Generator for the order of 4-byte values.
+    Split 4-byte samples into byte planes within each row.
 
     32bit channels are also encoded using delta encoding,
     but it make no sense to apply delta compression to bytes.
@@ -358,26 +874,11 @@ def _shuffled_order(w: int, h: int) -> Iterator[int]:
     In PSD, each 4-byte item is split into 4 bytes and these
     bytes are packed together: "123412341234" becomes "111222333444";
     delta compression is applied to the packed data.
-
-    So we have to (a) decompress data from the delta compression
-    and (b) recombine data back to 4-byte values.
     """
-    rowsize = 4 * w
-    for row in range(0, rowsize * h, rowsize):
-        for offset in range(row, row + w):
-            for x in range(offset, offset + rowsize, w):
-                yield x
-
-
-def _shuffle_byte_order(bytes_array: array.array, w: int, h: int) -> array.array:
-    arr = bytes_array[:]
-    for src, dst in enumerate(_shuffled_order(w, h)):
-        arr[dst] = bytes_array[src]
-    return arr
+    return arr.reshape((h, w, 4)).transpose((0, 2, 1)).reshape((h, w * 4))
 
 
-def _restore_byte_order(bytes_array: array.array, w: int, h: int) -> array.array:
-    arr = bytes_array[:]
-    for dst, src in enumerate(_shuffled_order(w, h)):
-        arr[dst] = bytes_array[src]
-    return arr
+def _restore_byte_order(arr: np.ndarray, w: int, h: int) -> np.ndarray:
+    """Recombine byte planes back into 4-byte samples; see
+    :py:func:`_shuffle_byte_order`."""
+    return arr.reshape((h, 4, w)).transpose((0, 2, 1)).reshape((h, w * 4))
@@ -1,32 +1,17 @@
 # distutils: language=c++
 # cython: wraparound=False, binding=False
 
+from libc.string cimport memcpy, memset
 from libcpp.string cimport string
-from libcpp.algorithm cimport copy_n, fill_n
-
-def decode(const unsigned char[:] data, Py_ssize_t size) -> string:
-    """decode(data, size) -> bytes
-
-    Apple PackBits RLE decoder.
-
-    Tolerant implementation: runs that would exceed *size* are clipped at the
-    row boundary, runs whose input is truncated copy what is available, and any
-    remaining bytes are zero-padded (std::string::resize zero-initialises).
-    The function always returns exactly *size* bytes without raising.
-    """
 
+cdef void _decode_row(
+    const unsigned char* data, Py_ssize_t length, unsigned char* out, Py_ssize_t size
+) noexcept nogil:
+    # Tolerant PackBits decoding of one row into exactly *size* bytes of *out*.
     cdef Py_ssize_t i = 0
     cdef Py_ssize_t j = 0
-    cdef Py_ssize_t length = data.shape[0]
     cdef Py_ssize_t actual, available
     cdef unsigned char bit
-    cdef string result
-
-    result.resize(size)  # zero-initialised by std::string::resize
-
-    if length == 1:
-        # Single byte: either a no-op (128) or a stray header — return zeros
-        return result
 
     while i < length and j < size:
         i, bit = i+1, data[i]
@@ -35,7 +20,7 @@ def decode(const unsigned char[:] data, Py_ssize_t size) -> string:
             if i >= length:  # lone repeat header at end of stream — stop
                 break
             actual = min(1+bit, size-j)  # clip at remaining output space
-            fill_n(result.begin()+j, actual, <char>data[i])
+            memset(out+j, data[i], actual)
             j += actual
             i += 1
         elif bit < 128:
@@ -43,32 +28,92 @@ def decode(const unsigned char[:] data, Py_ssize_t size) -> string:
                 break
             available = min(length-i, 1+bit)
             actual = min(available, size-j)  # clip to input and output
-            copy_n(&data[i], actual, result.begin()+j)
+            memcpy(out+j, data+i, actual)
             j += actual
             i += available  # advance by declared amount or to end
         # bit == 128: no-op
 
-    return result
+    memset(out+j, 0, size-j)
 
 
-def encode(const unsigned char[:] data) -> string:
-    """encode(data) -> bytes
+def decode(const unsigned char[::1] data, Py_ssize_t size) -> string:
+    """decode(data, size) -> bytes
 
-    Apple PackBits RLE encoder.
+    Apple PackBits RLE decoder.
+
+    Tolerant implementation: runs that would exceed *size* are clipped at the
+    row boundary, runs whose input is truncated copy what is available, and any
+    remaining bytes are zero-padded.
+    The function always returns exactly *size* bytes without raising.
     """
 
-    cdef unsigned char MAX_LEN = 0xFF >> 1
-    cdef int length = data.shape[0]
-    cdef int i = 0
-    cdef int j = 0
     cdef string result
+    cdef Py_ssize_t length = data.shape[0]
+
+    result.resize(size)
+    if length > 0 and size > 0:
+        _decode_row(&data[0], length, <unsigned char*>&result[0], size)
+    return result
+
+
+def decode_rows(
+    const unsigned char[::1] data,
+    const unsigned int[:] counts,
+    Py_ssize_t size,
+    unsigned char[::1] out,
+):
+    """decode_rows(data, counts, size, out) -> None
+
+    Apple PackBits RLE decoder for a whole channel.
+
+    *data* holds the compressed rows back to back and *counts* their byte
+    counts. Each row is decoded as in :py:func:`decode` into *size* bytes of
+    *out*, which must hold ``len(counts) * size`` bytes. Rows past the end of
+    *data* are decoded from whatever input is left, as reading them from a
+    file would. The GIL is released while decoding.
+    """
+
+    cdef Py_ssize_t rows = counts.shape[0]
+    cdef Py_ssize_t length = data.shape[0]
+    cdef Py_ssize_t offset = 0
+    cdef Py_ssize_t row, available
+    cdef const unsigned char* src
+    cdef unsigned char* dst
+
+    if size < 0 or out.shape[0] < rows * size:
+        raise ValueError(
+            "Output buffer of %d bytes is too small for %d rows of %d bytes"
+            % (out.shape[0], rows, size)
+        )
+    if rows == 0 or size == 0:
+        return
+
+    src = &data[0] if length > 0 else NULL
+    dst = &out[0]
+    with nogil:
+        for row in range(rows):
+            available = min(<Py_ssize_t>counts[row], max(length - offset, 0))
+            _decode_row(src + offset if available else NULL, available, dst, size)
+            offset += counts[row]
+            dst += size
+
+
+cdef Py_ssize_t _encode_row(
+    const unsigned char* data, Py_ssize_t length, unsigned char* out
+) noexcept nogil:
+    # PackBits encoding of one row into *out*, which must hold at least
+    # _max_encoded_size(length) bytes. Returns the number of bytes written.
+    cdef Py_ssize_t MAX_LEN = 0xFF >> 1
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j = 0
+    cdef Py_ssize_t k = 0
 
     if length == 0:
-        return result
+        return 0
     if length == 1:
-        result.push_back(0)
-        result.push_back(data[0])
-        return result
+        out[0] = 0
+        out[1] = data[0]
+        return 2
 
     while i < length:
         if j + 1 < length and data[j] == data[j+1]:
@@ -78,8 +123,9 @@ def encode(const unsigned char[:] data) -> string:
                 if j + 1 >= length or data[j] != data[j+1]:
                     break
                 j += 1
-            result.push_back(- (j - i))
-            result.push_back(<char>data[i])
+            out[k] = <unsigned char>(256 - (j - i))
+            out[k+1] = data[i]
+            k += 2
             i = j = j + 1
         else:
             while j < length:
@@ -98,7 +144,82 @@ def encode(const unsigned char[:] data) -> string:
                 elif j+2 < length and (data[j] == data[j+1] == data[j+2]):
                     break
                 j += 1
-            result.push_back(j - i - 1)
-            result.append(<char*>&data[i], j - i)
+            out[k] = <unsigned char>(j - i - 1)
+            memcpy(out+k+1, data+i, j - i)
+            k += 1 + j - i
             i = j
+    return k
+
+
+cdef inline Py_ssize_t _max_encoded_size(Py_ssize_t length) noexcept nogil:
+    # A literal run of up to 128 bytes costs one header byte.
+    return length + (length + 127) // 128 + 1
+
+
+def encode(const unsigned char[::1] data) -> string:
+    """encode(data) -> bytes
+
+    Apple PackBits RLE encoder.
+    """
+
+    cdef Py_ssize_t length = data.shape[0]
+    cdef string result
+
+    if length == 0:
+        return result
+    result.resize(_max_encoded_size(length))
+    result.resize(_encode_row(&data[0], length, <unsigned char*>&result[0]))
+    return result
+
+
+def encode_rows(
+    const unsigned char[::1] data, Py_ssize_t rows, Py_ssize_t size, int count_size
+) -> string:
+    """encode_rows(data, rows, size, count_size) -> bytes
+
+    Apple PackBits RLE encoder for a whole channel.
+
+    Each of the *rows* rows of *size* bytes in *data* is encoded as in
+    :py:func:`encode`. The result holds the big-endian byte counts of the
+    rows, *count_size* bytes each (2 for PSD, 4 for PSB), followed by the
+    encoded rows. Rows past the end of *data* are encoded from whatever
+    input is left. The GIL is released while encoding.
+    """
+
+    cdef Py_ssize_t length = data.shape[0]
+    cdef Py_ssize_t offset = 0
+    cdef Py_ssize_t position = rows * count_size
+    cdef Py_ssize_t limit = 0xFFFF if count_size == 2 else 0xFFFFFFFF
+    cdef Py_ssize_t row, available, count
+    cdef Py_ssize_t overflow = -1
+    cdef const unsigned char* src
+    cdef unsigned char* dst
+    cdef int b
+    cdef string result
+
+    if count_size not in (2, 4):
+        raise ValueError("count_size must be 2 or 4, got %d" % count_size)
+    if rows < 0 or size < 0:
+        raise ValueError("rows and size must not be negative")
+
+    result.resize(position + rows * _max_encoded_size(size))
+    if rows == 0:
+        return result
+    src = &data[0] if length > 0 else NULL
+    dst = <unsigned char*>&result[0]
+    with nogil:
+        for row in range(rows):
+            available = min(size, max(length - offset, 0))
+            count = _encode_row(src + offset if available else NULL, available, dst + position)
+            if count > limit and overflow < 0:
+                overflow = row
+            for b in range(count_size):
+                dst[row * count_size + b] = (count >> (8 * (count_size - 1 - b))) & 0xFF
+            offset += size
+            position += count
+    if overflow >= 0:
+        raise ValueError(
+            "Row %d does not fit a %d-byte count" % (overflow, count_size)
+        )
+    result.resize(position)
     return result
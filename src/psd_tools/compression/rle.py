@@ -28,7 +28,9 @@ between these modes to achieve optimal compression.
 Functions:
 
 - :py:func:`decode`: Decompress RLE-encoded data to raw bytes
+- :py:func:`decode_rows`: Decompress a whole channel of RLE-encoded rows
 - :py:func:`encode`: Compress raw bytes using RLE encoding
+- :py:func:`encode_rows`: Compress a whole channel into RLE-encoded rows
 
 Example usage::
 
@@ -53,8 +55,12 @@ production use with large files, ensure the Cython version is compiled by
 installing with build tools available.
 """
 
+import array
+import sys
+from typing import Sequence
 
-def decode(data: bytes, size: int) -> bytes:
+
+def decode(data: bytes | memoryview, size: int) -> bytes:
     """decode(data, size) -> bytes
 
     Apple PackBits RLE decoder.
@@ -92,6 +98,34 @@ def decode(data: bytes, size: int) -> bytes:
     return bytes(result)
 
 
+def decode_rows(
+    data: bytes | memoryview,
+    counts: Sequence[int],
+    size: int,
+    out: bytearray | memoryview,
+) -> None:
+    """decode_rows(data, counts, size, out) -> None
+
+    Apple PackBits RLE decoder for a whole channel.
+
+    *data* holds the compressed rows back to back and *counts* their byte
+    counts. Each row is decoded as in :py:func:`decode` into *size* bytes of
+    *out*, which must hold ``len(counts) * size`` bytes.
+    """
+    if size < 0 or len(out) < len(counts) * size:
+        raise ValueError(
+            "Output buffer of %d bytes is too small for %d rows of %d bytes"
+            % (len(out), len(counts), size)
+        )
+    view, out_view = memoryview(data), memoryview(out)
+    offset = 0
+    for row, count in enumerate(counts):
+        out_view[row * size : (row + 1) * size] = decode(
+            view[offset : offset + count], size
+        )
+        offset += count
+
+
 def encode(data: bytes) -> bytes:
     """encode(data) -> bytes
 
@@ -145,3 +179,28 @@ def encode(data: bytes) -> bytes:
             result.extend(data[i:j])
             i = j
     return bytes(result)
+
+
+def encode_rows(
+    data: bytes | bytearray | memoryview, rows: int, size: int, count_size: int
+) -> bytes:
+    """encode_rows(data, rows, size, count_size) -> bytes
+
+    Apple PackBits RLE encoder for a whole channel.
+
+    Each of the *rows* rows of *size* bytes in *data* is encoded as in
+    :py:func:`encode`. The result holds the big-endian byte counts of the
+    rows, *count_size* bytes each (2 for PSD, 4 for PSB), followed by the
+    encoded rows.
+    """
+    if count_size not in (2, 4):
+        raise ValueError("count_size must be 2 or 4, got %d" % count_size)
+    view = memoryview(data)
+    encoded = [encode(bytes(view[i * size : (i + 1) * size])) for i in range(rows)]
+    try:
+        counts = array.array("H" if count_size == 2 else "I", map(len, encoded))
+    except OverflowError as e:
+        raise ValueError("Row does not fit a %d-byte count" % count_size) from e
+    if sys.byteorder == "little":
+        counts.byteswap()
+    return counts.tobytes() + b"".join(encoded)
@@ -302,12 +302,17 @@ class Compression(IntEnum):
 
     Compression. 0 = Raw Data, 1 = RLE compressed, 2 = ZIP without prediction,
     3 = ZIP with prediction.
+
+    AUTO is never stored in a file. When channel data is set with AUTO, one
+    of RAW, RLE or ZIP_WITH_PREDICTION is selected from a sample of the rows;
+    see :py:func:`~psd_tools.compression.select_compression`.
     """
 
     RAW = 0
     RLE = 1
     ZIP = 2
     ZIP_WITH_PREDICTION = 3
+    AUTO = -1
 
 
 class Tag(bytes, Enum):
@@ -0,0 +1,120 @@
+"""
+Least recently used cache with a byte budget.
+
+This module provides :py:class:`LRUCache`, the base of
+:py:class:`~psd_tools.psd.channel_cache.ChannelCache` and
+:py:class:`~psd_tools.composite.render_cache.RenderCache`. It keeps values
+up to a total size in bytes, drops the least recently used entries beyond
+it, and counts hits, misses and evictions. Subclasses define the keys and
+when entries become stale.
+
+Values are `bytes`, numpy arrays, or tuples that contain arrays. Arrays in
+a cached value are made read-only; copy them before modifying.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+
+class LRUCache:
+    """
+    Least recently used cache with a byte budget.
+
+    Entries larger than ``max_bytes`` are not cached. The cache is safe to
+    share between threads.
+
+    :param max_bytes: limit on the total size of the entries in bytes.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative, got %d" % max_bytes)
+        self.max_bytes = max_bytes
+        #: Number of lookups served from the cache.
+        self.hits = 0
+        #: Number of lookups that computed the value.
+        self.misses = 0
+        #: Number of entries removed to stay within ``max_bytes``.
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        # Reentrant, as a weakref callback can run while the lock is held.
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return "%s(size=%d, max_bytes=%d, hits=%d, misses=%d, evictions=%d)" % (
+            self.__class__.__name__,
+            self.size,
+            self.max_bytes,
+            self.hits,
+            self.misses,
+            self.evictions,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in bytes."""
+        return self._size
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _get(self, key: Hashable, compute: Callable[[], V], owner: object = None) -> V:
+        """Get the value of *key*, computing it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_current(key, owner):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        if isinstance(value, (bytes, bytearray)):
+            arrays = []
+            size = len(value)
+        else:
+            items = value if isinstance(value, tuple) else (value,)
+            # The same array can appear in a value more than once.
+            arrays = list(
+                {id(x): x for x in items if isinstance(x, np.ndarray)}.values()
+            )
+            size = sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return value
+        for array in arrays:
+            array.flags.writeable = False
+        with self._lock:
+            self._insert(key, value, size, owner)
+        return value
+
+    def _is_current(self, key: Hashable, owner: object) -> bool:
+        """Whether the entry of *key* still belongs to *owner*."""
+        return True
+
+    def _insert(self, key: Hashable, value: Any, size: int, owner: object) -> None:
+        if key in self._entries:
+            self._size -= self._entries[key][1]
+        self._entries[key] = (value, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+            self._evicted(evicted_key)
+
+    def _evicted(self, key: Hashable) -> None:
+        """Called with the key of each entry removed to stay within budget."""
@@ -0,0 +1,201 @@
+# cython: wraparound=False, boundscheck=False, binding=False
+
+from libc.stdint cimport int32_t, int64_t, uint32_t, uint64_t
+from libc.string cimport memcpy
+from cpython.bytes cimport PyBytes_FromStringAndSize
+
+# OSType codes as big-endian integers.
+cdef enum:
+    REFERENCE = 0x6F626A20  # b'obj '
+    DESCRIPTOR = 0x4F626A63  # b'Objc'
+    LIST = 0x566C4C73  # b'VlLs'
+    DOUBLE = 0x646F7562  # b'doub'
+    UNIT_FLOAT = 0x556E7446  # b'UntF'
+    UNIT_FLOATS = 0x556E466C  # b'UnFl'
+    STRING = 0x54455854  # b'TEXT'
+    ENUMERATED = 0x656E756D  # b'enum'
+    INTEGER = 0x6C6F6E67  # b'long'
+    LARGE_INTEGER = 0x636F6D70  # b'comp'
+    BOOLEAN = 0x626F6F6C  # b'bool'
+    GLOBAL_OBJECT = 0x476C624F  # b'GlbO'
+    CLASS1 = 0x74797065  # b'type'
+    CLASS2 = 0x476C6243  # b'GlbC'
+    ALIAS = 0x616C6973  # b'alis'
+    RAW_DATA = 0x74647461  # b'tdta'
+    OBJECT_ARRAY = 0x4F624172  # b'ObAr'
+    PATH = 0x50746820  # b'Pth '
+    PROPERTY = 0x70726F70  # b'prop'
+    CLASS3 = 0x436C7373  # b'Clss'
+    ENUMERATED_REFERENCE = 0x456E6D72  # b'Enmr'
+    OFFSET = 0x72656C65  # b'rele'
+    IDENTIFIER = 0x49646E74  # b'Idnt'
+    INDEX = 0x696E6478  # b'indx'
+    NAME = 0x6E616D65  # b'name'
+
+
+cdef class Parser:
+    """Parser(types, terms, read_unit)
+
+    Descriptor decoder over a whole buffer.
+
+    Builds the same objects as the ``read`` classmethods in
+    :py:mod:`psd_tools.psd.descriptor`, taking the classes from the ``types``
+    registry. Unknown 4-byte keys are added to ``terms`` like
+    ``read_length_and_key`` does, and unit codes are converted with
+    ``read_unit``. Raises ``ValueError`` on malformed or truncated input.
+
+    The parser keeps no state between calls, so one instance can be shared
+    between threads.
+    """
+
+    cdef dict types
+    cdef set terms
+    cdef object read_unit
+
+    def __init__(self, dict types, set terms, object read_unit):
+        self.types = types
+        self.terms = terms
+        self.read_unit = read_unit
+
+    def read_body(self, const unsigned char[::1] data, Py_ssize_t offset):
+        """read_body(data, offset) -> (dict, int)
+
+        Parse a descriptor body at ``offset`` of ``data``; return the keyword
+        arguments for the descriptor class and the offset past the body.
+        """
+        cdef _Reader reader = _Reader.__new__(_Reader)
+        reader.types = self.types
+        reader.terms = self.terms
+        reader.read_unit = self.read_unit
+        reader.data = data
+        reader.pos = offset
+        body = reader._body()
+        return body, reader.pos
+
+
+cdef class _Reader:
+    # Position in the buffer of a single read_body call.
+    cdef dict types
+    cdef set terms
+    cdef object read_unit
+    cdef const unsigned char[::1] data
+    cdef Py_ssize_t pos
+
+    cdef inline const unsigned char* _take(self, Py_ssize_t size) except NULL:
+        cdef const unsigned char* ptr
+        if size < 0 or size > self.data.shape[0] - self.pos:
+            raise ValueError("Descriptor overruns the buffer at %d" % self.pos)
+        ptr = &self.data[self.pos]
+        self.pos += size
+        return ptr
+
+    cdef inline uint32_t _u32(self) except? 0xFFFFFFFF:
+        cdef const unsigned char* p = self._take(4)
+        return (
+            (<uint32_t>p[0] << 24) | (<uint32_t>p[1] << 16) |
+            (<uint32_t>p[2] << 8) | <uint32_t>p[3]
+        )
+
+    cdef inline uint64_t _u64(self) except? 0xFFFFFFFFFFFFFFFF:
+        cdef const unsigned char* p = self._take(8)
+        cdef uint64_t value = 0
+        cdef int i
+        for i in range(8):
+            value = (value << 8) | p[i]
+        return value
+
+    cdef inline double _f64(self) except? -1.0:
+        cdef uint64_t bits = self._u64()
+        cdef double value
+        memcpy(&value, &bits, 8)
+        return value
+
+    cdef bytes _bytes(self, Py_ssize_t size):
+        cdef const unsigned char* p = self._take(size)
+        return PyBytes_FromStringAndSize(<const char*>p, size)
+
+    cdef str _unicode(self):
+        cdef Py_ssize_t count = self._u32()
+        return self._bytes(count * 2).decode("utf-16-be")
+
+    cdef bytes _key(self):
+        cdef uint32_t length = self._u32()
+        cdef bytes key = self._bytes(length or 4)
+        if length == 0 and key not in self.terms:
+            self.terms.add(key)
+        return key
+
+    cdef dict _body(self):
+        cdef uint32_t count
+        name = self._unicode()
+        classID = self._key()
+        count = self._u32()
+        items = []
+        for _ in range(count):
+            key = self._key()
+            items.append((key, self._value()))
+        return dict(name=name, classID=classID, items=items)
+
+    cdef object _value(self):
+        cdef uint32_t code = self._u32()
+        cdef uint32_t count
+        cdef const unsigned char* p
+        kls = self.types.get(PyBytes_FromStringAndSize(
+            <const char*>&self.data[self.pos - 4], 4
+        ))
+        if kls is None:
+            raise ValueError("Unknown OSType at %d" % (self.pos - 4))
+
+        if code == DESCRIPTOR or code == GLOBAL_OBJECT:
+            return kls(**self._body())
+        elif code == OBJECT_ARRAY:
+            items_count = self._u32()
+            return kls(items_count=items_count, **self._body())
+        elif code == LIST or code == REFERENCE:
+            count = self._u32()
+            return kls([self._value() for _ in range(count)])
+        elif code == UNIT_FLOAT:
+            unit = self.read_unit(self._bytes(4))
+            return kls(unit=unit, value=self._f64())
+        elif code == UNIT_FLOATS:
+            unit = self.read_unit(self._bytes(4))
+            count = self._u32()
+            return kls(unit=unit, values=[self._f64() for _ in range(count)])
+        elif code == DOUBLE:
+            return kls(self._f64())
+        elif code == STRING:
+            return kls(self._unicode())
+        elif code == INTEGER or code == IDENTIFIER or code == INDEX:
+            return kls(<int32_t>self._u32())
+        elif code == LARGE_INTEGER:
+            return kls(<int64_t>self._u64())
+        elif code == BOOLEAN:
+            p = self._take(1)
+            return kls(p[0] != 0)
+        elif code == ENUMERATED:
+            typeID = self._key()
+            return kls(typeID, self._key())
+        elif code == CLASS1 or code == CLASS2 or code == CLASS3:
+            name = self._unicode()
+            return kls(name, self._key())
+        elif code == PROPERTY:
+            name = self._unicode()
+            classID = self._key()
+            return kls(name, classID, self._key())
+        elif code == ENUMERATED_REFERENCE:
+            name = self._unicode()
+            classID = self._key()
+            typeID = self._key()
+            return kls(name, classID, typeID, self._key())
+        elif code == OFFSET:
+            name = self._unicode()
+            classID = self._key()
+            return kls(name, classID, self._u32())
+        elif code == NAME:
+            name = self._unicode()
+            classID = self._key()
+            return kls(name, classID, self._unicode())
+        elif code == RAW_DATA or code == ALIAS or code == PATH:
+            count = self._u32()
+            return kls(self._bytes(count))
+        raise ValueError("Unsupported OSType at %d" % (self.pos - 4))
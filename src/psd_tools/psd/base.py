@@ -21,6 +21,7 @@ from typing import IO, Any, Callable, Generator, TypeVar
 from attrs import define, field, fields, has, validate
 
 from psd_tools.psd.bin_utils import (
+    open_buffer,
     read_fmt,
     read_unicode_string,
     trimmed_repr,
@@ -69,7 +70,7 @@ class BaseElement:
 
     @classmethod
     def frombytes(cls: type[T], data: bytes, *args: Any, **kwargs: Any) -> T:
-        with io.BytesIO(data) as f:
+        with open_buffer(data) as f:
             return cls.read(f, *args, **kwargs)
 
     def tobytes(self, *args: Any, **kwargs: Any) -> bytes:
@@ -10,13 +10,32 @@ and serializing PSD file structures.
 """
 
 import array
+import errno
+import io
 import logging
+import os
+import stat
 import struct
 import sys
-from typing import IO, Any, Callable
+import threading
+import weakref
+from typing import IO, Any, BinaryIO, Callable, Iterator
 
 logger = logging.getLogger(__name__)
 
+# Size of the chunks FileSlice copies at a time.
+_CHUNK_SIZE = 4 * 1024 * 1024
+# Largest range handed to a single copy_file_range/sendfile call.
+_COPY_SIZE = 1 << 30
+# Errors for which copy_file_range is retried with sendfile.
+_COPY_FILE_RANGE_ERRORS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+}
+
 
 def pack(fmt: str, *args: Any) -> bytes:
     fmt = str(">" + fmt)
@@ -59,12 +78,17 @@ def write_fmt(fp: IO[bytes], fmt: str, *args: Any) -> int:
     return written
 
 
-def write_bytes(fp: IO[bytes], data: bytes) -> int:
+def write_bytes(fp: IO[bytes], data: "bytes | memoryview | FileSlice") -> int:
     """
     Write bytes to the file object and returns bytes written.
 
+    A :py:class:`FileSlice` is copied from its file; see
+    :py:meth:`FileSlice.write_to`.
+
     :return: written byte size
     """
+    if isinstance(data, FileSlice):
+        return data.write_to(fp)
     pos = fp.tell()
     fp.write(data)
     written = fp.tell() - pos
@@ -75,6 +99,23 @@ def write_bytes(fp: IO[bytes], data: bytes) -> int:
     return written
 
 
+def read_bytes(fp: IO[bytes], size: int = -1) -> bytes | memoryview:
+    """
+    Read raw data from the file object without copying when possible.
+
+    When ``fp`` is a :py:class:`BufferReader`, the result is a `memoryview`
+    slice of the underlying buffer; otherwise it is the `bytes` returned by
+    ``fp.read``.
+
+    :param fp: file-like object
+    :param size: byte size to read, or -1 to read until the end
+    :return: bytes-like object
+    """
+    if isinstance(fp, BufferReader):
+        return fp.read_view(size)
+    return fp.read(size)
+
+
 def read_length_block(fp: IO[bytes], fmt: str = "I", padding: int = 1) -> bytes:
     """
     Read a block of data with a length marker at the beginning.
@@ -83,8 +124,24 @@ def read_length_block(fp: IO[bytes], fmt: str = "I", padding: int = 1) -> bytes:
     :param fmt: format of the length marker
     :return: bytes object
     """
+    return bytes(read_length_buffer(fp, fmt, padding))
+
+
+def read_length_buffer(
+    fp: IO[bytes], fmt: str = "I", padding: int = 1
+) -> bytes | memoryview:
+    """
+    Read a block of data with a length marker at the beginning, without
+    copying when ``fp`` is a :py:class:`BufferReader`.
+
+    See :py:func:`read_length_block` and :py:func:`read_bytes`.
+
+    :param fp: file-like
+    :param fmt: format of the length marker
+    :return: bytes-like object
+    """
     length = read_fmt(fmt, fp)[0]
-    data = fp.read(length)
+    data = read_bytes(fp, length)
     if len(data) != length:
         raise IOError(
             "Failed to read data section: read=%d, expected=%d. "
@@ -94,6 +151,431 @@ def read_length_block(fp: IO[bytes], fmt: str = "I", padding: int = 1) -> bytes:
     return data
 
 
+class BufferReader(io.BufferedIOBase, BinaryIO):
+    """
+    Read-only, seekable binary stream over a buffer such as :py:class:`mmap.mmap`.
+
+    :py:meth:`read` returns `bytes` like any binary file, while
+    :py:meth:`read_view` returns a zero-copy `memoryview` slice. Parsers use
+    :py:func:`read_bytes` to pick up the slice for bulk data like channel
+    pixels, so the slices keep the buffer alive after the reader is closed.
+
+    Example::
+
+        import mmap
+
+        with open("example.psd", "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        psd = PSD.read(BufferReader(buffer))
+
+    :param buffer: object that supports the buffer protocol.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError("Invalid whence (%r)" % whence)
+        if position < 0:
+            raise ValueError("Negative seek position %d" % position)
+        self._pos = position
+        return position
+
+    def getbuffer(self) -> memoryview:
+        """Get a `memoryview` of the whole buffer, like :py:meth:`io.BytesIO.getbuffer`."""
+        return self._view[:]
+
+    def read_view(self, size: int | None = -1) -> memoryview:
+        """Read up to ``size`` bytes as a `memoryview` slice of the buffer."""
+        start = min(self._pos, len(self._view))
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(start + size, len(self._view))
+        self._pos = max(self._pos, end)
+        return self._view[start:end]
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self.read_view(size).tobytes()
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        view = self.read_view(len(memoryview(buffer).cast("B")))
+        memoryview(buffer).cast("B")[: len(view)] = view
+        return len(view)
+
+
+def open_buffer(data: bytes | memoryview) -> IO[bytes]:
+    """
+    Open a binary stream over ``data``.
+
+    A `memoryview` (as returned by :py:func:`read_bytes`) is wrapped in a
+    :py:class:`BufferReader` so that nested reads stay zero-copy.
+
+    :param data: bytes-like object
+    :return: file-like object
+    """
+    if isinstance(data, memoryview):
+        return BufferReader(data)
+    return io.BytesIO(data)
+
+
+class FileSlice:
+    """
+    Byte range of a file that is read on demand.
+
+    :py:func:`skip_bytes` returns this in place of the data so that parsing
+    does not read it. :py:meth:`read` fetches the range from the file object,
+    or from the file it was opened from once the object has been closed.
+    Slices of one file object can be read from several threads at once.
+    Pickled slices refer to the file by its absolute path.
+
+    :param fp: file-like object or path of the file the range belongs to.
+    :param offset: absolute position of the range.
+    :param length: number of bytes in the range.
+    """
+
+    __slots__ = ("fp", "offset", "length")
+
+    def __init__(
+        self, fp: IO[bytes] | str | bytes | os.PathLike, offset: int, length: int
+    ) -> None:
+        self.fp = fp
+        self.offset = offset
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileSlice):
+            return NotImplemented
+        return (self.fp, self.offset, self.length) == (
+            other.fp,
+            other.offset,
+            other.length,
+        )
+
+    def __repr__(self) -> str:
+        return "FileSlice(offset=%d, length=%d)" % (self.offset, self.length)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        name = self._name()
+        if name is None:
+            raise TypeError("Cannot pickle a slice of an unnamed file object")
+        return (FileSlice, (os.path.abspath(name), self.offset, self.length))
+
+    def _name(self) -> str | bytes | os.PathLike | None:
+        if isinstance(self.fp, (str, bytes, os.PathLike)):
+            return self.fp
+        name = getattr(self.fp, "name", None)
+        return name if isinstance(name, (str, bytes, os.PathLike)) else None
+
+    def read(self) -> bytes:
+        """
+        Read the range.
+
+        :return: `bytes`
+        :raise IOError: if the file is shorter than the range.
+        """
+        return b"".join(self._chunks(max(self.length, 1)))
+
+    def write_to(self, fp: IO[bytes]) -> int:
+        """
+        Copy the range to ``fp`` without holding all of it in memory.
+
+        When both ends are regular files, the range is copied by the kernel
+        with :py:func:`os.copy_file_range` or :py:func:`os.sendfile`; other
+        outputs get the range in chunks.
+
+        :param fp: file-like object
+        :return: written byte size
+        """
+        if isinstance(fp, SizeCounter):
+            fp.seek(self.length, io.SEEK_CUR)
+            return self.length
+        copied = self._copy_to_file(fp)
+        if copied == self.length:
+            return copied
+        rest = FileSlice(self.fp, self.offset + copied, self.length - copied)
+        return copied + sum(
+            write_bytes(fp, chunk) for chunk in rest._chunks(_CHUNK_SIZE)
+        )
+
+    def _copy_to_file(self, fp: IO[bytes]) -> int:
+        dst = _regular_fileno(fp)
+        if dst is None or self.length == 0:
+            return 0
+        source = self.fp
+        if isinstance(source, (str, bytes, os.PathLike)) or source.closed:
+            name = self._name()
+            if name is None:
+                return 0
+            with open(name, "rb") as f:
+                return _copy_range(f.fileno(), self.offset, fp, dst, self.length)
+        src = _regular_fileno(source)
+        if src is None:
+            return 0
+        return _copy_range(src, self.offset, fp, dst, self.length)
+
+    def _chunks(self, size: int) -> Iterator[bytes]:
+        fp = self.fp
+        if isinstance(fp, (str, bytes, os.PathLike)) or fp.closed:
+            name = self._name()
+            if name is None:
+                raise ValueError("I/O operation on closed file.")
+            with open(name, "rb") as f:
+                yield from self._read_chunks(f, size)
+            return
+
+        # The file object is shared with other slices and possibly other
+        # threads: read with pread, or seek and read under a per-file lock.
+        fd = _regular_fileno(fp) if hasattr(os, "pread") else None
+        offset, end = self.offset, self.offset + self.length
+        while offset < end:
+            count = min(size, end - offset)
+            if fd is not None:
+                chunk = os.pread(fd, count, offset)
+            else:
+                with _file_lock(fp):
+                    position = fp.tell()
+                    try:
+                        fp.seek(offset)
+                        chunk = fp.read(count)
+                    finally:
+                        fp.seek(position)
+            if not chunk:
+                raise IOError(
+                    "Failed to read %d bytes at offset %d" % (self.length, self.offset)
+                )
+            offset += len(chunk)
+            yield chunk
+
+    def _read_chunks(self, fp: IO[bytes], size: int) -> Iterator[bytes]:
+        fp.seek(self.offset)
+        remaining = self.length
+        while remaining > 0:
+            chunk = fp.read(min(size, remaining))
+            if not chunk:
+                raise IOError(
+                    "Failed to read %d bytes at offset %d" % (self.length, self.offset)
+                )
+            remaining -= len(chunk)
+            yield chunk
+
+
+_file_locks: weakref.WeakKeyDictionary[Any, threading.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+_file_locks_guard = threading.Lock()
+_shared_file_lock = threading.Lock()
+
+
+def _file_lock(fp: Any) -> threading.Lock:
+    """Get the lock that serializes seek and read on a shared file object."""
+    with _file_locks_guard:
+        try:
+            lock = _file_locks.get(fp)
+            if lock is None:
+                lock = _file_locks[fp] = threading.Lock()
+        except TypeError:
+            # Not weakly referenceable: share one lock among such objects.
+            lock = _shared_file_lock
+        return lock
+
+
+def _regular_fileno(fp: Any) -> int | None:
+    """Get the descriptor of a file object backed by a regular file."""
+    try:
+        fd = fp.fileno()
+        return fd if stat.S_ISREG(os.fstat(fd).st_mode) else None
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _copy_range(src: int, offset: int, fp: IO[bytes], dst: int, length: int) -> int:
+    """
+    Copy a range of ``src`` to the current position of ``fp`` in the kernel.
+
+    Stops at the first failure, leaving the rest to the caller.
+
+    :return: number of bytes copied.
+    """
+    fp.flush()
+    position = fp.tell()
+    copied = 0
+    try:
+        while copied < length:
+            count = min(length - copied, _COPY_SIZE)
+            size = _copy_file_range(src, offset + copied, dst, position + copied, count)
+            if size == 0:
+                break
+            copied += size
+    except OSError as e:
+        logger.debug("Falling back to buffered copy: %s", e)
+    fp.seek(position + copied)
+    return copied
+
+
+def _copy_file_range(
+    src: int, src_offset: int, dst: int, dst_offset: int, count: int
+) -> int:
+    if hasattr(os, "copy_file_range"):
+        try:
+            return os.copy_file_range(src, dst, count, src_offset, dst_offset)
+        except OSError as e:
+            if e.errno not in _COPY_FILE_RANGE_ERRORS:
+                raise
+    if hasattr(os, "sendfile"):
+        os.lseek(dst, dst_offset, os.SEEK_SET)
+        return os.sendfile(dst, src, src_offset, count)
+    return 0
+
+
+def skip_bytes(fp: IO[bytes], size: int = -1) -> memoryview | FileSlice:
+    """
+    Skip over bytes without reading them.
+
+    :py:class:`BufferReader` hands out a `memoryview` since slicing the buffer
+    costs nothing; other streams are seeked past and the range is recorded in
+    a :py:class:`FileSlice`.
+
+    :param fp: file-like object
+    :param size: number of bytes to skip, or -1 to skip to the end.
+    :return: `memoryview` or :py:class:`FileSlice`
+    """
+    if isinstance(fp, BufferReader):
+        return fp.read_view(size)
+    offset = fp.tell()
+    available = fp.seek(0, io.SEEK_END) - offset
+    length = available if size < 0 else max(0, min(size, available))
+    fp.seek(offset + length)
+    return FileSlice(fp, offset, length)
+
+
+class SizeCounter(io.RawIOBase):
+    """
+    Seekable sink that discards data and only tracks its size.
+
+    :py:func:`write_length_block` writes a block here first to learn its
+    length when the real output cannot seek back.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pos = 0
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position %d" % offset)
+        self._pos = offset
+        self.size = max(self.size, offset)
+        return self._pos
+
+    def write(self, data: Any) -> int:
+        length = memoryview(data).nbytes
+        self.seek(length, io.SEEK_CUR)
+        return length
+
+
+class SequentialWriter(io.RawIOBase):
+    """
+    Position-tracking wrapper of an output that cannot seek, such as a pipe,
+    socket or compressed stream.
+
+    Writers only need :py:meth:`tell` on it; :py:func:`write_length_block`
+    computes lengths ahead instead of seeking back.
+
+    :param fp: writable file-like object.
+    """
+
+    def __init__(self, fp: Any) -> None:
+        super().__init__()
+        self._fp = fp
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._pos
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        length = len(view)
+        while view:
+            # Raw streams may accept only part of the data.
+            written = self._fp.write(view)
+            if written is None:
+                written = len(view)
+            view = view[written:]
+            self._pos += written
+        return length
+
+    def flush(self) -> None:
+        if hasattr(self._fp, "flush"):
+            self._fp.flush()
+
+
+def open_sequential(fp: Any) -> IO[bytes]:
+    """
+    Get a writer for ``fp`` that supports :py:meth:`tell`.
+
+    Seekable outputs are returned as is; others are wrapped in a
+    :py:class:`SequentialWriter`.
+
+    :param fp: writable file-like object.
+    :return: file-like object
+    """
+    if _is_seekable(fp):
+        return fp
+    return SequentialWriter(fp)  # type: ignore[return-value]
+
+
+def _is_seekable(fp: Any) -> bool:
+    try:
+        return bool(fp.seekable())
+    except (AttributeError, ValueError, OSError):
+        return False
+
+
 def write_length_block(
     fp: IO[bytes],
     writer: Callable[..., int],
@@ -115,6 +597,16 @@ def write_length_block(
     :param padding: divisor for padding not included in length marker
     :return: written byte size
     """
+    if not _is_seekable(fp):
+        # Learn the length in a dry run so that the output is written in order.
+        length = writer(SizeCounter(), **kwargs)
+        written = write_fmt(fp, fmt, length)
+        if writer(fp, **kwargs) != length:
+            raise IOError("Block length changed between the sizing and writing")
+        written += length
+        written += write_padding(fp, written, padding)
+        return written
+
     length_position = reserve_position(fp, fmt)
     written = writer(fp, **kwargs)
     written += write_position(fp, length_position, written, fmt)
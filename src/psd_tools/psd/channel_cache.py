@@ -0,0 +1,147 @@
+"""
+In-memory cache of decoded channel data.
+
+Rendering a layer decodes the same channels several times: the color and
+shape channels for compositing, again for :py:meth:`~psd_tools.api.layers.Layer.numpy`
+or :py:meth:`~psd_tools.api.layers.Layer.topil`, and the mask for each of
+them. :py:class:`ChannelCache` keeps the decoded data of recently used
+channels up to a byte budget, and drops the least recently used entries
+beyond it. Entries are keyed by the :py:class:`~psd_tools.psd.layer_and_mask.ChannelData`
+object and the requested geometry, and are dropped when the channel data is
+set again or the object is garbage collected.
+
+Caching is opt-in, either for the whole process or for one document::
+
+    from psd_tools import PSDImage
+    from psd_tools.psd.channel_cache import ChannelCache, set_channel_cache
+
+    set_channel_cache(ChannelCache(max_bytes=512 * 1024 * 1024))
+
+    # Or, for a single document.
+    cache = ChannelCache()
+    psd = PSDImage.open('example.psd', channel_cache=cache)
+    psd.composite()
+    print(cache.hits, cache.misses, cache.evictions)
+
+Arrays returned from a cache are read-only; see
+:py:class:`~psd_tools.lru_cache.LRUCache`.
+"""
+
+from __future__ import annotations
+
+import functools
+import weakref
+from typing import Any, Callable, Hashable, TypeVar, cast
+
+import numpy as np
+
+from psd_tools.lru_cache import LRUCache
+
+#: Default limit on the total size of the entries in a cache.
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+T = TypeVar("T", bytes, np.ndarray)
+
+_caches: weakref.WeakSet[ChannelCache] = weakref.WeakSet()
+_channel_cache: ChannelCache | None = None
+
+
+class ChannelCache(LRUCache):
+    """
+    Least recently used cache of decoded channel data.
+
+    Entries larger than ``max_bytes`` are not cached. The cache is safe to
+    share between the threads of the decode pool.
+
+    :param max_bytes: limit on the total size of the entries in bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        super().__init__(max_bytes)
+        self._channels: dict[int, tuple[weakref.ref, set[tuple]]] = {}
+        _caches.add(self)
+
+    def get(self, channel: object, key: Hashable, decode: Callable[[], T]) -> T:
+        """
+        Get the decoded data of a channel, decoding it on a miss.
+
+        :param channel: channel data object the entry belongs to.
+        :param key: geometry and format of the decoded data.
+        :param decode: function that decodes the data.
+        :return: the cached or decoded data.
+        """
+        return self._get((id(channel), key), decode, channel)
+
+    def discard(self, channel: object) -> None:
+        """Remove the entries of a channel."""
+        with self._lock:
+            if self._owner(id(channel)) is channel:
+                self._forget(id(channel))
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            super().clear()
+            self._channels.clear()
+
+    def _owner(self, channel_id: int) -> object | None:
+        record = self._channels.get(channel_id)
+        return record[0]() if record is not None else None
+
+    def _is_current(self, key: Hashable, owner: object) -> bool:
+        return self._owner(cast(tuple, key)[0]) is owner
+
+    def _insert(self, key: Hashable, value: Any, size: int, owner: object) -> None:
+        channel_id = cast(tuple, key)[0]
+        if self._owner(channel_id) is not owner:
+            # Entries of a collected object whose id has been reused.
+            self._forget(channel_id)
+            ref = weakref.ref(owner, functools.partial(_collected, self, channel_id))
+            self._channels[channel_id] = (ref, set())
+        self._channels[channel_id][1].add(cast(tuple, key))
+        super()._insert(key, value, size, owner)
+
+    def _evicted(self, key: Hashable) -> None:
+        channel_id = cast(tuple, key)[0]
+        keys = self._channels[channel_id][1]
+        keys.discard(cast(tuple, key))
+        if not keys:
+            del self._channels[channel_id]
+
+    def _forget(self, channel_id: int) -> None:
+        record = self._channels.pop(channel_id, None)
+        if record is None:
+            return
+        for entry_key in record[1]:
+            self._size -= self._entries.pop(entry_key)[1]
+
+
+def set_channel_cache(cache: ChannelCache | None) -> None:
+    """
+    Set the process-wide :py:class:`ChannelCache`.
+
+    The cache is used for documents that do not have their own. The default
+    of `None` disables caching.
+
+    :param cache: :py:class:`ChannelCache` or `None`.
+    """
+    global _channel_cache
+    _channel_cache = cache
+
+
+def get_channel_cache() -> ChannelCache | None:
+    """Get the process-wide :py:class:`ChannelCache`, or `None`."""
+    return _channel_cache
+
+
+def discard_channel(channel: object) -> None:
+    """Remove the entries of a channel from every cache."""
+    for cache in list(_caches):
+        cache.discard(channel)
+
+
+def _collected(cache: ChannelCache, channel_id: int, ref: weakref.ref) -> None:
+    with cache._lock:
+        record = cache._channels.get(channel_id)
+        if record is not None and record[0] is ref:
+            cache._forget(channel_id)
@@ -14,8 +14,13 @@ Pretty printing is the best approach to check the descriptor content::
 
     from IPython.pretty import pprint
     pprint(descriptor)
+
+Descriptors read from in-memory buffers are decoded by the compiled
+``_descriptor`` extension when it is available; the ``read`` classmethods are
+the fallback and handle input the extension rejects.
 """
 
+import io
 import logging
 from typing import IO, Any, Iterator, TypeVar
 
@@ -33,6 +38,7 @@ from psd_tools.psd.base import (
 )
 from psd_tools.terminology import Enum, Event, Form, Key, Klass, Type, Unit
 from psd_tools.psd.bin_utils import (
+    BufferReader,
     read_fmt,
     read_length_block,
     read_unicode_string,
@@ -46,6 +52,11 @@ from psd_tools.psd.bin_utils import (
 from psd_tools.registry import new_registry
 from psd_tools.validators import in_
 
+try:
+    import psd_tools.psd._descriptor as _descriptor  # type: ignore[import-not-found]
+except ImportError:
+    _descriptor = None
+
 logger = logging.getLogger(__name__)
 
 TYPES, register = new_registry(attribute="ostype")
@@ -72,6 +83,17 @@ def read_length_and_key(fp: IO[bytes]) -> bytes:
     return key
 
 
+def read_unit(value: bytes) -> Any:
+    """
+    Helper to convert a unit code, falling back to :py:class:`Enum`.
+    """
+    try:
+        return Unit(value)
+    except ValueError:
+        logger.warning("Using Enum for Unit field")
+        return Enum(value)
+
+
 def write_length_and_key(fp: IO[bytes], value: bytes) -> int:
     """
     Helper to write descriptor key.
@@ -87,6 +109,20 @@ class _DescriptorMixin(DictElement):
 
     @classmethod
     def _read_body(cls, fp: IO[bytes]) -> dict[str, Any]:
+        if _parser is not None and isinstance(fp, (BufferReader, io.BytesIO)):
+            offset = fp.tell()
+            with fp.getbuffer() as buffer:
+                try:
+                    body, end = _parser.read_body(buffer, offset)
+                except ValueError as e:
+                    logger.debug("Falling back to the Python reader: %s", e)
+                else:
+                    fp.seek(end)
+                    return body
+        return cls._read_body_py(fp)
+
+    @classmethod
+    def _read_body_py(cls, fp: IO[bytes]) -> dict[str, Any]:
         name = read_unicode_string(fp, padding=1)
         classID = read_length_and_key(fp)
         items = []
@@ -304,11 +340,7 @@ class UnitFloat(NumericElement):
     @classmethod
     def read(cls: type[T], fp: IO[bytes], **kwargs: Any) -> T:
         unit, value = read_fmt("4sd", fp)
-        try:
-            unit = Unit(unit)
-        except ValueError:
-            logger.warning("Using Enum for Unit field")
-            unit = Enum(unit)
+        unit = read_unit(unit)
         return cls(unit=unit, value=value)  # type: ignore[call-arg]
 
     def write(self, fp: IO[bytes], **kwargs: Any) -> int:
@@ -344,11 +376,7 @@ class UnitFloats(BaseElement):
     @classmethod
     def read(cls: type[T], fp: IO[bytes], **kwargs: Any) -> T:
         unit, count = read_fmt("4sI", fp)
-        try:
-            unit = Unit(unit)
-        except ValueError:
-            logger.warning("Using Enum for Unit field")
-            unit = Enum(unit)
+        unit = read_unit(unit)
         values = list(read_fmt("%dd" % count, fp))
         return cls(unit=unit, values=values)  # type: ignore[call-arg]
 
@@ -815,3 +843,12 @@ class DescriptorBlock2(Descriptor):
         written += self._write_body(fp)
         written += write_padding(fp, written, padding)
         return written
+
+
+_parser = (
+    _descriptor.Parser(
+        {key.value: kls for key, kls in TYPES.items()}, _TERMS, read_unit
+    )
+    if _descriptor is not None
+    else None
+)
@@ -12,6 +12,7 @@ from attrs import define, field
 
 from psd_tools.constants import Tag
 from .base import BaseElement
+from .bin_utils import open_sequential
 from .color_mode_data import ColorModeData
 from .header import FileHeader
 from .image_data import ImageData
@@ -43,6 +44,13 @@ class PSD(BaseElement):
         with open(output_file, 'wb') as f:
             psd.write(f)
 
+    Pass ``lazy=True`` to :py:meth:`read` to keep tagged blocks undecoded
+    until they are accessed; see :py:class:`~psd_tools.psd.tagged_blocks.TaggedBlocks`.
+    Pass ``load_pixels=False`` to seek past channel and image data instead of
+    reading them; the data is read back from the file when accessed.
+
+    :py:meth:`write` emits the file strictly in order, so the output does not
+    need to be seekable; it can be a pipe, socket or compressed stream.
 
     .. py:attribute:: header
 
@@ -75,7 +83,12 @@ class PSD(BaseElement):
 
     @classmethod
     def read(
-        cls: type[T], fp: IO[bytes], encoding: str = "macroman", **kwargs: Any
+        cls: type[T],
+        fp: IO[bytes],
+        encoding: str = "macroman",
+        lazy: bool = False,
+        load_pixels: bool = True,
+        **kwargs: Any,
     ) -> T:
         header = FileHeader.read(fp)
         logger.debug("read %s" % header)
@@ -83,12 +96,15 @@ class PSD(BaseElement):
             header,
             ColorModeData.read(fp),
             ImageResources.read(fp, encoding),
-            LayerAndMaskInformation.read(fp, encoding, header.version),
-            ImageData.read(fp),
+            LayerAndMaskInformation.read(
+                fp, encoding, header.version, lazy=lazy, load_pixels=load_pixels
+            ),
+            ImageData.read(fp, load_pixels=load_pixels),
         )
 
     def write(self, fp: IO[bytes], encoding: str = "macroman", **kwargs: Any) -> int:
         logger.debug("writing %s" % self.header)
+        fp = open_sequential(fp)
         written = self.header.write(fp)
         written += self.color_mode_data.write(fp)
         written += self.image_resources.write(fp, encoding)
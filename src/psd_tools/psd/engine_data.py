@@ -89,6 +89,15 @@ class Tokenizer:
     DIVIDER = compile_re(r"[ \n\t]+")
     UTF16_START = b"(\xfe\xff"
     UTF16_END = compile_re(r"[^\\]\)")
+    # All token patterns as one alternation, tried in declaration order.
+    TOKEN = re.compile(
+        b"|".join(
+            b"(?P<%s>%s)"
+            % (token_type.name.encode("ascii"), token_type.value.pattern[1:-1])
+            for token_type in EngineToken
+        ),
+        re.S,
+    )
 
     def __init__(self, data: bytes) -> None:
         self.data = data
@@ -104,32 +113,33 @@ class Tokenizer:
         return self.__next__()
 
     def __next__(self) -> tuple[bytes, EngineToken]:
-        if len(self) == 0:
-            raise StopIteration
-
-        index = self.index
-        if self.data[index:].startswith(self.UTF16_START):
-            match = self.UTF16_END.search(self.data[index:])
-            if match is None:
-                raise ValueError("Invalid token: %r" % (self.data[index:]))
-            token = self.data[index : index + match.end()]
-            self.index += match.end()
-        else:
-            match = self.DIVIDER.search(self.data[index:])
-            if match is None:
-                token = self.data[index:]
-                self.index = len(self.data)
+        data = self.data
+        token = b""
+        while not token:
+            index = self.index
+            if index >= len(data):
+                raise StopIteration
+
+            if data.startswith(self.UTF16_START, index):
+                match = self.UTF16_END.search(data, index)
+                if match is None:
+                    raise ValueError("Invalid token: %r" % (data[index:]))
+                token = data[index : match.end()]
+                self.index = match.end()
             else:
-                token = self.data[index : index + match.start()]
-                self.index += match.end()
-                if token == b"":
-                    return self.__next__()
-
-        for token_type in EngineToken:
-            if token_type.value.search(token):
-                return token, token_type
-
-        raise ValueError("Unknown token: %r" % (token))
+                match = self.DIVIDER.search(data, index)
+                if match is None:
+                    token = data[index:]
+                    self.index = len(data)
+                else:
+                    token = data[index : match.start()]
+                    self.index = match.end()
+
+        match = self.TOKEN.fullmatch(token)
+        if match is None:
+            raise ValueError("Unknown token: %r" % (token))
+        assert match.lastgroup is not None
+        return token, EngineToken[match.lastgroup]
 
 
 @register(EngineToken.DICT_START)
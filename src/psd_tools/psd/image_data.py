@@ -6,23 +6,49 @@ where a composited image is stored. When the file does not contain layers,
 this is the only place pixels are saved.
 """
 
+import array
 import io
 import logging
-from typing import IO, Any, Sequence, TypeVar
+import warnings
+import zlib
+from typing import IO, Any, Callable, Iterator, Sequence, TypeVar
 
+import numpy as np
 from attrs import define, field
 
-from psd_tools.compression import compress, decompress
+from psd_tools.compression import (
+    CompressionPolicy,
+    PSDDecompressionWarning,
+    compress,
+    decode_prediction,
+    decompress,
+    rle_impl,
+    select_compression,
+)
 from psd_tools.constants import Compression
 from psd_tools.psd.header import FileHeader
 from psd_tools.psd.base import BaseElement
-from psd_tools.psd.bin_utils import pack, read_fmt, write_bytes, write_fmt
+from psd_tools.psd.bin_utils import (
+    FileSlice,
+    pack,
+    read_be_array,
+    read_bytes,
+    read_fmt,
+    skip_bytes,
+    write_bytes,
+    write_fmt,
+)
 from psd_tools.validators import in_
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound="ImageData")
 
+# Size of the reads from the file when streaming ZIP data.
+_STREAM_CHUNK = 256 * 1024
+
+_BAND_DTYPES = {1: np.uint8, 8: np.uint8, 16: np.uint16, 32: np.float32}
+
 
 @define(repr=False)
 class ImageData(BaseElement):
@@ -35,51 +61,247 @@ class ImageData(BaseElement):
 
     .. py:attribute:: data
 
-        `bytes` as compressed in the `compression` flag.
+        `bytes` as compressed in the `compression` flag. A `memoryview` into
+        the file when read with
+        :py:class:`~psd_tools.psd.bin_utils.BufferReader`. When read with
+        ``load_pixels=False``, the data is left in the file and read from it
+        on each access.
     """
 
     compression: Compression = field(
         default=Compression.RAW, converter=Compression, validator=in_(Compression)
     )
-    data: bytes = b""
+    _data: bytes | memoryview | FileSlice = b""
+
+    @property
+    def data(self) -> bytes | memoryview:
+        if isinstance(self._data, FileSlice):
+            return self._data.read()
+        return self._data
+
+    @data.setter
+    def data(self, value: bytes | memoryview) -> None:
+        self._data = value
 
     @classmethod
-    def read(cls: type[T], fp: IO[bytes], **kwargs: Any) -> T:
+    def read(cls: type[T], fp: IO[bytes], load_pixels: bool = True, **kwargs: Any) -> T:
         start_pos = fp.tell()
         compression = Compression(read_fmt("H", fp)[0])
-        data = fp.read()  # TODO: Parse data here. Need header.
+        # TODO: Parse data here. Need header.
+        data = read_bytes(fp) if load_pixels else skip_bytes(fp)
         logger.debug("  read image data, len=%d" % (fp.tell() - start_pos))
         return cls(compression, data)
 
     def write(self, fp: IO[bytes], **kwargs: Any) -> int:
         start_pos = fp.tell()
         written = write_fmt(fp, "H", self.compression.value)
-        written += write_bytes(fp, self.data)
+        written += write_bytes(fp, self._data)
         logger.debug("  wrote image data, len=%d" % (fp.tell() - start_pos))
         return written
 
-    def get_data(self, header: FileHeader, split: bool = True) -> list[bytes] | bytes:
+    def get_data(
+        self,
+        header: FileHeader,
+        split: bool = True,
+        rows: tuple[int, int] | None = None,
+    ) -> list[bytes] | bytes:
         """
         Get decompressed data.
 
         :param header: See :py:class:`~psd_tools.psd.header.FileHeader`.
+        :param rows: optional `(start, stop)` range of rows to decode in each
+            channel.
         :return: `list` of bytes corresponding each channel.
         """
-        data = decompress(
-            self.data,
-            self.compression,
-            header.width,
-            header.height * header.channels,
-            header.depth,
-            header.version,
-        )
+        data_bytes = self.data
+        if rows is None:
+            data = decompress(
+                data_bytes,
+                self.compression,
+                header.width,
+                header.height * header.channels,
+                header.depth,
+                header.version,
+            )
+        else:
+            start, stop = rows
+            if not 0 <= start <= stop <= header.height:
+                raise ValueError("rows %r out of range [0, %d]" % (rows, header.height))
+            height = header.height
+            if self.compression in (
+                Compression.ZIP,
+                Compression.ZIP_WITH_PREDICTION,
+            ):
+                # The channels follow each other in one zlib stream; inflate
+                # it once up to the last channel and slice each channel out.
+                span = decompress(
+                    data_bytes,
+                    self.compression,
+                    header.width,
+                    height * header.channels,
+                    header.depth,
+                    header.version,
+                    rows=(start, (header.channels - 1) * height + stop),
+                )
+                row_size = header.width * header.depth // 8
+                data = b"".join(
+                    span[i * height * row_size : (i * height + stop - start) * row_size]
+                    for i in range(header.channels)
+                )
+            else:
+                data = b"".join(
+                    decompress(
+                        data_bytes,
+                        self.compression,
+                        header.width,
+                        height * header.channels,
+                        header.depth,
+                        header.version,
+                        rows=(i * height + start, i * height + stop),
+                    )
+                    for i in range(header.channels)
+                )
         if split:
             plane_size = len(data) // header.channels
             with io.BytesIO(data) as f:
                 return [f.read(plane_size) for _ in range(header.channels)]
         return data
 
-    def set_data(self, data: Sequence[bytes], header: FileHeader) -> int:
+    def iter_bands(
+        self, header: FileHeader, band_height: int = 256
+    ) -> Iterator[np.ndarray]:
+        """
+        Decode the image in bands of rows.
+
+        Only one band of each channel is decoded at a time, and data left in
+        the file by ``load_pixels=False`` is read from it band by band, so
+        that memory use does not depend on the image height. ZIP streams store
+        the channels one after another; all but the last channel are inflated
+        once more to find where each channel starts.
+
+        :param header: See :py:class:`~psd_tools.psd.header.FileHeader`.
+        :param band_height: number of rows in a band. The last band may have
+            fewer rows.
+        :return: iterator of arrays of shape ``(rows, width, channels)``;
+            `uint8` for 8-bit, `uint16` for 16-bit and `float32` for 32-bit
+            depth. 1-bit images give `uint8` arrays of 0 and 1.
+        """
+        if band_height < 1:
+            raise ValueError("band_height must be positive, got %d" % band_height)
+        width, height, depth = header.width, header.height, header.depth
+        row_size = (width * depth + 7) // 8
+        readers = self._band_readers(header, row_size)
+        failed = [False] * header.channels
+        for start in range(0, height, band_height):
+            count = min(band_height, height - start)
+            band = np.zeros((count, width, header.channels), _BAND_DTYPES[depth])
+            for index, read in enumerate(readers):
+                if failed[index]:
+                    continue
+                try:
+                    data = read(start, count)
+                    if len(data) != count * row_size:
+                        raise ValueError(
+                            "Expected %d bytes, got %d" % (count * row_size, len(data))
+                        )
+                except (ValueError, IndexError, zlib.error) as e:
+                    msg = (
+                        "%s decode failed (%s: %s); channel %d replaced with black "
+                        "from row %d"
+                        % (self.compression.name, type(e).__name__, e, index, start)
+                    )
+                    logger.warning(msg)
+                    warnings.warn(msg, PSDDecompressionWarning, stacklevel=2)
+                    failed[index] = True
+                    continue
+                if depth == 1:
+                    rows = np.frombuffer(data, np.uint8).reshape((count, row_size))
+                    band[:, :, index] = np.unpackbits(rows, axis=1, count=width)
+                else:
+                    dtype = np.dtype(_BAND_DTYPES[depth]).newbyteorder(">")
+                    band[:, :, index] = np.frombuffer(data, dtype).reshape(
+                        (count, width)
+                    )
+            yield band
+
+    def _band_readers(
+        self, header: FileHeader, row_size: int
+    ) -> list[Callable[[int, int], bytes | bytearray | memoryview]]:
+        """Get functions that read `count` rows from `start` of each channel."""
+        height = header.height
+        if self.compression == Compression.RAW:
+
+            def raw_reader(index: int) -> Callable[[int, int], bytes | memoryview]:
+                offset = index * height * row_size
+                return lambda start, count: self._read_range(
+                    offset + start * row_size, count * row_size
+                )
+
+            return [raw_reader(index) for index in range(header.channels)]
+
+        if self.compression == Compression.RLE:
+            total = height * header.channels
+            fmt = ("H", "I")[header.version - 1]
+            table = self._read_range(0, total * header.version * 2)
+            with io.BytesIO(table) as f:
+                bytes_counts = read_be_array(fmt, total, f)
+            if bytes_counts.typecode != "I":
+                bytes_counts = array.array("I", bytes_counts)
+            if len(bytes_counts) != total:
+                raise ValueError("RLE row counts are truncated")
+            offsets = [len(table)]
+            for size in bytes_counts:
+                offsets.append(offsets[-1] + size)
+
+            def rle_reader(index: int) -> Callable[[int, int], bytearray]:
+                def read(start: int, count: int) -> bytearray:
+                    first = index * height + start
+                    last = first + count
+                    data = self._read_range(
+                        offsets[first], offsets[last] - offsets[first]
+                    )
+                    out = bytearray(count * row_size)
+                    rle_impl.decode_rows(
+                        memoryview(data), bytes_counts[first:last], row_size, out
+                    )
+                    return out
+
+                return read
+
+            return [rle_reader(index) for index in range(header.channels)]
+
+        # The channels are consecutive in one zlib stream; find their starts.
+        inflater = _Inflater(self)
+        inflaters = [inflater.copy()]
+        for _ in range(header.channels - 1):
+            inflater.skip(height * row_size)
+            inflaters.append(inflater.copy())
+
+        def zip_reader(inflater: _Inflater) -> Callable[[int, int], bytes]:
+            def read(start: int, count: int) -> bytes:
+                data = inflater.read(count * row_size)
+                if self.compression == Compression.ZIP_WITH_PREDICTION:
+                    return decode_prediction(data, header.width, count, header.depth)
+                return data
+
+            return read
+
+        return [zip_reader(inflater) for inflater in inflaters]
+
+    def _read_range(self, offset: int, length: int) -> bytes | memoryview:
+        if isinstance(self._data, FileSlice):
+            length = max(min(length, self._data.length - offset), 0)
+            if length == 0:
+                return b""
+            return FileSlice(self._data.fp, self._data.offset + offset, length).read()
+        return memoryview(self._data)[offset : offset + length]
+
+    def set_data(
+        self,
+        data: Sequence[bytes],
+        header: FileHeader,
+        policy: CompressionPolicy | None = None,
+    ) -> int:
         """
         Set raw data and compress.
 
@@ -87,15 +309,27 @@ class ImageData(BaseElement):
         :param compression: compression type,
             see :py:class:`~psd_tools.constants.Compression`.
         :param header: See :py:class:`~psd_tools.psd.header.FileHeader`.
+        :param policy: optional
+            :py:class:`~psd_tools.compression.CompressionPolicy`.
         :return: length of compressed data.
+
+        With :py:attr:`~psd_tools.constants.Compression.AUTO`, one compression
+        is selected for all the channels, and replaces AUTO.
         """
+        raw = b"".join(data)
+        height = header.height * header.channels
+        if self.compression == Compression.AUTO:
+            self.compression = select_compression(
+                raw, header.width, height, header.depth, header.version, policy
+            )
         self.data = compress(
-            b"".join(data),
+            raw,
             self.compression,
             header.width,
-            header.height * header.channels,
+            height,
             header.depth,
             header.version,
+            policy,
         )
         return len(self.data)
 
@@ -128,3 +362,54 @@ class ImageData(BaseElement):
         self = cls(compression=compression)
         self.set_data(data, header)
         return self
+
+
+class _Inflater:
+    """Position in the zlib stream of :py:class:`ImageData`."""
+
+    def __init__(self, image_data: ImageData) -> None:
+        self._image_data = image_data
+        self._decompressor = zlib.decompressobj()
+        self._tail: bytes | memoryview = b""
+        self._position = 0
+        self._error: Exception | None = None
+
+    def copy(self) -> "_Inflater":
+        other = _Inflater.__new__(_Inflater)
+        other._image_data = self._image_data
+        other._decompressor = self._decompressor.copy()
+        other._tail = self._tail
+        other._position = self._position
+        other._error = self._error
+        return other
+
+    def read(self, size: int) -> bytes:
+        """Inflate the next `size` bytes; fewer at the end of the stream."""
+        if self._error is not None:
+            raise self._error
+        chunks = []
+        length = len(self._image_data._data)
+        while size > 0:
+            if not self._tail and self._position < length:
+                self._tail = self._image_data._read_range(self._position, _STREAM_CHUNK)
+                self._position += len(self._tail)
+            chunk = self._decompressor.decompress(self._tail, size)
+            self._tail = self._decompressor.unconsumed_tail
+            if not chunk and (
+                self._decompressor.eof or not self._tail and self._position >= length
+            ):
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def skip(self, size: int) -> None:
+        """Skip `size` bytes; a failure is raised by the next :py:meth:`read`."""
+        try:
+            while size > 0:
+                chunk = self.read(min(size, 16 * _STREAM_CHUNK))
+                if not chunk:
+                    raise ValueError("ZIP stream ended %d bytes early" % size)
+                size -= len(chunk)
+        except (ValueError, zlib.error) as e:
+            self._error = e
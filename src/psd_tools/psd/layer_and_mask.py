@@ -14,6 +14,7 @@ Key classes:
 - :py:class:`ChannelInfo`: Channel metadata within a layer record
 - :py:class:`ChannelImageData`: Compressed pixel data for all channels
 - :py:class:`ChannelData`: Single channel's compressed pixel data
+- :py:class:`ChannelLocation`: Where a channel's data lives in the file
 - :py:class:`MaskData`: Layer mask parameters
 - :py:class:`GlobalLayerMaskInfo`: Document-wide mask settings
 - :py:class:`TaggedBlocks`: Extended layer metadata (see :py:mod:`psd_tools.psd.tagged_blocks`)
@@ -59,12 +60,22 @@ API which provides easier access to this data.
 """
 
 import io
+import itertools
 import logging
+import os
 from typing import IO, Any, TypeVar
 
-from attrs import define, field, astuple
+import numpy as np
+from attrs import define, field, frozen, astuple
+from numpy.typing import DTypeLike
 
-from psd_tools.compression import compress, decompress
+from psd_tools.compression import (
+    CompressionPolicy,
+    compress,
+    decompress,
+    decompress_into,
+    select_compression,
+)
 from psd_tools.constants import (
     BlendMode,
     ChannelID,
@@ -74,12 +85,22 @@ from psd_tools.constants import (
     Tag,
 )
 from psd_tools.psd.base import BaseElement, ListElement
+from psd_tools.psd.channel_cache import (
+    ChannelCache,
+    discard_channel,
+    get_channel_cache,
+)
 from psd_tools.psd.tagged_blocks import TaggedBlocks, register
 from psd_tools.psd.bin_utils import (
+    FileSlice,
     is_readable,
+    open_buffer,
+    read_bytes,
     read_fmt,
     read_length_block,
+    read_length_buffer,
     read_pascal_string,
+    skip_bytes,
     write_bytes,
     write_fmt,
     write_length_block,
@@ -104,6 +125,10 @@ T_MaskData = TypeVar("T_MaskData", bound="MaskData")
 T_MaskParameters = TypeVar("T_MaskParameters", bound="MaskParameters")
 T_ChannelImageData = TypeVar("T_ChannelImageData", bound="ChannelImageData")
 T_ChannelDataList = TypeVar("T_ChannelDataList", bound="ChannelDataList")
+
+# Identities of channel data, unique across processes.
+_IDENTITY_PREFIX = os.urandom(8)
+_identities = itertools.count()
 T_ChannelData = TypeVar("T_ChannelData", bound="ChannelData")
 T_GlobalLayerMaskInfo = TypeVar("T_GlobalLayerMaskInfo", bound="GlobalLayerMaskInfo")
 
@@ -147,7 +172,7 @@ class LayerAndMaskInformation(BaseElement):
         if length == 0:
             self = cls()
         else:
-            self = cls._read_body(fp, end_pos, encoding, version)
+            self = cls._read_body(fp, end_pos, encoding, version, **kwargs)
         if fp.tell() > end_pos:
             logger.warning(
                 "LayerAndMaskInformation is broken: current fp=%d, expected=%d"
@@ -163,8 +188,12 @@ class LayerAndMaskInformation(BaseElement):
         end_pos: int,
         encoding: str,
         version: int,
+        lazy: bool = False,
+        load_pixels: bool = True,
     ) -> T_LayerAndMaskInformation:
-        layer_info = LayerInfo.read(fp, encoding, version)
+        layer_info = LayerInfo.read(
+            fp, encoding, version, lazy=lazy, load_pixels=load_pixels
+        )
 
         global_layer_mask_info = None
         if is_readable(fp, 17) and fp.tell() < end_pos:
@@ -174,7 +203,12 @@ class LayerAndMaskInformation(BaseElement):
         if is_readable(fp):
             # For some reason, global tagged blocks aligns 4 byte
             tagged_blocks = TaggedBlocks.read(
-                fp, version=version, padding=4, end_pos=end_pos
+                fp,
+                version=version,
+                padding=4,
+                end_pos=end_pos,
+                lazy=lazy,
+                load_pixels=load_pixels,
             )
 
         return cls(layer_info, global_layer_mask_info, tagged_blocks)
@@ -232,6 +266,22 @@ class LayerInfo(BaseElement):
     layer_records: "LayerRecords" = field(factory=lambda: LayerRecords())
     channel_image_data: "ChannelImageData" = field(factory=lambda: ChannelImageData())
 
+    @property
+    def channel_index(self) -> list[list["ChannelLocation"]]:
+        """
+        File locations of channel data, per layer record and channel.
+
+        Channels that were not read from a file, or whose data has been
+        replaced, are left out. Together with ``load_pixels=False`` this lets
+        batch tools plan which ranges of the file to read.
+
+        :return: `list` of `list` of :py:class:`ChannelLocation`
+        """
+        return [
+            channels._locations(record.channel_info)
+            for record, channels in zip(self.layer_records, self.channel_image_data)
+        ]
+
     @classmethod
     def read(
         cls: type[T_LayerInfo],
@@ -246,20 +296,27 @@ class LayerInfo(BaseElement):
         if length == 0:
             self = LayerInfo()
         else:
-            self = cls._read_body(fp, encoding, version)
+            self = cls._read_body(fp, encoding, version, **kwargs)
         assert fp.tell() <= end_pos
         fp.seek(end_pos, 0)
         return self  # type: ignore[return-value]
 
     @classmethod
     def _read_body(
-        cls: type[T_LayerInfo], fp: IO[bytes], encoding: str, version: int
+        cls: type[T_LayerInfo],
+        fp: IO[bytes],
+        encoding: str,
+        version: int,
+        lazy: bool = False,
+        load_pixels: bool = True,
     ) -> T_LayerInfo:
         start_pos = fp.tell()
         layer_count = read_fmt("h", fp)[0]
-        layer_records = LayerRecords.read(fp, layer_count, encoding, version)
+        layer_records = LayerRecords.read(fp, layer_count, encoding, version, lazy=lazy)
         logger.debug("  read layer records, len=%d" % (fp.tell() - start_pos))
-        channel_image_data = ChannelImageData.read(fp, layer_records)
+        channel_image_data = ChannelImageData.read(
+            fp, layer_records, load_pixels=load_pixels
+        )
         return cls(
             layer_count=layer_count,
             layer_records=layer_records,
@@ -322,7 +379,7 @@ class LayerInfoBlock(LayerInfo):
         version: int = 1,
         **kwargs: Any,
     ) -> T_LayerInfo:
-        return cls._read_body(fp, encoding, version)
+        return cls._read_body(fp, encoding, version, **kwargs)
 
     def write(
         self,
@@ -501,7 +558,7 @@ class LayerRecords(ListElement):
     ) -> T_LayerRecords:  # type: ignore[override]
         items = []
         for _ in range(abs(layer_count)):
-            items.append(LayerRecord.read(fp, encoding, version))
+            items.append(LayerRecord.read(fp, encoding, version, **kwargs))
         return cls(items)  # type: ignore[arg-type]
 
 
@@ -593,6 +650,7 @@ class LayerRecord(BaseElement):
         fp: IO[bytes],
         encoding: str = "macroman",
         version: int = 1,
+        lazy: bool = False,
         **kwargs: Any,
     ) -> T_LayerRecord:
         start_pos = fp.tell()
@@ -601,11 +659,11 @@ class LayerRecord(BaseElement):
         signature, blend_mode, opacity, clipping = read_fmt("4s4sBB", fp)
         flags = LayerFlags.read(fp)
 
-        data = read_length_block(fp, fmt="xI")
+        data = read_length_buffer(fp, fmt="xI")
         logger.debug("  read layer record, len=%d" % (fp.tell() - start_pos))
-        with io.BytesIO(data) as f:
+        with open_buffer(data) as f:
             mask_data, blending_ranges, name, tagged_blocks = cls._read_extra(
-                f, encoding, version
+                f, encoding, version, lazy
             )
             self = cls(
                 top=top,
@@ -632,12 +690,12 @@ class LayerRecord(BaseElement):
 
     @classmethod
     def _read_extra(
-        cls, fp: IO[bytes], encoding: str, version: int
+        cls, fp: IO[bytes], encoding: str, version: int, lazy: bool = False
     ) -> tuple["MaskData | None", LayerBlendingRanges, str, TaggedBlocks]:
         mask_data = MaskData.read(fp)
         blending_ranges = LayerBlendingRanges.read(fp)
         name = read_pascal_string(fp, encoding, padding=4)
-        tagged_blocks = TaggedBlocks.read(fp, version=version, padding=1)
+        tagged_blocks = TaggedBlocks.read(fp, version=version, padding=1, lazy=lazy)
         return mask_data, blending_ranges, name, tagged_blocks
 
     def write(
@@ -1044,7 +1102,7 @@ class ChannelImageData(ListElement):
         items = []
         if layer_records:
             for layer in layer_records:
-                items.append(ChannelDataList.read(fp, layer.channel_info))
+                items.append(ChannelDataList.read(fp, layer.channel_info, **kwargs))
         logger.debug("  read channel image data, len=%d" % (fp.tell() - start_pos))
         return cls(items)  # type: ignore[arg-type]
 
@@ -1104,6 +1162,14 @@ class ChannelDataList(ListElement):
         """List of channel lengths."""
         return [item._length for item in self]
 
+    def _locations(self, channel_info: list["ChannelInfo"]) -> list["ChannelLocation"]:
+        """List of file locations of the channels that have one."""
+        return [
+            ChannelLocation(info.id, data.offset, data._length, data.compression)
+            for info, data in zip(channel_info, self)
+            if data.offset is not None
+        ]
+
 
 @define(repr=False)
 class ChannelData(BaseElement):
@@ -1116,18 +1182,58 @@ class ChannelData(BaseElement):
 
     .. py:attribute:: data
 
-        Data.
+        Data. A `memoryview` into the file when read with
+        :py:class:`~psd_tools.psd.bin_utils.BufferReader`. When read with
+        ``load_pixels=False``, the data is left in the file and read from it
+        on each access.
+
+    .. py:attribute:: offset
+
+        Position of the channel data block, starting with the compression
+        marker, in the file it was read from. `None` when the data is not
+        from a file or has been replaced since.
     """
 
     compression: Compression = field(
         default=Compression.RAW, converter=Compression, validator=in_(Compression)
     )
-    data: bytes = b""
+    _data: bytes | memoryview | FileSlice = b""
+    offset: int | None = field(default=None, kw_only=True, eq=False)
+    _identity_bytes: bytes | None = field(
+        default=None, init=False, eq=False, repr=False
+    )
+
+    @property
+    def data(self) -> bytes | memoryview:
+        if isinstance(self._data, FileSlice):
+            return self._data.read()
+        return self._data
+
+    @data.setter
+    def data(self, value: bytes | memoryview) -> None:
+        self._data = value
+        self.offset = None
+        self._identity_bytes = None
+        discard_channel(self)
+
+    @property
+    def _identity(self) -> bytes:
+        """Bytes that identify the data; they change whenever it is set."""
+        if self._identity_bytes is None:
+            self._identity_bytes = _IDENTITY_PREFIX + next(_identities).to_bytes(
+                8, "big"
+            )
+        return self._identity_bytes
 
     @classmethod
     def read(
-        cls: type[T_ChannelData], fp: IO[bytes], length: int = 0, **kwargs: Any
+        cls: type[T_ChannelData],
+        fp: IO[bytes],
+        length: int = 0,
+        load_pixels: bool = True,
+        **kwargs: Any,
     ) -> T_ChannelData:
+        offset = fp.tell()
         compression = Compression(read_fmt("H", fp)[0])
         # length is c.length - 2 (the 2-byte compression header is excluded).
         # A negative value here indicates an upstream logic error; warn and
@@ -1137,28 +1243,187 @@ class ChannelData(BaseElement):
                 "ChannelData.read: negative length %d, clamping to 0", length
             )
             length = 0
-        data = fp.read(length)
-        return cls(compression=compression, data=data)
+        data = read_bytes(fp, length) if load_pixels else skip_bytes(fp, length)
+        return cls(compression=compression, data=data, offset=offset)
 
     def write(self, fp: IO[bytes], **kwargs: Any) -> int:
         written = write_fmt(fp, "H", self.compression.value)
-        written += write_bytes(fp, self.data)
+        written += write_bytes(fp, self._data)
         # written += write_padding(fp, written, 2)  # Seems no padding here.
         return written
 
-    def get_data(self, width: int, height: int, depth: int, version: int = 1) -> bytes:
+    def get_data(
+        self,
+        width: int,
+        height: int,
+        depth: int,
+        version: int = 1,
+        rows: tuple[int, int] | None = None,
+        cache: ChannelCache | None = None,
+    ) -> bytes:
         """Get decompressed channel data.
 
         :param width: width.
         :param height: height.
         :param depth: bit depth of the pixel.
         :param version: psd file version.
+        :param rows: optional `(start, stop)` range of rows to decode.
+        :param cache: :py:class:`~psd_tools.psd.channel_cache.ChannelCache`
+            to look the data up in. Defaults to the process-wide cache, if
+            any.
         :rtype: bytes
         """
-        return decompress(self.data, self.compression, width, height, depth, version)
+
+        def decode() -> bytes:
+            data, band_height, band_rows = self._rows_data(
+                width, height, depth, version, rows
+            )
+            return decompress(
+                data, self.compression, width, band_height, depth, version, band_rows
+            )
+
+        cache = cache if cache is not None else get_channel_cache()
+        if cache is None:
+            return decode()
+        return cache.get(self, ("bytes", width, height, depth, version, rows), decode)
+
+    def get_array(
+        self,
+        width: int,
+        height: int,
+        depth: int,
+        version: int = 1,
+        dtype: DTypeLike | None = None,
+        rows: tuple[int, int] | None = None,
+        cache: ChannelCache | None = None,
+    ) -> np.ndarray:
+        """Get decompressed channel data as an array of shape (height, width).
+
+        Samples are decoded straight into the array without scaling.
+
+        :param width: width.
+        :param height: height.
+        :param depth: bit depth of the pixel.
+        :param version: psd file version.
+        :param dtype: sample type of the array. Default is `uint8`, `uint16`
+            or `float32` for 8, 16 and 32-bit depth, in native byte order;
+            other types are converted with :py:meth:`numpy.ndarray.astype`.
+            1-bit data is unpacked to `uint8`.
+        :param rows: optional `(start, stop)` range of rows to decode; the
+            array then has ``stop - start`` rows.
+        :param cache: :py:class:`~psd_tools.psd.channel_cache.ChannelCache`
+            to look the array up in. Defaults to the process-wide cache, if
+            any. Cached arrays are read-only.
+        :rtype: numpy.ndarray
+        """
+        cache = cache if cache is not None else get_channel_cache()
+        if cache is None:
+            return self._decode_array(width, height, depth, version, dtype, rows, None)
+        dtype_key = None if dtype is None else np.dtype(dtype).str
+        key = ("array", width, height, depth, version, dtype_key, rows)
+        return cache.get(
+            self,
+            key,
+            lambda: self._decode_array(
+                width, height, depth, version, dtype, rows, cache
+            ),
+        )
+
+    def _decode_array(
+        self,
+        width: int,
+        height: int,
+        depth: int,
+        version: int,
+        dtype: DTypeLike | None,
+        rows: tuple[int, int] | None,
+        cache: ChannelCache | None,
+    ) -> np.ndarray:
+        if depth == 1:
+            # 1-bit rows are not decoded separately; the whole channel is
+            # decoded once, through the same cache, and the rows sliced out.
+            data = self.get_data(width, height, depth, version, cache=cache)
+            packed = np.frombuffer(data, np.uint8).reshape(height, -1)
+            packed = packed[slice(*rows) if rows else slice(None)]
+            array = np.unpackbits(packed, axis=1, count=width)
+            return array.astype(dtype or np.uint8, copy=False)
+
+        native = np.dtype({8: np.uint8, 16: np.uint16, 32: np.float32}[depth])
+        requested = np.dtype(dtype or native)
+        if (requested.kind, requested.itemsize) == (native.kind, native.itemsize):
+            native = requested
+        start, stop = rows if rows is not None else (0, height)
+        array = np.empty((stop - start, width), native)
+        source, band_height, band_rows = self._rows_data(
+            width, height, depth, version, rows
+        )
+        decompress_into(
+            array,
+            source,
+            self.compression,
+            width,
+            band_height,
+            depth,
+            version,
+            rows=band_rows,
+        )
+        return array.astype(requested, copy=False)
+
+    def _rows_data(
+        self,
+        width: int,
+        height: int,
+        depth: int,
+        version: int,
+        rows: tuple[int, int] | None,
+    ) -> tuple[bytes | memoryview, int, tuple[int, int] | None]:
+        """Get the data to decode *rows* from, with the height and rows to
+        decode it with.
+
+        Data left in the file is only read for the requested rows of RAW and
+        RLE channels; ZIP streams are read whole.
+        """
+        if (
+            rows is None
+            or depth == 1
+            or not isinstance(self._data, FileSlice)
+            or not 0 <= rows[0] <= rows[1] <= height
+        ):
+            return self.data, height, rows
+        start, stop = rows
+        row_size = width * depth // 8
+        if self.compression == Compression.RAW:
+            data = self._read_range(start * row_size, (stop - start) * row_size)
+            return data, stop - start, None
+        if self.compression == Compression.RLE:
+            count_size = 2 * version
+            table = self._read_range(0, height * count_size)
+            if len(table) != height * count_size:
+                return self.data, height, rows
+            counts = np.frombuffer(table, (">u2", ">u4")[version - 1])
+            offset = len(table) + int(counts[:start].sum(dtype=np.int64))
+            length = int(counts[start:stop].sum(dtype=np.int64))
+            # The counts of the requested rows followed by their data.
+            data = bytes(table[start * count_size : stop * count_size])
+            return data + self._read_range(offset, length), stop - start, None
+        return self.data, height, rows
+
+    def _read_range(self, offset: int, length: int) -> bytes:
+        """Read *length* bytes at *offset* of the data left in the file."""
+        assert isinstance(self._data, FileSlice)
+        length = max(min(length, self._data.length - offset), 0)
+        if length == 0:
+            return b""
+        return FileSlice(self._data.fp, self._data.offset + offset, length).read()
 
     def set_data(
-        self, data: bytes, width: int, height: int, depth: int, version: int = 1
+        self,
+        data: bytes,
+        width: int,
+        height: int,
+        depth: int,
+        version: int = 1,
+        policy: CompressionPolicy | None = None,
     ) -> int:
         """Set raw channel data and compress to store.
 
@@ -1169,14 +1434,55 @@ class ChannelData(BaseElement):
         :param height: height.
         :param depth: bit depth of the pixel.
         :param version: psd file version.
+        :param policy: optional
+            :py:class:`~psd_tools.compression.CompressionPolicy`.
+
+        With :py:attr:`~psd_tools.constants.Compression.AUTO`, the
+        compression is replaced by the one selected for the data.
         """
-        self.data = compress(data, self.compression, width, height, depth, version)
+        if self.compression == Compression.AUTO:
+            self.compression = select_compression(
+                data, width, height, depth, version, policy
+            )
+        self.data = compress(
+            data, self.compression, width, height, depth, version, policy
+        )
         return len(self.data)
 
     @property
     def _length(self) -> int:
         """Length of channel data block."""
-        return 2 + len(self.data)
+        return 2 + len(self._data)
+
+
+@frozen
+class ChannelLocation:
+    """
+    Location of a channel data block in the file it was read from.
+
+    See :py:attr:`LayerInfo.channel_index`.
+
+    .. py:attribute:: id
+
+        See :py:class:`~psd_tools.constants.ChannelID`.
+
+    .. py:attribute:: offset
+
+        Position of the block, starting with the 2-byte compression marker.
+
+    .. py:attribute:: length
+
+        Length of the block including the compression marker.
+
+    .. py:attribute:: compression
+
+        See :py:class:`~psd_tools.constants.Compression`.
+    """
+
+    id: ChannelID
+    offset: int
+    length: int
+    compression: Compression
 
 
 @define(repr=False)
@@ -2,7 +2,6 @@
 Linked layer structure.
 """
 
-import io
 import logging
 from typing import IO, Any, TypeVar
 
@@ -13,8 +12,10 @@ from psd_tools.psd.base import BaseElement, ListElement
 from psd_tools.psd.descriptor import DescriptorBlock
 from psd_tools.psd.bin_utils import (
     is_readable,
+    open_buffer,
+    read_bytes,
     read_fmt,
-    read_length_block,
+    read_length_buffer,
     read_pascal_string,
     read_unicode_string,
     write_bytes,
@@ -41,8 +42,8 @@ class LinkedLayers(ListElement):
     def read(cls: type[T_LinkedLayers], fp: IO[bytes], **kwargs: Any) -> T_LinkedLayers:
         items = []
         while is_readable(fp, 8):
-            data = read_length_block(fp, fmt="Q", padding=4)
-            with io.BytesIO(data) as f:
+            data = read_length_buffer(fp, fmt="Q", padding=4)
+            with open_buffer(data) as f:
                 items.append(LinkedLayer.read(f))
         return cls(items)  # type: ignore[arg-type]
 
@@ -86,7 +87,7 @@ class LinkedLayer(BaseElement):
     open_file: DescriptorBlock | None = None
     linked_file: DescriptorBlock | None = None
     timestamp: tuple | None = None
-    data: bytes | None = None
+    data: bytes | memoryview | None = None
     child_id: str | None = None
     mod_time: float | None = None
     lock_state: int | None = None
@@ -118,11 +119,11 @@ class LinkedLayer(BaseElement):
                 timestamp = read_fmt("I4Bd", fp)
             filesize = read_fmt("Q", fp)[0]  # External file size.
             if version > 2:
-                data = fp.read(datasize)
+                data = read_bytes(fp, datasize)
         elif kind == LinkedLayerType.ALIAS:
             read_fmt("8x", fp)
         if kind == LinkedLayerType.DATA:
-            data = fp.read(datasize)
+            data = read_bytes(fp, datasize)
             assert len(data) == datasize, "(%d vs %d)" % (len(data), datasize)
 
         # The followings are not well documented...
@@ -133,7 +134,7 @@ class LinkedLayer(BaseElement):
         if version >= 7:
             lock_state = read_fmt("B", fp)[0]
         if kind == LinkedLayerType.EXTERNAL and version == 2:
-            data = fp.read(datasize)
+            data = read_bytes(fp, datasize)
 
         return cls(
             kind,
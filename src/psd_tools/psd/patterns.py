@@ -15,8 +15,11 @@ from psd_tools.constants import ColorMode, Compression
 from psd_tools.psd.base import BaseElement, ListElement
 from psd_tools.psd.bin_utils import (
     is_readable,
+    open_buffer,
+    read_bytes,
     read_fmt,
     read_length_block,
+    read_length_buffer,
     read_pascal_string,
     read_unicode_string,
     write_bytes,
@@ -149,8 +152,8 @@ class VirtualMemoryArrayList(BaseElement):
         version = read_fmt("I", fp)[0]
         assert version == 3, "Invalid version %d" % (version)
 
-        data = read_length_block(fp)
-        with io.BytesIO(data) as f:
+        data = read_length_buffer(fp)
+        with open_buffer(data) as f:
             rectangle = read_fmt("4I", f)
             num_channels = read_fmt("I", f)[0]
             channels = []
@@ -191,7 +194,7 @@ class VirtualMemoryArray(BaseElement):
     compression: Compression = field(
         default=Compression.RAW, converter=Compression, validator=in_(Compression)
     )
-    data: bytes = b""
+    data: bytes | memoryview = b""
 
     @classmethod
     def read(cls, fp: IO[bytes], **kwargs: Any) -> Self:
@@ -204,7 +207,7 @@ class VirtualMemoryArray(BaseElement):
         depth = read_fmt("I", fp)[0]
         rectangle = read_fmt("4I", fp)
         pixel_depth, compression = read_fmt("HB", fp)
-        data = fp.read(length - 23)
+        data = read_bytes(fp, length - 23)
         return cls(is_written, depth, rectangle, pixel_depth, compression, data)
 
     def write(self, fp: IO[bytes], **kwargs: Any) -> int:
@@ -40,10 +40,15 @@ from psd_tools.psd.linked_layer import LinkedLayers
 from psd_tools.psd.patterns import Patterns
 from psd_tools.psd.vector import VectorMaskSetting, VectorStrokeContentSetting
 from psd_tools.psd.bin_utils import (
+    FileSlice,
     is_readable,
+    open_buffer,
     read_fmt,
     read_length_block,
+    read_length_buffer,
+    read_padding,
     read_pascal_string,
+    skip_bytes,
     trimmed_repr,
     write_bytes,
     write_fmt,
@@ -136,6 +141,13 @@ class TaggedBlocks(DictElement):
 
         # Get a field
         value = tagged_blocks.get_data(Tag.TYPE_TOOL_OBJECT_SETTING)
+
+    When read with ``lazy=True``, known blocks keep their raw bytes and are
+    decoded on first access through :py:meth:`get_data`, indexing,
+    :py:meth:`get`, :py:meth:`items` or :py:meth:`values`. Blocks that are
+    never accessed are written back verbatim. With ``load_pixels=False`` as
+    well, the raw bytes are not read either; the blocks keep their byte range
+    in the file, which is copied on write.
     """
 
     def get_data(self, key: Any, default: Any = None) -> Any:
@@ -171,6 +183,31 @@ class TaggedBlocks(DictElement):
         if kls is not None:
             self[key] = TaggedBlock(key=key, data=kls(*args, **kwargs))
 
+    def get(self, key: Any, *args: Any) -> Any:
+        block = super().get(key, *args)
+        if isinstance(block, TaggedBlock):
+            block._decode()
+        return block
+
+    def items(self) -> Any:
+        self._decode_all()
+        return super().items()
+
+    def values(self) -> Any:
+        self._decode_all()
+        return super().values()
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        block = super().pop(key, *args)
+        if isinstance(block, TaggedBlock):
+            block._decode()
+        return block
+
+    def __getitem__(self, key: Any) -> Any:
+        block = super().__getitem__(key)
+        block._decode()
+        return block
+
     @classmethod
     def read(
         cls: type[T_TaggedBlocks],
@@ -178,18 +215,27 @@ class TaggedBlocks(DictElement):
         version: int = 1,
         padding: int = 1,
         end_pos: int | None = None,
+        lazy: bool = False,
         **kwargs: Any,
     ) -> T_TaggedBlocks:
         items = []
         while is_readable(fp, 8):  # len(signature) + len(key) = 8
             if end_pos is not None and fp.tell() >= end_pos:
                 break
-            block = TaggedBlock.read(fp, version, padding)
+            block = TaggedBlock.read(fp, version, padding, lazy=lazy, **kwargs)
             if block is None:
                 break
             items.append((block.key, block))
         return cls(items)  # type: ignore[arg-type]
 
+    def write(self, fp: IO[bytes], *args: Any, **kwargs: Any) -> int:
+        # Iterate over the stored blocks so that pending ones stay undecoded.
+        return sum(block.write(fp, *args, **kwargs) for block in self._items.values())
+
+    def _decode_all(self) -> None:
+        for block in self._items.values():
+            block._decode()
+
     @classmethod
     def _key_converter(cls, key: Any) -> Any:
         return getattr(key, "value", key)
@@ -198,6 +244,7 @@ class TaggedBlocks(DictElement):
         if cycle:
             return
 
+        self._decode_all()
         with p.group(2, "{", "}"):
             p.breakable("")
             for idx, key in enumerate(self._items):
@@ -228,7 +275,9 @@ class TaggedBlock(BaseElement):
 
     .. py:attribute:: data
 
-        Data.
+        Data. Raw bytes, or a :py:class:`~psd_tools.psd.bin_utils.FileSlice`
+        of them, until the block is decoded when read with ``lazy=True``; see
+        :py:class:`.TaggedBlocks`.
     """
 
     _SIGNATURES = (b"8BIM", b"8B64")
@@ -256,10 +305,16 @@ class TaggedBlock(BaseElement):
         Tag.COMPOSITOR_INFO,
         Tag.ARTBOARD_DATA2,
     }
+    # Blocks that hold layer records are needed to build the layer tree, so
+    # they are decoded eagerly, straight from the file so that channel data
+    # offsets stay absolute, and propagate the read options to nested records.
+    _NESTED_KEYS = {Tag.LAYER_16, Tag.LAYER_32}
 
     signature: bytes = field(default=b"8BIM", repr=False, validator=in_(_SIGNATURES))
     key: bytes = b""
     data: bytes = field(default=b"", repr=True)
+    # Version to decode the raw data with, or None when already decoded.
+    _pending: int | None = field(default=None, init=False, repr=False, eq=False)
 
     @classmethod
     def read(
@@ -267,6 +322,7 @@ class TaggedBlock(BaseElement):
         fp: IO[bytes],
         version: int = 1,
         padding: int = 1,
+        lazy: bool = False,
         **kwargs: Any,
     ) -> T_TaggedBlock:  # type: ignore[return]
         signature = read_fmt("4s", fp)[0]
@@ -283,21 +339,94 @@ class TaggedBlock(BaseElement):
             logger.warning(message)
 
         fmt = cls._length_format(key, version)
-        raw_data = read_length_block(fp, fmt=fmt, padding=padding)
-        kls = TYPES.get(key)
-        if kls:
-            try:
-                data = kls.frombytes(raw_data, version=version)
-            except (OSError, ValueError) as e:
-                # Fallback to raw data.
-                message = "Failed to read tagged block %r: %s" % (key, e)
-                logger.error(message)
-                data = raw_data
-        else:
-            message = "Unknown tagged block: %r, %s" % (key, trimmed_repr(raw_data))
+        if key in cls._NESTED_KEYS:
+            data = cls._read_nested(fp, key, fmt, version, padding, lazy=lazy, **kwargs)
+            return cls(signature, key, data)
+
+        if lazy and key in TYPES and not kwargs.get("load_pixels", True):
+            self = cls(signature, key, cls._skip_data(fp, fmt, padding))  # type: ignore[arg-type]
+            self._pending = version
+            return self
+
+        raw_data = read_length_buffer(fp, fmt=fmt, padding=padding)
+        if key not in TYPES:
+            data = bytes(raw_data)
+            message = "Unknown tagged block: %r, %s" % (key, trimmed_repr(data))
             logger.info(message)
-            data = raw_data
-        return cls(signature, key, data)
+            return cls(signature, key, data)
+
+        if lazy:
+            self = cls(signature, key, raw_data)  # type: ignore[arg-type]
+            self._pending = version
+            return self
+
+        return cls(signature, key, cls._read_data(key, raw_data, version))
+
+    @classmethod
+    def _read_nested(
+        cls,
+        fp: IO[bytes],
+        key: Any,
+        fmt: str,
+        version: int,
+        padding: int,
+        **kwargs: Any,
+    ) -> Any:
+        length = read_fmt(fmt, fp)[0]
+        start_pos = fp.tell()
+        end_pos = start_pos + length
+        try:
+            data = TYPES[key].read(fp, version=version, **kwargs)
+            if fp.tell() > end_pos:
+                raise ValueError("overrun by %d bytes" % (fp.tell() - end_pos))
+        except (OSError, ValueError) as e:
+            # Fallback to raw data.
+            message = "Failed to read tagged block %r: %s" % (key, e)
+            logger.error(message)
+            fp.seek(start_pos)
+            data = fp.read(length)
+            if len(data) != length:
+                raise IOError(
+                    "Failed to read data section: read=%d, expected=%d. "
+                    "Likely the file is corrupted." % (len(data), length)
+                )
+        fp.seek(end_pos)
+        read_padding(fp, length, padding)
+        return data
+
+    @classmethod
+    def _skip_data(
+        cls, fp: IO[bytes], fmt: str, padding: int
+    ) -> memoryview | FileSlice:
+        length = read_fmt(fmt, fp)[0]
+        data = skip_bytes(fp, length)
+        if len(data) != length:
+            raise IOError(
+                "Failed to read data section: read=%d, expected=%d. "
+                "Likely the file is corrupted." % (len(data), length)
+            )
+        read_padding(fp, length, padding)
+        return data
+
+    @classmethod
+    def _read_data(cls, key: Any, raw_data: bytes | memoryview, version: int) -> Any:
+        try:
+            with open_buffer(raw_data) as f:
+                return TYPES[key].read(f, version=version)
+        except (OSError, ValueError) as e:
+            # Fallback to raw data.
+            message = "Failed to read tagged block %r: %s" % (key, e)
+            logger.error(message)
+            return bytes(raw_data)
+
+    def _decode(self) -> None:
+        """Decode the raw data of a block read with ``lazy=True``."""
+        if self._pending is not None:
+            data = self.data
+            if isinstance(data, FileSlice):
+                data = data.read()
+            self.data = self._read_data(self.key, data, self._pending)
+            self._pending = None
 
     def write(
         self, fp: IO[bytes], version: int = 1, padding: int = 1, **kwargs: Any
@@ -548,7 +677,7 @@ class MetadataSetting(BaseElement):
             if hasattr(self.data, "write"):
                 return self.data.write(f, padding=4)
             elif isinstance(self.data, int):
-                return write_fmt(fp, "I", self.data)
+                return write_fmt(f, "I", self.data)
             return write_bytes(f, self.data)
 
         written += write_length_block(fp, writer)
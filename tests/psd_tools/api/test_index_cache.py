@@ -0,0 +1,135 @@
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from psd_tools.api.index_cache import IndexCache, get_index_cache
+from psd_tools.api.psd_image import PSDImage
+from psd_tools.psd.bin_utils import FileSlice
+
+from ..utils import full_name
+
+
+@pytest.fixture
+def document(tmp_path: Path) -> Path:
+    path = tmp_path / "document.psd"
+    shutil.copy(full_name("layers/smartobject-layer.psd"), path)
+    return path
+
+
+def test_index_cache_hit_and_miss(document: Path, tmp_path: Path) -> None:
+    cache = IndexCache(tmp_path / "index")
+    expected = PSDImage.open(document)
+
+    psd = PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.size > 0
+
+    psd = PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(psd._record.image_data._data, FileSlice)
+    assert [layer.name for layer in psd.descendants()] == [
+        layer.name for layer in expected.descendants()
+    ]
+    assert [layer.bbox for layer in psd.descendants()] == [
+        layer.bbox for layer in expected.descendants()
+    ]
+    assert np.array_equal(psd.numpy(), expected.numpy())
+    assert psd._record.tobytes() == expected._record.tobytes()
+
+    # Options are part of the key.
+    PSDImage.open(document, index_cache=cache, lazy=True)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_index_cache_stale(document: Path, tmp_path: Path) -> None:
+    cache = IndexCache(tmp_path / "index")
+    PSDImage.open(document, index_cache=cache)
+    stat = os.stat(document)
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(os.listdir(cache.directory)) == 1
+
+
+def test_index_cache_corrupt_entry(document: Path, tmp_path: Path) -> None:
+    cache = IndexCache(tmp_path / "index")
+    PSDImage.open(document, index_cache=cache)
+    for name in os.listdir(cache.directory):
+        Path(cache.directory, name).write_bytes(b"broken")
+    psd = PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(psd) > 0
+
+
+def test_index_cache_data_only(document: Path, tmp_path: Path) -> None:
+    cache = IndexCache(tmp_path / "index")
+    assert os.stat(cache.directory).st_mode & 0o777 == 0o700
+    PSDImage.open(document, index_cache=cache)
+    (name,) = os.listdir(cache.directory)
+    entry = Path(cache.directory, name)
+    assert entry.read_bytes().startswith(b"PSDIDX")
+
+    # A pickle planted in the directory is never loaded.
+    marker = tmp_path / "executed"
+    entry.write_bytes(pickle.dumps(_Exploit(str(marker))))
+    psd = PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert not marker.exists()
+    assert len(psd) > 0
+
+    # So is a truncated entry.
+    entry.write_bytes(entry.read_bytes()[:-16])
+    PSDImage.open(document, index_cache=cache)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+class _Exploit:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __reduce__(self) -> tuple:
+        return (open, (self.path, "w"))
+
+
+def test_index_cache_eviction(tmp_path: Path) -> None:
+    cache = IndexCache(tmp_path / "index")
+    paths = []
+    for i in range(3):
+        path = tmp_path / ("document%d.psd" % i)
+        shutil.copy(full_name("colormodes/4x4_8bit_rgb.psd"), path)
+        paths.append(path)
+        PSDImage.open(path, index_cache=cache)
+    entry_size = cache.size // 3
+
+    cache.max_size = entry_size * 2
+    PSDImage.open(paths[0], index_cache=cache)  # Refresh the oldest entry.
+    path = tmp_path / "document3.psd"
+    shutil.copy(full_name("colormodes/4x4_8bit_rgb.psd"), path)
+    PSDImage.open(path, index_cache=cache)
+    assert cache.size <= cache.max_size
+
+    hits = cache.hits
+    PSDImage.open(paths[0], index_cache=cache)
+    assert cache.hits == hits + 1
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_index_cache_directory(document: Path, tmp_path: Path) -> None:
+    directory = tmp_path / "index"
+    PSDImage.open(document, index_cache=directory)
+    PSDImage.open(document, index_cache=str(directory))
+    cache = get_index_cache(directory)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_index_cache_requires_filename(document: Path, tmp_path: Path) -> None:
+    with open(document, "rb") as f:
+        with pytest.raises(ValueError):
+            PSDImage.open(f, index_cache=tmp_path / "index")
+    with pytest.raises(ValueError):
+        PSDImage.open(document, index_cache=tmp_path / "index", mmap=True)
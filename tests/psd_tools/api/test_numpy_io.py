@@ -1,11 +1,13 @@
 import logging
 import os
+from typing import Any
 
 import numpy as np
 import pytest
 
 from psd_tools.api import numpy_io
 from psd_tools.api.psd_image import PSDImage
+from psd_tools.compression import set_decode_workers
 from psd_tools.psd.patterns import Pattern
 
 from ..utils import TEST_ROOT, full_name
@@ -40,5 +42,115 @@ def test_numpy_colormodes(colormode: str, depth: int) -> None:
     filename = "colormodes/4x4_%gbit_%s.psd" % (depth, colormode)
     psd = PSDImage.open(full_name(filename))
     assert isinstance(psd.numpy(), np.ndarray)
+    assert psd.numpy().shape[:2] == (psd.height, psd.width)
     for layer in psd:
         assert isinstance(layer.numpy(), (np.ndarray, type(None)))
+
+
+@pytest.mark.parametrize("filename", ["16bit5x5.psd", "clipping-mask.psd", "masks.psd"])
+def test_numpy_decode_workers(filename: str) -> None:
+    psd = PSDImage.open(full_name(filename))
+    layers = list(psd.descendants())
+    expected = [(layer.numpy(), layer.numpy("mask")) for layer in layers]
+    images = [layer.topil() for layer in layers]
+    set_decode_workers(4)
+    try:
+        for layer, arrays, image in zip(layers, expected, images):
+            for channel, array in zip((None, "mask"), arrays):
+                result = layer.numpy(channel)
+                if array is None:
+                    assert result is None
+                else:
+                    assert result is not None
+                    assert np.array_equal(result, array)
+            result_image = layer.topil()
+            if image is None:
+                assert result_image is None
+            else:
+                assert result_image is not None
+                assert result_image.tobytes() == image.tobytes()
+    finally:
+        set_decode_workers(1)
+
+
+@pytest.mark.parametrize(
+    "filename, dtype",
+    [
+        ("colormodes/4x4_8bit_rgba.psd", np.uint8),
+        ("16bit5x5.psd", np.uint16),
+        ("32bit5x5.psd", np.float32),
+    ],
+)
+def test_numpy_dtype(filename: str, dtype: Any) -> None:
+    psd = PSDImage.open(full_name(filename))
+    scale = np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else 1
+    for layer in psd.descendants():
+        for channel in (None, "shape", "mask"):
+            expected = layer.numpy(channel)
+            array = layer.numpy(channel, dtype=dtype)
+            if expected is None:
+                assert array is None
+                continue
+            assert array is not None
+            assert array.dtype == dtype
+            assert np.allclose(array / scale, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["colormodes/4x4_8bit_rgba.psd", "16bit5x5.psd", "32bit5x5.psd", "masks.psd"],
+)
+@pytest.mark.parametrize("viewport", [(1, 1, 3, 4), (-2, 2, 100, 100), (0, 0, 1, 1)])
+def test_numpy_viewport(filename: str, viewport: tuple[int, int, int, int]) -> None:
+    psd = PSDImage.open(full_name(filename))
+    x0, y0, x1, y1 = viewport
+    for channel in (None, "color", "shape"):
+        expected = psd.numpy(channel)[max(y0, 0) : y1, max(x0, 0) : x1]
+        assert np.array_equal(psd.numpy(channel, viewport=viewport), expected)
+
+    for layer in psd.descendants():
+        for channel in (None, "shape", "mask"):
+            full = layer.numpy(channel)
+            array = layer.numpy(channel, viewport=viewport)
+            if full is None:
+                assert array is None
+                continue
+            if channel == "mask":
+                assert layer.mask is not None
+                left, top = layer.mask.left, layer.mask.top
+            else:
+                left, top = layer.left, layer.top
+            expected = full[
+                max(y0 - top, 0) : max(y1 - top, 0),
+                max(x0 - left, 0) : max(x1 - left, 0),
+            ]
+            if expected.size == 0:
+                assert array is None
+            else:
+                assert array is not None
+                assert np.array_equal(array, expected)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "colormodes/4x4_1bit_bitmap.psd",
+        "colormodes/4x4_8bit_index_color.psd",
+        "colormodes/4x4_8bit_rgba.psd",
+        "16bit5x5.psd",
+        "32bit5x5.psd",
+        "masks.psd",
+    ],
+)
+@pytest.mark.parametrize("load_pixels", [True, False])
+def test_psd_iter_rows(filename: str, load_pixels: bool) -> None:
+    psd = PSDImage.open(full_name(filename), load_pixels=load_pixels)
+    bands = list(psd.iter_rows(band_height=3))
+    assert all(band.shape[0] <= 3 for band in bands)
+    assert np.array_equal(np.concatenate(bands), psd.numpy())
+
+
+def test_numpy_viewport_outside() -> None:
+    psd = PSDImage.open(full_name("colormodes/4x4_8bit_rgba.psd"))
+    with pytest.raises(ValueError):
+        psd.numpy(viewport=(4, 0, 8, 4))
@@ -1,18 +1,22 @@
+import io
 import logging
 import pprint
 from pathlib import Path
 from typing import Any, Tuple, Union
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from PIL import Image
 
-from psd_tools.api.layers import Group
+from psd_tools.api.layers import Group, SmartObjectLayer
 from psd_tools.api.psd_image import PSDImage
 from psd_tools.api.utils import get_transparency_index, has_transparency
+from psd_tools.compression import CompressionPolicy
 from psd_tools.constants import BlendMode, ColorMode, Compression
+from psd_tools.psd.bin_utils import FileSlice
 
-from ..utils import full_name
+from ..utils import UnseekableBytesIO, full_name
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +60,174 @@ def test_open(filename: Union[str, Path]) -> None:
         PSDImage.open(f)
 
 
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "colormodes/4x4_8bit_rgb.psd",
+        "colormodes/4x4_16bit_rgb.psd",
+        "layers/smartobject-layer.psd",
+        "gray0.psb",
+    ],
+)
+def test_open_mmap(filename: str, tmp_path: Path) -> None:
+    input_path = full_name(filename)
+    expected = PSDImage.open(input_path)
+    psd = PSDImage.open(input_path, mmap=True)
+    assert isinstance(psd._record.image_data.data, memoryview)
+    assert np.array_equal(psd.numpy(), expected.numpy())
+    for layer, expected_layer in zip(psd.descendants(), expected.descendants()):
+        assert all(isinstance(c.data, memoryview) for c in layer._channels)
+        if expected_layer.has_pixels():
+            assert np.array_equal(layer.numpy(), expected_layer.numpy())  # type: ignore[arg-type]
+
+    with open(input_path, "rb") as f:
+        psd = PSDImage.open(f, mmap=True)
+    output_path = tmp_path / "output.psd"
+    psd.save(output_path)
+    assert output_path.read_bytes() == expected._record.tobytes()
+
+
+def test_open_mmap_smart_object() -> None:
+    psd = PSDImage.open(full_name("layers/smartobject-layer.psd"), mmap=True)
+    layer = psd[0]
+    assert isinstance(layer, SmartObjectLayer)
+    smart_object = layer.smart_object
+    assert isinstance(smart_object.data, bytes)
+    assert smart_object.filesize == len(smart_object.data)
+
+
+def test_open_mmap_save_over_source(tmp_path: Path) -> None:
+    path = tmp_path / "input.psd"
+    path.write_bytes(Path(full_name("colormodes/4x4_8bit_rgb.psd")).read_bytes())
+    data = path.read_bytes()
+    psd = PSDImage.open(path, mmap=True)
+    with pytest.raises(ValueError, match="Cannot save over"):
+        psd.save(path)
+    assert path.read_bytes() == data
+    psd.save(tmp_path / "output.psd")
+
+
+def test_open_mmap_requires_file() -> None:
+    with open(full_name("colormodes/4x4_8bit_rgb.psd"), "rb") as f:
+        data = f.read()
+    with pytest.raises(ValueError):
+        PSDImage.open(io.BytesIO(data), mmap=True)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "layers/smartobject-layer.psd",
+        "layers/type-layer.psd",
+        "effects/effects-enabled.psd",
+        "colormodes/4x4_16bit_rgb.psd",
+    ],
+)
+def test_open_lazy(filename: str) -> None:
+    expected = PSDImage.open(full_name(filename))
+    psd = PSDImage.open(full_name(filename), lazy=True)
+    assert psd._record.tobytes() == expected._record.tobytes()
+    for layer, expected_layer in zip(psd.descendants(), expected.descendants()):
+        assert layer.name == expected_layer.name
+        assert layer.kind == expected_layer.kind
+        assert layer.bbox == expected_layer.bbox
+    assert np.array_equal(psd.composite(), expected.composite())  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "layers/pixel-layer.psd",
+        "layers/smartobject-layer.psd",
+        "colormodes/4x4_16bit_rgb.psd",
+        "gray0.psb",
+    ],
+)
+def test_open_structure_only(filename: str, tmp_path: Path) -> None:
+    input_path = full_name(filename)
+    expected = PSDImage.open(input_path)
+    psd = PSDImage.open(input_path, load_pixels=False)
+    assert isinstance(psd._record.image_data._data, FileSlice)
+    for layer, expected_layer in zip(psd.descendants(), expected.descendants()):
+        assert layer.name == expected_layer.name
+        assert layer.bbox == expected_layer.bbox
+        assert layer.has_pixels() == expected_layer.has_pixels()
+        if expected_layer.has_pixels():
+            assert np.array_equal(layer.numpy(), expected_layer.numpy())  # type: ignore[arg-type]
+    assert np.array_equal(psd.numpy(), expected.numpy())
+
+    output_path = tmp_path / "output.psd"
+    psd.save(output_path)
+    assert output_path.read_bytes() == expected._record.tobytes()
+
+
+class _CountingReader(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.mark.parametrize(
+    "filename", ["layers/pixel-layer.psd", "colormodes/4x4_16bit_rgb.psd"]
+)
+def test_layer_channel_index(filename: str) -> None:
+    with open(full_name(filename), "rb") as f:
+        data = f.read()
+    expected = PSDImage.open(io.BytesIO(data))
+    with _CountingReader(data) as f:
+        psd = PSDImage.open(f, load_pixels=False)
+        for layer, expected_layer in zip(psd.descendants(), expected.descendants()):
+            assert layer.channel_index == expected_layer.channel_index
+            if not layer.has_pixels():
+                continue
+            f.bytes_read = 0
+            assert np.array_equal(layer.numpy(), expected_layer.numpy())  # type: ignore[arg-type]
+            assert f.bytes_read == sum(c.length - 2 for c in layer.channel_index)
+
+
+def test_save_unseekable() -> None:
+    input_path = full_name("layers/pixel-layer.psd")
+    psd = PSDImage.open(input_path, load_pixels=False)
+    with UnseekableBytesIO() as f:
+        psd.save(f)
+        output = f.getvalue()
+    with open(input_path, "rb") as f:
+        assert output == f.read()
+
+
+def test_save_incremental(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.psd"
+    input_path.write_bytes(Path(full_name("layers/smartobject-layer.psd")).read_bytes())
+    expected = PSDImage.open(input_path)
+    psd = PSDImage.open(input_path, incremental=True)
+    layer = psd[0]
+    assert isinstance(layer._channels[0]._data, FileSlice)
+    tagged_blocks = psd._record.layer_and_mask_information.tagged_blocks
+    assert tagged_blocks is not None
+    assert all(
+        isinstance(block.data, FileSlice) for block in tagged_blocks._items.values()
+    )
+    layer.name = "Renamed"
+    assert not psd.is_updated()
+
+    output_path = tmp_path / "output.psd"
+    psd.save(output_path)
+    output = PSDImage.open(output_path)
+    assert isinstance(output[0], SmartObjectLayer)
+    assert isinstance(expected[0], SmartObjectLayer)
+    assert output[0].name == "Renamed"
+    assert output[0].smart_object.data == expected[0].smart_object.data
+    assert np.array_equal(output.numpy(), expected.numpy())
+    assert np.array_equal(output[0].numpy(), expected[0].numpy())  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError):
+        psd.save(input_path)
+    assert input_path.read_bytes() == expected._record.tobytes()
+
+
 def test_save(fixture: PSDImage, tmp_path: Path) -> None:
     output_path = tmp_path / "output.psd"
     fixture.save(str(output_path))
@@ -148,6 +320,36 @@ def test_create_pixel_layer() -> None:
     assert psdimage[0] is layer
 
 
+def test_create_pixel_layer_compression_policy(tmp_path: Path) -> None:
+    image = Image.linear_gradient("L").convert("RGB")
+    psdimage = PSDImage.new(mode="RGB", size=image.size)
+    psdimage.create_pixel_layer(image, compression=Compression.ZIP)
+    policy = CompressionPolicy(level=1, workers=2)
+    layer = psdimage.create_pixel_layer(
+        image,
+        compression=Compression.ZIP_WITH_PREDICTION,
+        compression_policy=policy,
+    )
+    assert all(
+        channel.compression == Compression.ZIP_WITH_PREDICTION
+        for channel in layer._channels
+    )
+    output = tmp_path / "output.psd"
+    psdimage.save(output, compression_policy=policy)
+    arrays = [psdimage[0].numpy(), layer.numpy(), PSDImage.open(output)[1].numpy()]
+    assert all(np.array_equal(array, arrays[0]) for array in arrays)  # type: ignore[arg-type]
+
+
+def test_create_pixel_layer_auto_compression() -> None:
+    image = Image.linear_gradient("L").rotate(90).convert("RGB")
+    psdimage = PSDImage.new(mode="RGB", size=image.size)
+    layer = psdimage.create_pixel_layer(image, compression=Compression.AUTO)
+    compressions = [channel.compression for channel in layer._channels]
+    assert compressions[0] == Compression.RLE  # Opaque transparency channel.
+    assert set(compressions[1:]) == {Compression.ZIP_WITH_PREDICTION}
+    assert layer.topil().convert("RGB").tobytes() == image.tobytes()  # type: ignore[union-attr]
+
+
 def test_create_group() -> None:
     psdimage = PSDImage.new(mode="RGB", size=(100, 100))
     layer_list = [
@@ -1,4 +1,6 @@
+import io
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any, Optional
 
 import numpy as np
@@ -7,7 +9,8 @@ import pytest
 from psd_tools.api.layers import GroupMixin
 from psd_tools.api.psd_image import PSDImage
 from psd_tools.composite import composite
-from psd_tools.constants import CompatibilityMode
+from psd_tools.composite.composite import Compositor
+from psd_tools.constants import BlendMode, CompatibilityMode
 from PIL import Image
 
 from ..utils import full_name
@@ -226,6 +229,133 @@ def test_composite_viewport() -> None:
     assert composite(psd[0], viewport=bbox)[1].shape == shape
 
 
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "clipping-mask.psd",
+        "mask.psd",
+        "opacity-fill.psd",
+        "transparency/knockout-isolated-groups.psd",
+        "effect-stroke-gradient.psd",
+        "colormodes/4x4_8bit_grayscale.psd",
+    ],
+)
+@pytest.mark.parametrize("tile_size", [(16, 16), (100, 7)])
+def test_composite_tiles(filename: str, tile_size: tuple[int, int]) -> None:
+    psd = PSDImage.open(full_name(filename))
+    for viewport in (None, (3, 5, 40, 30)):
+        expected = composite(psd, viewport=viewport)
+        result = composite(psd, viewport=viewport, tile_size=tile_size)
+        for x, y in zip(expected, result):
+            assert x.shape == y.shape
+            assert np.allclose(x, y, atol=1e-6)
+
+
+def test_composite_tiles_pil() -> None:
+    psd = PSDImage.open(full_name("clipping-mask.psd"))
+    expected = psd.composite(ignore_preview=True)
+    result = psd.composite(ignore_preview=True, tile_size=(64, 64))
+    assert np.array_equal(np.asarray(expected), np.asarray(result))
+    with pytest.raises(ValueError):
+        psd.composite(ignore_preview=True, tile_size=(0, 64))
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "clipping-mask.psd",
+        "masks.psd",
+        "opacity-fill.psd",
+        "transparency/knockout-isolated-groups.psd",
+        "effect-stroke-gradient.psd",
+        "layer_effects.psd",
+    ],
+)
+@pytest.mark.parametrize("color, alpha", [(1.0, 0.0), (0.0, 0.0), (0.5, 1.0)])
+def test_composite_local(
+    filename: str, color: float, alpha: float, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    psd = PSDImage.open(full_name(filename))
+    result = composite(psd, color=color, alpha=alpha)
+    monkeypatch.setattr(Compositor, "_local_region", lambda self, layer: None)
+    expected = composite(psd, color=color, alpha=alpha)
+    for x, y in zip(expected, result):
+        assert x.shape == y.shape
+        assert np.allclose(x, y, atol=1e-6)
+
+
+def test_composite_in_place() -> None:
+    color = np.random.default_rng(0).random((4, 4, 3), dtype=np.float32)
+    shape = np.full((4, 4, 1), 0.5, dtype=np.float32)
+    sources = (color.copy(), shape.copy(), shape.copy())
+    compositor = Compositor((0, 0, 4, 4), color=0.3, alpha=0.5)
+    compositor._apply_source(*sources, blend_mode=BlendMode.MULTIPLY)
+    for x, y in zip(sources, (color, shape, shape)):
+        assert np.array_equal(x, y)
+    expected = 0.5 * 0.5 * 0.3 + 0.5 * (0.5 * color + 0.5 * 0.3 * color)
+    assert np.allclose(compositor._alpha, 0.75)
+    assert np.allclose(compositor._color * compositor._alpha, expected)
+
+
+@pytest.mark.parametrize(
+    "filename", ["clipping-mask.psd", "transparency/knockout-isolated-groups.psd"]
+)
+def test_composite_workers(filename: str) -> None:
+    psd = PSDImage.open(full_name(filename))
+    expected = composite(psd)
+    results = [composite(psd, workers=3, tile_size=(16, 16))]
+    with ThreadPoolExecutor(2) as executor:
+        results.append(composite(psd, executor=executor))
+    with ProcessPoolExecutor(2) as executor:
+        results.append(composite(psd, executor=executor, tile_size=(32, 8)))
+        group = next(layer for layer in psd.descendants() if layer.is_group())
+        for x, y in zip(
+            composite(group, tile_size=(32, 8)),
+            composite(group, executor=executor, tile_size=(32, 8)),
+        ):
+            assert np.array_equal(x, y)
+    for result in results:
+        for x, y in zip(expected, result):
+            assert x.shape == y.shape
+            assert np.allclose(x, y, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        composite(psd, workers=0)
+
+
+@pytest.mark.parametrize("filename", ["clipping-mask.psd", "opacity-fill.psd"])
+def test_composite_workers_load_pixels(filename: str) -> None:
+    expected = composite(PSDImage.open(full_name(filename)))
+    with open(full_name(filename), "rb") as f:
+        psd = PSDImage.open(f, load_pixels=False)
+        for _ in range(3):
+            result = composite(psd, workers=8, tile_size=(7, 5))
+            for x, y in zip(expected, result):
+                assert np.array_equal(x, y)
+
+
+def test_composite_workers_reference() -> None:
+    with open(full_name("clipping-mask.psd"), "rb") as f:
+        psd = PSDImage.open(io.BytesIO(f.read()))
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            composite(psd, executor=executor)
+        psd = PSDImage.open(full_name("clipping-mask.psd"))
+        psd[0].visible = not psd[0].visible
+        with pytest.raises(ValueError):
+            composite(psd, executor=executor)
+
+        # Pixel edits do not mark the layer tree as updated.
+        psd = PSDImage.open(full_name("clipping-mask.psd"))
+        layer = next(layer for layer in psd.descendants() if layer.kind == "pixel")
+        channel = layer._channels[1]
+        data = channel.get_data(layer.width, layer.height, psd.depth)
+        channel.set_data(bytes(255 - b for b in data), layer.width, layer.height, 8)
+        assert not psd.is_updated()
+        with pytest.raises(ValueError):
+            composite(psd, executor=executor)
+
+
 @pytest.mark.parametrize(
     "colormode, depth, mode, ignore_preview, apply_icc",
     [
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from psd_tools.api.psd_image import PSDImage
+from psd_tools.composite import composite
+from psd_tools.composite.render_cache import RenderCache
+
+from ..utils import full_name
+
+
+def assert_composite_equal(psd: PSDImage, **kwargs: object) -> None:
+    result = composite(psd, **kwargs)  # type: ignore[arg-type]
+    cache, psd._render_cache = psd._render_cache, None
+    try:
+        expected = composite(psd, **kwargs)  # type: ignore[arg-type]
+    finally:
+        psd._render_cache = cache
+    for x, y in zip(expected, result):
+        assert np.array_equal(x, y)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "clipping-mask.psd",
+        "opacity-fill.psd",
+        "transparency/knockout-isolated-groups.psd",
+    ],
+)
+def test_render_cache_document(filename: str) -> None:
+    cache = RenderCache()
+    psd = PSDImage.open(full_name(filename), render_cache=cache)
+    for kwargs in ({}, {}, {"color": 0.5, "alpha": 1.0}):
+        assert_composite_equal(psd, **kwargs)
+    assert cache.hits > 0
+
+    for layer in psd.descendants():
+        layer.visible = not layer.visible
+        assert_composite_equal(psd)
+        layer.visible = not layer.visible
+    assert_composite_equal(psd)
+
+
+def test_render_cache_incremental() -> None:
+    cache = RenderCache()
+    psd = PSDImage.open(full_name("clipping-mask.psd"), render_cache=cache)
+    composite(psd)
+    misses = cache.misses
+
+    # Only the edited layer and the groups that contain it are rendered.
+    layer = [layer for layer in psd.descendants() if layer.kind == "pixel"][-1]
+    channel = layer._channels[1]
+    data = channel.get_data(layer.width, layer.height, psd.depth)
+    channel.set_data(bytes(255 - b for b in data), layer.width, layer.height, 8)
+    assert_composite_equal(psd)
+    dirty = [layer]
+    while dirty[-1].parent is not psd:
+        dirty.append(dirty[-1].parent)  # type: ignore[arg-type]
+    assert len(dirty) > 1
+    assert cache.misses - misses == len(dirty)
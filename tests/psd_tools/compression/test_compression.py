@@ -1,18 +1,32 @@
+import gc
 import logging
+import os
+import threading
+import tracemalloc
 import warnings
+import weakref
 import zlib
+from typing import Iterator
 
+import numpy as np
 import pytest
 
+from psd_tools import compression
 from psd_tools.compression import (
+    CompressionPolicy,
     PSDDecompressionWarning,
     compress,
+    decode_map,
     decode_prediction,
     decode_rle,
     decompress,
+    decompress_into,
     encode_prediction,
     encode_rle,
+    get_decode_workers,
     rle_impl,
+    select_compression,
+    set_decode_workers,
 )
 from psd_tools.constants import Compression
 
@@ -24,6 +38,7 @@ RAW_IMAGE_2x2_32bit = (
     b"\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x04"
 )
 EDGE_CASE_1 = b"\xf9\xfa\xf4\xff\xff\xb8\xbc\xff\x96-\xe5\xf5\xb5\xd4\xff\xc2?\x95\xff\xc8\x96\xff\xff\xdav\xe4\xff\xa5\xd5\xff\xf9\xdb\xe3\xff\xf6\xc8\xe8\xff\xfa\xce\xd2\xff\xd4v\xe9\xff\x9fz\xee\xe9b\x95\xff\xbd6\xac\xff\xc6\x82\xd8\xffa\x1c\xec\xff\xf3\xe5\xe9\xf2iD\xff\xff\xdc\xfc\xf1\x94\xc6\xff\xd9\x1e:\xff\xffd\x86\xff\xcb\x1ap\xfe\xd7\\\x90\xff\xbd\xa1\xff\xde\x00z\xff\x96\x1c\xb7\xff\xc3w\xe3\xdd\x1d\x1f\xfd\xff\xd1\x82\xf3\x8e\x040\xf3\x98\x06\xa5\xa2t"
+STORED_COMPRESSIONS = [kind for kind in Compression if kind != Compression.AUTO]
 
 
 @pytest.mark.parametrize(
@@ -32,6 +47,9 @@ EDGE_CASE_1 = b"\xf9\xfa\xf4\xff\xff\xb8\xbc\xff\x96-\xe5\xf5\xb5\xd4\xff\xc2?\x
         (bytes(bytearray(range(256))), 128, 2, 8),
         (bytes(bytearray(range(256))), 64, 2, 16),
         (bytes(bytearray(range(256))), 32, 2, 32),
+        (bytes(bytearray(range(255))), 17, 15, 8),
+        (bytes(bytearray(range(240))), 8, 15, 16),
+        (bytes(bytearray(range(240))), 4, 15, 32),
     ],
 )
 def test_prediction(fixture: bytes, width: int, height: int, depth: int) -> None:
@@ -40,6 +58,36 @@ def test_prediction(fixture: bytes, width: int, height: int, depth: int) -> None
     assert fixture == decoded
 
 
+@pytest.mark.parametrize(
+    "data, width, height, depth, expected",
+    [
+        # Row-wise differences wrap modulo 2**8.
+        (b"\x01\x02\x04\xff\x00\x01", 3, 2, 8, b"\x01\x01\x02\xff\x01\x01"),
+        # 16-bit samples are big-endian and wrap modulo 2**16.
+        (
+            b"\x00\x01\x01\x00\xff\xff\x00\x00",
+            2,
+            2,
+            16,
+            b"\x00\x01\x00\xff\xff\xff\x00\x01",
+        ),
+        # 32-bit samples are split into byte planes before the delta.
+        (
+            b"\x00\x01\x02\x03\x04\x05\x06\x07",
+            2,
+            1,
+            32,
+            b"\x00\x04\xfd\x04\xfd\x04\xfd\x04",
+        ),
+    ],
+)
+def test_prediction_encoded_layout(
+    data: bytes, width: int, height: int, depth: int, expected: bytes
+) -> None:
+    assert encode_prediction(data, width, height, depth) == expected
+    assert decode_prediction(expected, width, height, depth) == data
+
+
 @pytest.mark.parametrize(
     "fixture, width, height, depth, version",
     [
@@ -246,10 +294,328 @@ def test_decompress_corrupted_zlib_emits_warning(kind: Compression) -> None:
 def test_decompress_length_mismatch_raises() -> None:
     """A decompressed payload of wrong length must raise ValueError (integrity check).
 
-    Only ZIP is tested here: for ZIP_WITH_PREDICTION a short payload crashes
-    inside decode_prediction (IndexError) before reaching the length check.
+    Only ZIP is tested here: for ZIP_WITH_PREDICTION a short payload cannot be
+    reshaped into rows, see the fallback test below.
     """
     # Compress 5 bytes but declare a 3×3=9 pixel channel.
     short_data = zlib.compress(b"\x00" * 5)
     with pytest.raises(ValueError, match="Decompressed length mismatch"):
         decompress(short_data, Compression.ZIP, width=3, height=3, depth=8)
+
+
+def test_decompress_prediction_short_payload_falls_back_to_black() -> None:
+    """A short ZIP_WITH_PREDICTION payload degrades to black with a warning."""
+    short_data = zlib.compress(b"\x00" * 5)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = decompress(
+            short_data, Compression.ZIP_WITH_PREDICTION, width=3, height=3, depth=8
+        )
+    assert result == b"\x00" * 9
+    assert any(issubclass(w.category, PSDDecompressionWarning) for w in caught)
+
+
+@pytest.fixture
+def decode_workers() -> Iterator[None]:
+    yield
+    set_decode_workers(1)
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_decode_rle_bands(
+    version: int, decode_workers: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    width, height = 61, 37
+    data = bytes(i * 7 // 5 % 256 for i in range(width * height))
+    encoded = encode_rle(data, width, height, 8, version)
+    truncated = encoded[: len(encoded) * 2 // 3]
+    expected = decode_rle(truncated, width, height, 8, version)
+
+    monkeypatch.setattr(compression, "_MIN_BAND_BYTES", 64)
+    set_decode_workers(4)
+    assert get_decode_workers() == 4
+    assert decode_rle(encoded, width, height, 8, version) == data
+    assert decode_rle(truncated, width, height, 8, version) == expected
+
+
+def test_set_decode_workers(decode_workers: None) -> None:
+    with pytest.raises(ValueError):
+        set_decode_workers(0)
+    set_decode_workers(None)
+    assert get_decode_workers() == (os.cpu_count() or 1)
+
+    set_decode_workers(2)
+    nested = decode_map(lambda i: decode_map(lambda j: i * j, range(3)), range(4))
+    assert nested == [[i * j for j in range(3)] for i in range(4)]
+
+
+def test_set_decode_workers_concurrent(decode_workers: None) -> None:
+    set_decode_workers(2)
+    stop = threading.Event()
+
+    def resize() -> None:
+        workers = 2
+        while not stop.is_set():
+            workers = 5 - workers
+            set_decode_workers(workers)
+
+    thread = threading.Thread(target=resize)
+    thread.start()
+    try:
+        for _ in range(2000):
+            assert decode_map(lambda i: i * 2, range(8)) == list(range(0, 16, 2))
+    finally:
+        stop.set()
+        thread.join()
+
+
+@pytest.mark.parametrize(
+    "data, width, height, depth",
+    [
+        (RAW_IMAGE_3x3_8bit, 3, 3, 8),
+        (RAW_IMAGE_2x2_16bit, 2, 2, 16),
+        (RAW_IMAGE_2x2_32bit, 2, 2, 32),
+    ],
+)
+@pytest.mark.parametrize("kind", STORED_COMPRESSIONS)
+@pytest.mark.parametrize("byteorder", ["=", ">"])
+def test_decompress_into(
+    data: bytes, width: int, height: int, depth: int, kind: Compression, byteorder: str
+) -> None:
+    dtype = np.dtype(byteorder + {8: "u1", 16: "u2", 32: "f4"}[depth])
+    compressed = compress(data, kind, width, height, depth, 2)
+    out = np.empty((height, width), dtype)
+    assert decompress_into(out, compressed, kind, width, height, depth, 2) is out
+    expected = np.frombuffer(data, dtype.newbyteorder(">")).reshape((height, width))
+    assert np.array_equal(out, expected)
+
+
+@pytest.mark.parametrize(
+    "out",
+    [
+        np.empty((2, 2), np.uint16),
+        np.empty((2, 3), np.uint8),
+        np.empty((2, 4), np.uint8)[:, ::2],
+    ],
+)
+def test_decompress_into_invalid_output(out: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        decompress_into(out, b"\x00" * 4, Compression.RAW, 2, 2, 8)
+
+
+@pytest.mark.parametrize(
+    "kind, data",
+    [
+        (Compression.RLE, b"\x00\x02\x01"),
+        (Compression.ZIP, b"\x00\x01\x02"),
+        (Compression.ZIP_WITH_PREDICTION, b"\x00\x01\x02"),
+    ],
+)
+def test_decompress_into_failure(kind: Compression, data: bytes) -> None:
+    out = np.full((2, 2), 7, np.uint8)
+    with pytest.warns(PSDDecompressionWarning):
+        decompress_into(out, data, kind, 2, 2, 8)
+    assert not out.any()
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_decompress_rle_rows_memoryview(version: int) -> None:
+    width, height = 1000, 1000
+    rng = np.random.RandomState(0)
+    raw = rng.randint(0, 4, (height, width)).astype(np.uint8).tobytes()
+    compressed = memoryview(compress(raw, Compression.RLE, width, height, 8, version))
+    tracemalloc.start()
+    try:
+        result = decompress(
+            compressed, Compression.RLE, width, height, 8, version, rows=(100, 101)
+        )
+        out = np.empty((1, width), np.uint8)
+        decompress_into(
+            out, compressed, Compression.RLE, width, height, 8, version, rows=(7, 8)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert result == raw[100 * width : 101 * width]
+    assert out.tobytes() == raw[7 * width : 8 * width]
+    # The row count table is parsed without copying the whole channel.
+    assert peak < len(compressed) // 4
+
+
+def test_decompress_into_length_mismatch() -> None:
+    out = np.empty((2, 2), np.uint8)
+    with pytest.raises(ValueError):
+        decompress_into(out, b"\x00\x01", Compression.RAW, 2, 2, 8)
+    with pytest.raises(ValueError):
+        decompress_into(out, zlib.compress(b"\x00"), Compression.ZIP, 2, 2, 8)
+
+
+@pytest.mark.parametrize(
+    "data, width, height, depth",
+    [
+        (RAW_IMAGE_3x3_8bit, 3, 3, 8),
+        (RAW_IMAGE_2x2_16bit, 2, 2, 16),
+        (RAW_IMAGE_2x2_32bit, 2, 2, 32),
+    ],
+)
+@pytest.mark.parametrize("kind", STORED_COMPRESSIONS)
+@pytest.mark.parametrize("version", [1, 2])
+def test_decompress_rows(
+    data: bytes, width: int, height: int, depth: int, kind: Compression, version: int
+) -> None:
+    compressed = compress(data, kind, width, height, depth, version)
+    row_size = width * depth // 8
+    for start in range(height + 1):
+        for stop in range(start, height + 1):
+            rows = (start, stop)
+            expected = data[start * row_size : stop * row_size]
+            decoded = decompress(
+                compressed, kind, width, height, depth, version, rows=rows
+            )
+            assert decoded == expected
+            out = np.empty(
+                (stop - start, width), {8: "u1", 16: ">u2", 32: ">f4"}[depth]
+            )
+            decompress_into(
+                out, compressed, kind, width, height, depth, version, rows=rows
+            )
+            assert out.tobytes() == expected
+
+
+@pytest.mark.parametrize("rows", [(-1, 1), (2, 1), (0, 4)])
+def test_decompress_invalid_rows(rows: tuple[int, int]) -> None:
+    with pytest.raises(ValueError):
+        decompress(RAW_IMAGE_3x3_8bit, Compression.RAW, 3, 3, 8, rows=rows)
+
+
+def test_decompress_rows_1bit_raises() -> None:
+    with pytest.raises(ValueError):
+        decompress(b"\x00\x00", Compression.RAW, 8, 2, 1, rows=(0, 1))
+
+
+@pytest.mark.parametrize("level", [-1, 0, 1, 9])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_compression_policy_deflate(level: int, workers: int) -> None:
+    data = np.arange(3 * 1024 * 1024 + 5, dtype=np.uint32).astype(np.uint8).tobytes()
+    policy = CompressionPolicy(level=level, workers=workers)
+    deflated = policy.deflate(data)
+    assert zlib.decompress(deflated) == data
+    if workers == 1:
+        assert deflated == zlib.compress(data, level)
+
+
+@pytest.mark.parametrize("kind", [Compression.ZIP, Compression.ZIP_WITH_PREDICTION])
+def test_compress_policy(kind: Compression) -> None:
+    policy = CompressionPolicy(level=1, workers=2)
+    compressed = compress(RAW_IMAGE_3x3_8bit, kind, 3, 3, 8, policy=policy)
+    assert decompress(compressed, kind, 3, 3, 8) == RAW_IMAGE_3x3_8bit
+
+
+def test_compression_policy_map() -> None:
+    policy = CompressionPolicy(workers=2)
+    nested = policy.map(lambda i: policy.map(lambda j: i * j, range(3)), range(4))
+    assert nested == [[i * j for j in range(3)] for i in range(4)]
+
+
+def test_compression_policy_map_executor() -> None:
+    policy = CompressionPolicy(workers=2)
+    assert policy.map(str, range(4)) == ["0", "1", "2", "3"]
+    executor = policy._executor
+    assert executor is not None
+    policy.map(str, range(4))
+    assert policy._executor is executor
+
+    # A replaced pool is not kept alive by a finalizer of the policy.
+    policy.workers = 3
+    policy.map(str, range(4))
+    assert policy._executor is not executor
+    replaced = weakref.ref(executor)
+    del executor
+    gc.collect()
+    assert replaced() is None
+
+    executor = policy._executor
+    policy.shutdown()
+    assert policy._executor is None
+    assert executor._shutdown
+
+    policy.map(str, range(4))
+    executor = policy._executor
+    del policy
+    gc.collect()
+    assert executor._shutdown
+
+
+def test_compression_policy_map_concurrent() -> None:
+    policy = CompressionPolicy(workers=2)
+    stop = threading.Event()
+
+    def resize() -> None:
+        while not stop.is_set():
+            policy.workers = 5 - policy.workers
+
+    thread = threading.Thread(target=resize)
+    thread.start()
+    try:
+        for _ in range(2000):
+            assert policy.map(lambda i: i * 2, range(8)) == list(range(0, 16, 2))
+    finally:
+        stop.set()
+        thread.join()
+    policy.shutdown()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"level": 10},
+        {"level": -2},
+        {"workers": 0},
+        {"backend": "unknown"},
+        {"objective": "unknown"},
+    ],
+)
+def test_compression_policy_invalid(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        CompressionPolicy(**kwargs)
+
+
+@pytest.mark.parametrize("backend", ["auto", "isal", "zlib-ng", "zlib"])
+def test_compression_policy_backend(backend: str) -> None:
+    # Backends that are not installed fall back to zlib.
+    policy = CompressionPolicy(backend=backend)
+    assert zlib.decompress(policy.deflate(RAW_IMAGE_3x3_8bit)) == RAW_IMAGE_3x3_8bit
+
+
+def _gradient(width: int, height: int) -> bytes:
+    return np.tile(np.arange(width, dtype=np.uint8), (height, 1)).tobytes()
+
+
+@pytest.mark.parametrize(
+    "data, objective, expected",
+    [
+        (b"\xff" * 64 * 64, "balanced", Compression.RLE),
+        (b"\xff" * 64 * 64, "speed", Compression.RLE),
+        (_gradient(64, 64), "size", Compression.ZIP_WITH_PREDICTION),
+        (_gradient(64, 64), "balanced", Compression.ZIP_WITH_PREDICTION),
+        (_gradient(64, 64), "speed", Compression.RAW),
+        (np.random.default_rng(0).bytes(64 * 64), "size", Compression.RAW),
+    ],
+)
+def test_select_compression(data: bytes, objective: str, expected: Compression) -> None:
+    policy = CompressionPolicy(objective=objective)
+    assert select_compression(data, 64, 64, 8, policy=policy) == expected
+
+
+@pytest.mark.parametrize("depth", [1, 8, 16, 32])
+def test_select_compression_depth(depth: int) -> None:
+    width, height = 64, 100
+    data = b"\x00" * ((width * depth + 7) // 8 * height)
+    assert select_compression(data, width, height, depth) == Compression.RLE
+
+
+def test_compression_auto_unresolved() -> None:
+    with pytest.raises(ValueError):
+        compress(RAW_IMAGE_3x3_8bit, Compression.AUTO, 3, 3, 8)
+    with pytest.raises(ValueError):
+        decompress(RAW_IMAGE_3x3_8bit, Compression.AUTO, 3, 3, 8)
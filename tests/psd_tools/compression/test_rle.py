@@ -1,5 +1,7 @@
+import array
 from typing import Any
 
+import numpy as np
 import pytest
 
 import psd_tools.compression._rle as _rle  # type: ignore[import-not-found]
@@ -52,3 +54,62 @@ def test_tolerant_decode(mod: Any, data: bytes, size: int, expected: bytes) -> N
     result = mod.decode(data, size)
     assert result == expected
     assert len(result) == size
+
+
+@pytest.mark.parametrize("mod", [rle, _rle])
+@pytest.mark.parametrize(
+    ("data, counts, size, expected"),
+    [
+        # Two rows, each decoded independently.
+        (b"\xfd\x01\x01\x02\x03", [2, 3], 4, b"\x01\x01\x01\x01\x02\x03\x00\x00"),
+        # The first row overflows and is clipped; it does not leak into the next.
+        (b"\x02\x01\x02\x03\xff\x04", [4, 2], 2, b"\x01\x02\x04\x04"),
+        # Truncated input: the last row is decoded from what is left.
+        (b"\xfd\x01\x02\x05", [2, 4], 3, b"\x01\x01\x01\x05\x00\x00"),
+        # Rows past the end of the input are zero-filled.
+        (b"\xff\x07", [2, 2, 2], 2, b"\x07\x07\x00\x00\x00\x00"),
+    ],
+)
+def test_decode_rows(
+    mod: Any, data: bytes, counts: list[int], size: int, expected: bytes
+) -> None:
+    out = bytearray(b"\xee" * len(expected))
+    mod.decode_rows(data, array.array("I", counts), size, out)
+    assert out == expected
+    assert b"".join(
+        mod.decode(data[sum(counts[:i]) : sum(counts[: i + 1])], size)
+        for i in range(len(counts))
+    ) == bytes(expected)
+
+
+@pytest.mark.parametrize("mod", [rle, _rle])
+def test_decode_rows_numpy(mod: Any) -> None:
+    rows = [mod.encode(RAW_IMAGE_3x3_8bit[i : i + 3]) for i in (0, 3)]
+    encoded, counts = b"".join(rows), array.array("I", map(len, rows))
+    out = np.empty((2, 3), dtype=np.uint8)
+    mod.decode_rows(encoded, counts, 3, out.reshape(-1))
+    assert out.tobytes() == RAW_IMAGE_3x3_8bit[:6]
+
+
+@pytest.mark.parametrize("mod", [rle, _rle])
+def test_decode_rows_small_output(mod: Any) -> None:
+    with pytest.raises(ValueError):
+        mod.decode_rows(b"\x00\x01", array.array("I", [2, 0]), 2, bytearray(3))
+
+
+@pytest.mark.parametrize("mod", [rle, _rle])
+@pytest.mark.parametrize("count_size", [2, 4])
+def test_encode_rows(mod: Any, count_size: int) -> None:
+    rows, size = 5, 40
+    data = (EDGE_CASE_1 * 2)[: rows * size - 7]  # The last row is short.
+    encoded = [rle.encode(data[i * size : (i + 1) * size]) for i in range(rows)]
+    counts = b"".join(len(row).to_bytes(count_size, "big") for row in encoded)
+    assert mod.encode_rows(data, rows, size, count_size) == counts + b"".join(encoded)
+
+
+@pytest.mark.parametrize("mod", [rle, _rle])
+def test_encode_rows_overflow(mod: Any) -> None:
+    data = bytes(range(256)) * 300
+    assert len(mod.encode_rows(data, 1, len(data), 4)) > 0xFFFF
+    with pytest.raises(ValueError):
+        mod.encode_rows(data, 1, len(data), 2)
@@ -1,19 +1,35 @@
+import errno
 import io
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import pytest
 
 from psd_tools.psd.bin_utils import (
+    BufferReader,
+    FileSlice,
+    SequentialWriter,
+    SizeCounter,
+    open_buffer,
     pack,
+    read_bytes,
     read_length_block,
+    read_length_buffer,
     read_pascal_string,
     read_unicode_string,
+    skip_bytes,
     unpack,
+    write_bytes,
     write_length_block,
     write_pascal_string,
     write_unicode_string,
 )
 
+from ..utils import UnseekableBytesIO
+
 
 @pytest.mark.parametrize(
     "fmt, value, expected",
@@ -50,6 +66,109 @@ def test_read_length_block() -> None:
         assert f.tell() == 12
 
 
+def test_read_length_buffer() -> None:
+    data = b"\x00\x00\x00\x07\x01\x01\x01\x01\x01\x01\x01\x00"
+    body = data[4:11]
+    with io.BytesIO(data) as f:
+        assert read_length_buffer(f, padding=2) == body
+        assert f.tell() == 12
+    with BufferReader(data) as f:
+        view = read_length_buffer(f, padding=2)
+        assert isinstance(view, memoryview)
+        assert view == body
+        assert f.tell() == 12
+    with BufferReader(data[:8]) as f:
+        with pytest.raises(IOError):
+            read_length_buffer(f)
+
+
+def test_buffer_reader() -> None:
+    data = bytearray(b"\x00\x01\x02\x03\x04\x05")
+    with BufferReader(data) as f:
+        assert f.read(2) == b"\x00\x01"
+        view = read_bytes(f, 3)
+        assert isinstance(view, memoryview)
+        assert view == b"\x02\x03\x04"
+        data[2] = 0xFF  # Slices share the underlying buffer.
+        assert view[0] == 0xFF
+        assert f.seek(-1, io.SEEK_CUR) == 4
+        assert f.read() == b"\x04\x05"
+        assert f.read(1) == b""
+        assert f.seek(-2, io.SEEK_END) == 4
+        assert bytes(read_bytes(f)) == b"\x04\x05"
+        with pytest.raises(ValueError):
+            f.seek(-1)
+    with io.BytesIO(bytes(data)) as f:
+        assert isinstance(read_bytes(f, 2), bytes)
+
+
+def test_open_buffer() -> None:
+    assert isinstance(open_buffer(b"\x00"), io.BytesIO)
+    with open_buffer(memoryview(b"\x00\x01")) as f:
+        assert isinstance(f, BufferReader)
+        assert f.read() == b"\x00\x01"
+
+
+def test_skip_bytes(tmp_path: Path) -> None:
+    data = b"\x00\x01\x02\x03\x04\x05"
+    with io.BytesIO(data) as f:
+        f.seek(1)
+        chunk = skip_bytes(f, 3)
+        assert isinstance(chunk, FileSlice)
+        assert (chunk.offset, len(chunk)) == (1, 3)
+        assert f.tell() == 4
+        assert chunk.read() == b"\x01\x02\x03"
+        assert f.tell() == 4
+        rest = skip_bytes(f)
+        assert isinstance(rest, FileSlice)
+        assert (rest.offset, len(rest)) == (4, 2)
+        assert len(skip_bytes(f, 10)) == 0
+    with pytest.raises(ValueError):
+        chunk.read()
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    with open(path, "rb") as f:
+        f.seek(2)
+        chunk = skip_bytes(f, 10)
+    assert isinstance(chunk, FileSlice)
+    assert len(chunk) == 4
+    assert chunk.read() == b"\x02\x03\x04\x05"
+    path.write_bytes(data[:3])
+    with pytest.raises(IOError):
+        chunk.read()
+
+    with BufferReader(data) as f:
+        assert isinstance(skip_bytes(f, 2), memoryview)
+
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_file_slice_threads(tmp_path: Path, buffered: bool) -> None:
+    data = os.urandom(1 << 16)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    with open(path, "rb") if buffered else io.BytesIO(data) as f:
+        f.seek(5)
+        chunks = [FileSlice(f, offset, 1000) for offset in range(0, 64000, 100)]
+        with ThreadPoolExecutor(8) as executor:
+            for _ in range(5):
+                results = list(executor.map(FileSlice.read, chunks))
+                assert results == [data[c.offset : c.offset + 1000] for c in chunks]
+        assert f.tell() == 5
+
+
+def test_file_slice_pickle(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"\x00\x01\x02\x03")
+    with open(path, "rb") as f:
+        chunk = FileSlice(f, 1, 2)
+        restored = pickle.loads(pickle.dumps(chunk))
+    assert restored.fp == str(path)
+    assert restored.read() == b"\x01\x02"
+    with pytest.raises(TypeError):
+        pickle.dumps(FileSlice(io.BytesIO(), 0, 0))
+
+
 def test_write_length_block() -> None:
     data = b"\x00\x00\x00\x07\x01\x01\x01\x01\x01\x01\x01\x00"
     body = data[4:11]
@@ -63,6 +182,89 @@ def test_write_length_block() -> None:
         assert f.tell() == 12
 
 
+@pytest.mark.parametrize("padding", [1, 2, 4])
+def test_write_length_block_unseekable(padding: int) -> None:
+    def writer(f: Any) -> int:
+        written = write_bytes(f, b"\x01\x02\x03")
+        return written + write_length_block(f, lambda g: write_bytes(g, b"\x04"))
+
+    with io.BytesIO() as f:
+        expected = write_length_block(f, writer, padding=padding)
+        data = f.getvalue()
+    with UnseekableBytesIO() as f:
+        stream: Any = SequentialWriter(f)
+        assert write_length_block(stream, writer, padding=padding) == (expected)
+        assert f.getvalue() == data
+
+
+def test_size_counter() -> None:
+    counter = SizeCounter()
+    assert counter.write(b"\x00\x01") == 2
+    assert counter.seek(8) == 8
+    assert counter.seek(-4, io.SEEK_CUR) == 4
+    assert (counter.tell(), counter.size) == (4, 8)
+    assert counter.seek(1, io.SEEK_END) == 9
+
+
+def test_sequential_writer() -> None:
+    class PartialWriter(io.RawIOBase):
+        def __init__(self) -> None:
+            self.data = b""
+
+        def write(self, data: Any) -> int:
+            self.data += bytes(data[:2])
+            return min(2, len(data))
+
+    raw = PartialWriter()
+    writer = SequentialWriter(raw)
+    assert not writer.seekable()
+    assert writer.write(b"\x00\x01\x02\x03\x04") == 5
+    assert writer.tell() == 5
+    assert raw.data == b"\x00\x01\x02\x03\x04"
+
+
+def test_file_slice_write_to(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"\x00\x01\x02\x03")
+    chunk = FileSlice(str(path), 1, 3)
+    with io.BytesIO() as f:
+        assert write_bytes(f, chunk) == 3
+        assert f.getvalue() == b"\x01\x02\x03"
+    counter: Any = SizeCounter()
+    path.unlink()  # Sizing must not touch the file.
+    assert write_bytes(counter, chunk) == 3
+    assert counter.size == 3
+
+
+@pytest.mark.parametrize("kernel_copy", [True, False])
+def test_file_slice_write_to_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, kernel_copy: bool
+) -> None:
+    source = tmp_path / "source.bin"
+    source.write_bytes(bytes(range(16)))
+    if not kernel_copy:
+
+        def fail(*args: Any) -> int:
+            raise OSError(errno.ENOSYS, "Not supported")
+
+        monkeypatch.setattr(os, "copy_file_range", fail, raising=False)
+        monkeypatch.setattr(os, "sendfile", fail, raising=False)
+
+    output = tmp_path / "output.bin"
+    with open(source, "rb") as src, open(output, "wb") as f:
+        f.write(b"\xff")  # Buffered data is flushed before the copy.
+        assert write_bytes(f, FileSlice(src, 2, 4)) == 4
+        assert f.tell() == 5
+        assert src.tell() == 0
+        f.write(b"\xfe")
+        assert write_bytes(f, FileSlice(str(source), 12, 4)) == 4
+    assert output.read_bytes() == b"\xff\x02\x03\x04\x05\xfe\x0c\x0d\x0e\x0f"
+
+    with open(output, "wb") as f:
+        with pytest.raises(IOError):
+            write_bytes(f, FileSlice(str(source), 12, 8))
+
+
 @pytest.mark.parametrize(
     ["fixture", "padding"],
     [
@@ -0,0 +1,94 @@
+import gc
+
+import numpy as np
+import pytest
+
+from psd_tools.api.psd_image import PSDImage
+from psd_tools.constants import Compression
+from psd_tools.psd.channel_cache import ChannelCache, set_channel_cache
+from psd_tools.psd.layer_and_mask import ChannelData
+
+from ..utils import full_name
+
+RAW = bytes(range(16)) * 4  # 8x8 channel.
+
+
+def make_channel() -> ChannelData:
+    channel = ChannelData(Compression.RLE)
+    channel.set_data(RAW, 8, 8, 8)
+    return channel
+
+
+def test_channel_cache_data() -> None:
+    cache = ChannelCache()
+    channel = make_channel()
+    data = channel.get_data(8, 8, 8, cache=cache)
+    assert data == RAW
+    assert channel.get_data(8, 8, 8, cache=cache) is data
+    assert cache.size == len(RAW)
+
+    # Rows are part of the key.
+    channel.get_data(8, 8, 8, rows=(2, 4), cache=cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_channel_cache_array() -> None:
+    cache = ChannelCache()
+    channel = make_channel()
+    array = channel.get_array(8, 8, 8, cache=cache)
+    assert not array.flags.writeable
+    assert channel.get_array(8, 8, 8, cache=cache) is array
+    assert channel.get_array(8, 8, 8, dtype=np.float64, cache=cache) is not array
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_channel_cache_bitmap() -> None:
+    process_cache = ChannelCache()
+    set_channel_cache(process_cache)
+    try:
+        cache = ChannelCache()
+        channel = ChannelData(Compression.RLE)
+        channel.set_data(RAW[:22], 11, 11, 1)
+        channel.get_array(11, 11, 1, rows=(0, 4), cache=cache)
+        channel.get_array(11, 11, 1, rows=(4, 11), cache=cache)
+    finally:
+        set_channel_cache(None)
+    assert len(process_cache) == 0
+    # The packed channel is decoded once for both row ranges.
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_channel_cache_set_data() -> None:
+    cache = ChannelCache()
+    channel = make_channel()
+    channel.get_data(8, 8, 8, cache=cache)
+    channel.set_data(RAW[::-1], 8, 8, 8)
+    assert len(cache) == 0
+    assert channel.get_data(8, 8, 8, cache=cache) == RAW[::-1]
+
+
+def test_channel_cache_collected() -> None:
+    cache = ChannelCache()
+    channel = make_channel()
+    channel.get_data(8, 8, 8, cache=cache)
+    del channel
+    gc.collect()
+    assert (len(cache), cache.size) == (0, 0)
+
+
+@pytest.mark.parametrize("filename", ["clipping-mask.psd", "masks.psd"])
+def test_channel_cache_document(filename: str) -> None:
+    expected = PSDImage.open(full_name(filename))
+    cache = ChannelCache()
+    psd = PSDImage.open(full_name(filename), channel_cache=cache)
+    for layer, expected_layer in zip(psd.descendants(), expected.descendants()):
+        for channel in (None, "shape", "mask"):
+            for _ in range(2):
+                array = layer.numpy(channel)
+                expected_array = expected_layer.numpy(channel)
+                if expected_array is None:
+                    assert array is None
+                else:
+                    assert np.array_equal(array, expected_array)  # type: ignore[arg-type]
+    assert cache.hits > 0
+    assert cache.hits >= cache.misses
@@ -1,8 +1,12 @@
 from typing import Any, Type
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from psd_tools.psd import descriptor
+from psd_tools.psd.bin_utils import BufferReader
 from psd_tools.psd.descriptor import (
     TYPES,
     Bool,
@@ -40,6 +44,71 @@ def test_descriptor_display(filename: str) -> None:
         Descriptor.frombytes(f.read())
 
 
+@pytest.mark.parametrize("filename", DESCRIPTOR_DATA)
+def test_descriptor_parser(filename: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("psd_tools.psd._descriptor")
+    with open(os.path.join(TEST_ROOT, "descriptors", filename), "rb") as f:
+        data = f.read()
+    with monkeypatch.context() as m:
+        m.setattr(descriptor, "_parser", None)
+        expected = Descriptor.frombytes(data)
+
+    assert Descriptor.frombytes(data) == expected
+    with BufferReader(b"\x00" + data) as f:
+        f.seek(1)
+        assert Descriptor.read(f) == expected
+        assert f.tell() == len(data) + 1
+
+    # Malformed input is left to the Python reader.
+    with monkeypatch.context() as m:
+        m.setattr(descriptor, "_parser", None)
+        with pytest.raises(Exception) as expected_error:
+            Descriptor.frombytes(data[:-3])
+    with pytest.raises(expected_error.type):
+        Descriptor.frombytes(data[:-3])
+
+
+def test_descriptor_parser_reentrant() -> None:
+    _descriptor = pytest.importorskip("psd_tools.psd._descriptor")
+    with open(os.path.join(TEST_ROOT, "descriptors", "0.dat"), "rb") as f:
+        nested = f.read()
+    value = Descriptor(classID=b"null")
+    value[b"Wdth"] = UnitFloat(unit=Unit.Pixels, value=3.0)
+    value[b"Nm  "] = String("name")
+    data = value.tobytes()
+
+    # Callbacks, such as read_unit, may run another parse with the same
+    # parser, as another thread would.
+    def read_unit(code: bytes) -> Any:
+        parser.read_body(nested, 0)
+        return descriptor.read_unit(code)
+
+    types = {key.value: kls for key, kls in TYPES.items()}
+    parser = _descriptor.Parser(types, set(), read_unit)
+    body, end = parser.read_body(data, 0)
+    assert Descriptor(**body) == value
+    assert end == len(data)
+
+
+def test_descriptor_parser_threads() -> None:
+    pytest.importorskip("psd_tools.psd._descriptor")
+    data = []
+    for filename in DESCRIPTOR_DATA:
+        with open(os.path.join(TEST_ROOT, "descriptors", filename), "rb") as f:
+            data.append(f.read())
+    expected = [Descriptor.frombytes(value) for value in data]
+
+    # Switch threads often so that they interleave within a descriptor.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(Descriptor.frombytes, data * 200))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert results == expected * 200
+
+
 @pytest.mark.parametrize(
     "fixture",
     [
@@ -33,6 +33,32 @@ def test_tokenizer_item(fixture: bytes, token_type: int) -> None:
     assert o_token_type == token_type
 
 
+def test_tokenizer_types() -> None:
+    fixture = (
+        b"<< /Key [ true false 1 -2 .5 -1.25 ] (hwid) --(.-0 "
+        b"(\xfe\xff\x00a\\)\x00)\n>>\x00\x00"
+    )
+    assert list(Tokenizer(fixture)) == [
+        (b"<<", EngineToken.DICT_START),
+        (b"/Key", EngineToken.PROPERTY),
+        (b"[", EngineToken.ARRAY_START),
+        (b"true", EngineToken.BOOLEAN),
+        (b"false", EngineToken.BOOLEAN),
+        (b"1", EngineToken.NUMBER),
+        (b"-2", EngineToken.NUMBER),
+        (b".5", EngineToken.NUMBER_WITH_DECIMAL),
+        (b"-1.25", EngineToken.NUMBER_WITH_DECIMAL),
+        (b"]", EngineToken.ARRAY_END),
+        (b"(hwid)", EngineToken.UNKNOWN_TAG),
+        (b"--(.-0", EngineToken.UNKNOWN_TAG2),
+        (b"(\xfe\xff\x00a\\)\x00)", EngineToken.STRING),
+        (b">>\x00\x00", EngineToken.DICT_END),
+    ]
+
+    with pytest.raises(ValueError):
+        list(Tokenizer(b"<< 1.2.3 >>"))
+
+
 @pytest.mark.parametrize(
     "filename, indent, write",
     [
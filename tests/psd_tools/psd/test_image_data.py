@@ -1,8 +1,14 @@
+import io
+import zlib
 from typing import Any, List
 
+import numpy as np
 import pytest
 
+from psd_tools.compression import PSDDecompressionWarning
 from psd_tools.constants import Compression
+from psd_tools.psd.bin_utils import FileSlice
+from psd_tools.psd import image_data as image_data_module
 from psd_tools.psd.header import FileHeader
 from psd_tools.psd.image_data import ImageData
 
@@ -72,3 +78,102 @@ def test_image_data_data(compression: int, data: List[bytes], header: Any) -> No
     image_data.set_data(data, header)
     output = image_data.get_data(header)
     assert output == data, "output=%r, expected=%r" % (output, data)
+    for start, stop in [(0, header.height), (1, header.height), (1, 2), (2, 2)]:
+        output = image_data.get_data(header, rows=(start, stop))
+        row_size = len(data[0]) // header.height
+        expected = [x[start * row_size : stop * row_size] for x in data]
+        assert output == expected
+
+
+@pytest.mark.parametrize(
+    "compression", [Compression.ZIP, Compression.ZIP_WITH_PREDICTION]
+)
+@pytest.mark.parametrize("depth", [8, 16, 32])
+def test_image_data_rows_zip(
+    compression: Compression, depth: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    header = FileHeader(width=5, height=6, depth=depth, channels=4, version=1)
+    size = 5 * 6 * depth // 8
+    data = [bytes((i * 7 + j) % 256 for j in range(size)) for i in range(4)]
+    image_data = ImageData(compression)
+    image_data.set_data(data, header)
+
+    calls = []
+    decompress = image_data_module.decompress
+
+    def counting_decompress(*args: Any, **kwargs: Any) -> bytes:
+        calls.append(kwargs.get("rows"))
+        return decompress(*args, **kwargs)
+
+    monkeypatch.setattr(image_data_module, "decompress", counting_decompress)
+    row_size = 5 * depth // 8
+    for start, stop in [(0, 6), (2, 5), (3, 3)]:
+        calls.clear()
+        output = image_data.get_data(header, rows=(start, stop))
+        assert output == [x[start * row_size : stop * row_size] for x in data]
+        assert len(calls) == 1
+
+
+def test_image_data_auto() -> None:
+    header = FileHeader(width=3, height=3, depth=8, channels=3, version=1)
+    image_data = ImageData(Compression.AUTO)
+    image_data.set_data([RAW_IMAGE_3x3_8bit] * 3, header)
+    assert image_data.compression != Compression.AUTO
+    assert image_data.get_data(header) == [RAW_IMAGE_3x3_8bit] * 3
+
+
+@pytest.mark.parametrize(
+    "compression",
+    [
+        Compression.RAW,
+        Compression.RLE,
+        Compression.ZIP,
+        Compression.ZIP_WITH_PREDICTION,
+    ],
+)
+@pytest.mark.parametrize("depth, dtype", [(8, ">u1"), (16, ">u2"), (32, ">f4")])
+@pytest.mark.parametrize("version", [1, 2])
+def test_image_data_iter_bands(
+    compression: Compression, depth: int, dtype: str, version: int
+) -> None:
+    header = FileHeader(width=5, height=7, depth=depth, channels=3, version=version)
+    expected = np.arange(5 * 7 * 3).reshape((3, 7, 5)).astype(dtype)
+    image_data = ImageData(compression)
+    image_data.set_data([plane.tobytes() for plane in expected], header)
+    expected = expected.transpose((1, 2, 0))
+
+    for band_height in (1, 3, 7, 100):
+        bands = list(image_data.iter_bands(header, band_height))
+        assert len(bands) == -(-7 // band_height)
+        assert all(band.dtype.isnative for band in bands)
+        assert np.array_equal(np.concatenate(bands), expected)
+
+    # Data left in the file is read band by band.
+    stream = io.BytesIO(b"\x00" * 3 + bytes(image_data.data))
+    image_data.data = FileSlice(stream, 3, len(image_data.data))  # type: ignore[assignment]
+    assert np.array_equal(
+        np.concatenate(list(image_data.iter_bands(header, 2))), expected
+    )
+
+
+def test_image_data_iter_bands_1bit() -> None:
+    header = FileHeader(width=10, height=2, depth=1, channels=1, version=1)
+    image_data = ImageData(Compression.RAW)
+    image_data.set_data([b"\xf0\x40\x01\x80"], header)
+    (band,) = image_data.iter_bands(header)
+    assert band[:, :, 0].tolist() == [
+        [1, 1, 1, 1, 0, 0, 0, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 0, 1, 1, 0],
+    ]
+
+
+def test_image_data_iter_bands_truncated() -> None:
+    header = FileHeader(width=4, height=4, depth=8, channels=2, version=1)
+    image_data = ImageData(Compression.ZIP)
+    image_data.set_data([bytes(range(1, 17))] * 2, header)
+    image_data.data = zlib.compress(bytes(range(1, 17)) + bytes(range(1, 9)))
+    with pytest.warns(PSDDecompressionWarning):
+        bands = list(image_data.iter_bands(header, 2))
+    array = np.concatenate(bands)
+    assert array[:, :, 0].ravel().tolist() == list(range(1, 17))
+    assert array[2:, :, 1].max() == 0
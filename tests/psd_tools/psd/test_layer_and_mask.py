@@ -1,10 +1,14 @@
 from typing import Any, Tuple
 import io
 import logging
+import os
 
+import numpy as np
 import pytest
 
 from psd_tools.constants import ChannelID, Compression, Tag
+from psd_tools.psd import PSD
+from psd_tools.psd.bin_utils import FileSlice
 from psd_tools.psd.layer_and_mask import (
     ChannelData,
     ChannelDataList,
@@ -23,7 +27,7 @@ from psd_tools.psd.layer_and_mask import (
 )
 from psd_tools.psd.tagged_blocks import IntegerElement, TaggedBlock, TaggedBlocks
 
-from ..utils import check_read_write, check_write_read
+from ..utils import TEST_ROOT, check_read_write, check_write_read
 
 logger = logging.getLogger(__name__)
 
@@ -288,6 +292,100 @@ def test_channel_data() -> None:
     check_write_read(ChannelData(data=b"\xff" * 8), length=8)
 
 
+@pytest.mark.parametrize(
+    "depth, dtype, expected_dtype",
+    [
+        (8, None, np.uint8),
+        (16, None, np.uint16),
+        (16, ">u2", ">u2"),
+        (16, np.float32, np.float32),
+        (32, None, np.float32),
+    ],
+)
+def test_channel_data_get_array(depth: int, dtype: Any, expected_dtype: Any) -> None:
+    samples = np.arange(6).reshape((2, 3))
+    raw = samples.astype({8: ">u1", 16: ">u2", 32: ">f4"}[depth]).tobytes()
+    channel = ChannelData(Compression.RLE)
+    channel.set_data(raw, 3, 2, depth)
+    array = channel.get_array(3, 2, depth, dtype=dtype)
+    assert array.dtype == np.dtype(expected_dtype)
+    assert np.array_equal(array, samples)
+    array = channel.get_array(3, 2, depth, dtype=dtype, rows=(1, 2))
+    assert np.array_equal(array, samples[1:])
+
+
+@pytest.mark.parametrize("compression", [Compression.RAW, Compression.RLE])
+def test_channel_data_get_array_bitmap(compression: Compression) -> None:
+    samples = np.random.RandomState(0).randint(0, 2, (3, 11), dtype=np.uint8)
+    raw = np.packbits(samples, axis=1).tobytes()
+    channel = ChannelData(compression)
+    channel.set_data(raw, 11, 3, 1)
+    array = channel.get_array(11, 3, 1)
+    assert array.shape == (3, 11)
+    assert np.array_equal(array, samples)
+    array = channel.get_array(11, 3, 1, rows=(1, 3))
+    assert np.array_equal(array, samples[1:])
+
+
+@pytest.mark.parametrize(
+    "compression",
+    [Compression.RAW, Compression.RLE, Compression.ZIP_WITH_PREDICTION],
+)
+@pytest.mark.parametrize("version", [1, 2])
+def test_channel_data_get_data_rows_file(
+    compression: Compression, version: int, tmp_path: Any, monkeypatch: Any
+) -> None:
+    width, height = 64, 50
+    rng = np.random.RandomState(0)
+    samples = rng.randint(0, 1000, (height, width)).astype(">u2")
+    channel = ChannelData(compression)
+    channel.set_data(samples.tobytes(), width, height, 16, version)
+    path = tmp_path / "channel.bin"
+    path.write_bytes(b"\0" * 10 + channel._data)
+    stored = ChannelData(
+        compression, data=FileSlice(str(path), 10, len(channel._data)), offset=8
+    )
+
+    read = []
+    file_slice_read = FileSlice.read
+
+    def counting_read(self: FileSlice) -> bytes:
+        read.append(self.length)
+        return file_slice_read(self)
+
+    monkeypatch.setattr(FileSlice, "read", counting_read)
+    data = stored.get_data(width, height, 16, version, rows=(20, 23))
+    assert data == samples[20:23].tobytes()
+    array = stored.get_array(width, height, 16, version, rows=(45, 50))
+    assert np.array_equal(array, samples[45:])
+    if compression != Compression.ZIP_WITH_PREDICTION:
+        assert sum(read) < len(channel._data) // 4
+
+
+@pytest.mark.parametrize("compression", [Compression.RAW, Compression.RLE])
+def test_channel_data_get_data_rows(compression: Compression) -> None:
+    raw = bytes(range(12))
+    channel = ChannelData(compression)
+    channel.set_data(raw, 3, 4, 8)
+    assert channel.get_data(3, 4, 8, rows=(1, 3)) == raw[3:9]
+    assert channel.get_data(3, 4, 8, rows=(4, 4)) == b""
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"\xff" * 64 * 32, Compression.RLE),
+        (bytes(range(64)) * 32, Compression.ZIP_WITH_PREDICTION),
+    ],
+)
+def test_channel_data_auto(raw: bytes, expected: Compression) -> None:
+    channel = ChannelData(Compression.AUTO)
+    channel.set_data(raw, 64, 32, 8)
+    assert channel.compression == expected
+    assert channel.get_data(64, 32, 8) == raw
+    check_write_read(channel, length=channel._length)
+
+
 def test_channel_data_list_zero_length_channel() -> None:
     """Zero-length channel must not advance the file pointer (issue #398).
 
@@ -348,5 +446,44 @@ def test_channel_data_data(
     assert output == data, "output=%r, expected=%r" % (output, data)
 
 
+def test_channel_data_offset() -> None:
+    with io.BytesIO(b"\xff\x00\x01\x02\x03") as f:
+        f.seek(1)
+        channel = ChannelData.read(f, 3)
+    assert channel.offset == 1
+    assert channel.compression == Compression.RLE
+    channel.data = b"\x00"
+    assert channel.offset is None
+
+
+def test_channel_data_identity() -> None:
+    channel = ChannelData(Compression.RAW, b"\x00")
+    identity = channel._identity
+    assert channel._identity == identity
+    assert ChannelData(Compression.RAW, b"\x00")._identity != identity
+    assert channel == ChannelData(Compression.RAW, b"\x00")
+    channel.data = b"\x00"
+    assert channel._identity != identity
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["colormodes/4x4_8bit_rgb.psd", "colormodes/4x4_16bit_rgb.psd", "gray0.psb"],
+)
+def test_layer_info_channel_index(filename: str) -> None:
+    with open(os.path.join(TEST_ROOT, "psd_files", filename), "rb") as f:
+        data = f.read()
+    psd = PSD.frombytes(data)
+    layer_info = psd._get_layer_info()
+    assert layer_info is not None
+    index = layer_info.channel_index
+    assert len(index) == len(layer_info.layer_records)
+    for locations, channels in zip(index, layer_info.channel_image_data):
+        for location, channel in zip(locations, channels):
+            block = data[location.offset : location.offset + location.length]
+            assert block == channel.tobytes()
+            assert int.from_bytes(block[:2], "big") == location.compression
+
+
 def test_global_layer_mask_info() -> None:
     check_write_read(GlobalLayerMaskInfo())
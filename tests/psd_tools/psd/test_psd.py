@@ -1,10 +1,12 @@
 import io
 import os
+from pathlib import Path
 
 import pytest
 from psd_tools.psd import PSD
+from psd_tools.psd.bin_utils import BufferReader, FileSlice
 
-from ..utils import TEST_ROOT, all_files, check_write_read
+from ..utils import TEST_ROOT, UnseekableBytesIO, all_files, check_write_read
 
 # It seems some fixtures made outside of Photoshop has different paddings.
 BAD_PADDINGS = {
@@ -71,6 +73,90 @@ def test_psd_read_write(filename: str) -> None:
     assert output == expected
 
 
+@pytest.mark.parametrize(
+    "filename",
+    [f for f in all_files() if os.path.basename(f) not in SKIP_BYTE_ROUND_TRIP],
+)
+def test_psd_read_write_buffer_reader(filename: str) -> None:
+    """Zero-copy parsing writes back the same bytes as the copying parser."""
+    with open(filename, "rb") as f:
+        expected = f.read()
+
+    with io.BytesIO(expected) as f:
+        psd = PSD.read(f)
+    zero_copy_psd = PSD.read(BufferReader(expected))
+    assert isinstance(zero_copy_psd.image_data.data, memoryview)
+    assert zero_copy_psd == psd
+
+    padding = BAD_PADDINGS.get(os.path.basename(filename), 4)
+    assert zero_copy_psd.tobytes(padding=padding) == psd.tobytes(padding=padding)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [f for f in all_files() if os.path.basename(f) not in SKIP_BYTE_ROUND_TRIP],
+)
+def test_psd_read_write_lazy(filename: str) -> None:
+    """Undecoded tagged blocks are written back verbatim."""
+    with open(filename, "rb") as f:
+        expected = f.read()
+
+    psd = PSD.frombytes(expected)
+    lazy_psd = PSD.frombytes(expected, lazy=True)
+    padding = BAD_PADDINGS.get(os.path.basename(filename), 4)
+    assert lazy_psd.tobytes(padding=padding) == expected
+    for (layer, _), (lazy_layer, _) in zip(psd._iter_layers(), lazy_psd._iter_layers()):
+        assert list(lazy_layer.tagged_blocks.items()) == list(
+            layer.tagged_blocks.items()
+        )
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [f for f in all_files() if os.path.basename(f) not in SKIP_BYTE_ROUND_TRIP],
+)
+def test_psd_read_write_structure_only(filename: str) -> None:
+    """Skipped pixel data is read back from the file on write."""
+    with open(filename, "rb") as f:
+        psd = PSD.read(f)
+        f.seek(0)
+        structure = PSD.read(f, load_pixels=False)
+        assert isinstance(structure.image_data._data, FileSlice)
+        padding = BAD_PADDINGS.get(os.path.basename(filename), 4)
+        assert structure.tobytes(padding=padding) == psd.tobytes(padding=padding)
+    # The slices fall back to the path once the file object is closed.
+    assert structure.image_data.data == psd.image_data.data
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [f for f in all_files() if os.path.basename(f) not in SKIP_BYTE_ROUND_TRIP],
+)
+def test_psd_read_write_incremental(filename: str, tmp_path: Path) -> None:
+    """Untouched blocks and channel data are copied from the source file."""
+    with open(filename, "rb") as f:
+        expected = f.read()
+        f.seek(0)
+        psd = PSD.read(f, lazy=True, load_pixels=False)
+
+    padding = BAD_PADDINGS.get(os.path.basename(filename), 4)
+    output = tmp_path / "output.psd"
+    with open(output, "wb") as f:
+        psd.write(f, padding=padding)
+    assert output.read_bytes() == expected
+
+
+@pytest.mark.parametrize("filename", all_files())
+def test_psd_write_unseekable(filename: str) -> None:
+    with open(filename, "rb") as f:
+        psd = PSD.read(f)
+    with UnseekableBytesIO() as f:
+        written = psd.write(f)
+        output = f.getvalue()
+    assert written == len(output)
+    assert output == psd.tobytes()
+
+
 @pytest.mark.parametrize("filename", all_files())
 def test_psd_write_read(filename: str) -> None:
     with open(filename, "rb") as f:
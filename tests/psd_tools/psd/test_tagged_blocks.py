@@ -48,6 +48,23 @@ def test_tagged_blocks_v2() -> None:
     check_read_write(TaggedBlocks, fixture, version=2, padding=4)
 
 
+def test_tagged_blocks_lazy() -> None:
+    filepath = os.path.join(TEST_ROOT, "tagged_blocks", "tagged_blocks_v2.dat")
+    with open(filepath, "rb") as f:
+        fixture = f.read()
+    expected = TaggedBlocks.frombytes(fixture, version=2, padding=4)
+    blocks = TaggedBlocks.frombytes(fixture, version=2, padding=4, lazy=True)
+    assert all(block._pending == 2 for block in blocks._items.values())
+    assert blocks.tobytes(version=2, padding=4) == fixture
+    assert all(block._pending == 2 for block in blocks._items.values())
+
+    key = next(iter(blocks))
+    assert blocks.get_data(key) == expected.get_data(key)
+    assert blocks._items[key]._pending is None
+    assert list(blocks.values()) == list(expected.values())
+    assert blocks.tobytes(version=2, padding=4) == fixture
+
+
 @pytest.mark.parametrize(
     "key, data, version, padding",
     [
@@ -0,0 +1,132 @@
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from psd_tools.api.psd_image import PSDImage
+from psd_tools.composite import composite
+from psd_tools.composite.render_cache import (
+    RenderCache,
+    get_render_cache,
+    set_render_cache,
+)
+from psd_tools.constants import Compression
+from psd_tools.lru_cache import LRUCache
+from psd_tools.psd.channel_cache import (
+    ChannelCache,
+    get_channel_cache,
+    set_channel_cache,
+)
+from psd_tools.psd.layer_and_mask import ChannelData
+
+from .utils import full_name
+
+Lookup = Callable[[Any, str, int], Any]
+
+
+class Owner:
+    pass
+
+
+def channel_lookup() -> Lookup:
+    owners: dict[str, Owner] = {}
+
+    def lookup(cache: ChannelCache, key: str, size: int) -> Any:
+        owner = owners.setdefault(key, Owner())
+        return cache.get(owner, "array", lambda: np.zeros(size, np.uint8))
+
+    return lookup
+
+
+def render_lookup() -> Lookup:
+    def lookup(cache: RenderCache, key: str, size: int) -> Any:
+        return cache.get(key, lambda: (np.zeros(size, np.uint8), 1.0, None))
+
+    return lookup
+
+
+def channel_user() -> Callable[[], None]:
+    channel = ChannelData(Compression.RLE)
+    channel.set_data(bytes(64), 8, 8, 8)
+    return lambda: channel.get_data(8, 8, 8)
+
+
+def render_user() -> Callable[[], None]:
+    psd = PSDImage.open(full_name("clipping-mask.psd"))
+    return lambda: composite(psd)
+
+
+CACHES = [
+    pytest.param(ChannelCache, channel_lookup, id="channel"),
+    pytest.param(RenderCache, render_lookup, id="render"),
+]
+
+
+@pytest.mark.parametrize("kls, make_lookup", CACHES)
+def test_lru_cache_hit_and_miss(kls: type[LRUCache], make_lookup: Callable) -> None:
+    cache = kls()
+    lookup = make_lookup()
+    value = lookup(cache, "a", 16)
+    assert lookup(cache, "a", 16) is value
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (len(cache), cache.size) == (1, 16)
+    array = value[0] if isinstance(value, tuple) else value
+    assert not array.flags.writeable
+    assert "hits=1" in repr(cache)
+
+    cache.clear()
+    assert (len(cache), cache.size) == (0, 0)
+
+
+@pytest.mark.parametrize("kls, make_lookup", CACHES)
+def test_lru_cache_eviction(kls: type[LRUCache], make_lookup: Callable) -> None:
+    cache = kls(max_bytes=32)
+    lookup = make_lookup()
+    for key in ("a", "b", "c"):
+        lookup(cache, key, 16)
+    assert (len(cache), cache.evictions) == (2, 1)
+    assert cache.size <= cache.max_bytes
+
+    # The first entry was the least recently used one.
+    lookup(cache, "b", 16)
+    assert cache.hits == 1
+    lookup(cache, "a", 16)
+    assert (cache.hits, cache.evictions) == (1, 2)
+
+    # Entries larger than the budget are not cached.
+    lookup(cache, "d", 33)
+    assert (len(cache), cache.misses) == (2, 5)
+
+
+@pytest.mark.parametrize("kls", [ChannelCache, RenderCache])
+def test_lru_cache_invalid(kls: type[LRUCache]) -> None:
+    with pytest.raises(ValueError):
+        kls(max_bytes=-1)
+
+
+@pytest.mark.parametrize(
+    "kls, set_cache, get_cache, make_user",
+    [
+        (ChannelCache, set_channel_cache, get_channel_cache, channel_user),
+        (RenderCache, set_render_cache, get_render_cache, render_user),
+    ],
+)
+def test_lru_cache_process_wide(
+    kls: type[LRUCache],
+    set_cache: Callable[[Any], None],
+    get_cache: Callable[[], Any],
+    make_user: Callable[[], Callable[[], None]],
+) -> None:
+    use = make_user()
+    cache = kls()
+    set_cache(cache)
+    try:
+        assert get_cache() is cache
+        use()
+        misses = cache.misses
+        use()
+    finally:
+        set_cache(None)
+    assert get_cache() is None
+    assert cache.misses == misses
+    assert cache.hits > 0
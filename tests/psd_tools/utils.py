@@ -51,6 +51,19 @@ def all_files() -> List[str]:
     return [f for f in find_files() if f.find("third-party-psds") < 0]
 
 
+class UnseekableBytesIO(io.BytesIO):
+    """In-memory output that cannot seek, like a pipe or socket."""
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args: Any) -> int:
+        raise io.UnsupportedOperation("seek")
+
+    def tell(self) -> int:
+        raise io.UnsupportedOperation("tell")
+
+
 def check_write_read(element: T, *args: Any, **kwargs: Any) -> None:
     f = io.BytesIO()
     element.write(f, *args, **kwargs)
@@ -0,0 +1,242 @@
+"""
+Benchmark of the channel codecs on synthetic and real channels.
+
+Measures the throughput of :py:func:`psd_tools.compression.compress` and
+:py:func:`psd_tools.compression.decompress` for every compression at 1, 8, 16
+and 32-bit depth. The synthetic channels are flat, noise, gradient and
+photo-like images. The real channels are the layer channels of the PSD
+fixtures in ``tests/psd_files``. The compiled RLE codec is also compared with
+the pure-Python one. Throughput is in MB/s of raw channel data. Results are
+printed as JSON.
+
+Usage:
+
+    python tools/benchmark_codecs.py [--repeat N] [--size WxH] [FILE ...]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from psd_tools.api.psd_image import PSDImage
+from psd_tools.compression import compress, decompress, rle, rle_impl
+from psd_tools.constants import Compression
+
+TEST_ROOT = os.path.join(os.path.dirname(__file__), os.pardir, "tests")
+
+DEPTHS = (1, 8, 16, 32)
+COMPRESSIONS = (
+    Compression.RAW,
+    Compression.RLE,
+    Compression.ZIP,
+    Compression.ZIP_WITH_PREDICTION,
+)
+
+# Layer channels smaller than this are skipped; their timings are noise.
+MIN_CHANNEL_PIXELS = 64 * 64
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(size: int, seconds: float) -> float | None:
+    """MB/s, or None when the timing is below the clock resolution."""
+    return round(size / seconds / 1e6, 2) if seconds > 0 else None
+
+
+def synthetic(width: int, height: int) -> Iterator[tuple[str, np.ndarray]]:
+    """Yield channels as float arrays in [0, 1]."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width] / max(width, height)
+    yield "flat", np.full((height, width), 0.5)
+    yield "noise", rng.random((height, width))
+    yield "gradient", x
+    # Smooth shading with a few hard edges and sensor noise.
+    photo = 0.5 + 0.25 * np.sin(6 * x) * np.cos(4 * y) + 0.2 * (x + y > 0.8)
+    photo += rng.normal(0, 0.01, (height, width))
+    yield "photo", np.clip(photo, 0, 1)
+
+
+def to_bytes(channel: np.ndarray, depth: int) -> bytes:
+    if depth == 1:
+        return np.packbits(channel > 0.5, axis=1).tobytes()
+    if depth == 8:
+        return np.round(channel * 255).astype(">u1").tobytes()
+    if depth == 16:
+        return np.round(channel * 65535).astype(">u2").tobytes()
+    return channel.astype(">f4").tobytes()
+
+
+def benchmark(
+    data: bytes, width: int, height: int, depth: int, version: int, repeat: int
+) -> Iterator[dict[str, Any]]:
+    """Benchmark every compression that supports the depth."""
+    for kind in COMPRESSIONS:
+        if depth == 1 and kind == Compression.ZIP_WITH_PREDICTION:
+            continue
+        encoded = compress(data, kind, width, height, depth, version)
+        yield {
+            "compression": kind.name,
+            "raw_bytes": len(data),
+            "compressed_bytes": len(encoded),
+            "compress_seconds": measure(
+                lambda: compress(data, kind, width, height, depth, version), repeat
+            ),
+            "decompress_seconds": measure(
+                lambda: decompress(encoded, kind, width, height, depth, version),
+                repeat,
+            ),
+        }
+
+
+def summarize(entry: dict[str, Any]) -> dict[str, Any]:
+    entry["ratio"] = round(entry["compressed_bytes"] / entry["raw_bytes"], 4)
+    entry["compress_mbps"] = throughput(entry["raw_bytes"], entry["compress_seconds"])
+    entry["decompress_mbps"] = throughput(
+        entry["raw_bytes"], entry["decompress_seconds"]
+    )
+    return entry
+
+
+def run_synthetic(width: int, height: int, repeat: int) -> list[dict[str, Any]]:
+    results = []
+    for name, channel in synthetic(width, height):
+        for depth in DEPTHS:
+            data = to_bytes(channel, depth)
+            for entry in benchmark(data, width, height, depth, 1, repeat):
+                entry.update(corpus="synthetic", name=name, depth=depth)
+                results.append(summarize(entry))
+    return results
+
+
+def run_files(filenames: list[str], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark the layer channels of each file, summed per compression."""
+    results = []
+    for filename in filenames:
+        try:
+            psd = PSDImage.open(filename)
+        except Exception as e:
+            print("Skipping %s: %s" % (filename, e), file=sys.stderr)
+            continue
+        totals: dict[str, dict[str, Any]] = {}
+        for layer in psd.descendants():
+            width, height = layer.width, layer.height
+            if width * height < MIN_CHANNEL_PIXELS:
+                continue
+            for info, channel in zip(layer._record.channel_info, layer._channels):
+                if info.id < -1 or channel._length <= 2:
+                    continue  # Masks have their own geometry.
+                try:
+                    data = channel.get_data(width, height, psd.depth, psd.version)
+                except ValueError:
+                    continue
+                for entry in benchmark(
+                    data, width, height, psd.depth, psd.version, repeat
+                ):
+                    total = totals.setdefault(
+                        entry["compression"], dict.fromkeys(entry, 0)
+                    )
+                    for key, value in entry.items():
+                        if key != "compression":
+                            total[key] += value
+                    total["compression"] = entry["compression"]
+        name = os.path.relpath(filename, os.path.join(TEST_ROOT, "psd_files"))
+        for entry in totals.values():
+            entry.update(corpus="files", name=name, depth=psd.depth)
+            results.append(summarize(entry))
+    return results
+
+
+def run_rle(width: int, height: int, repeat: int) -> list[dict[str, Any]]:
+    """Compare the RLE implementations on the 8-bit synthetic channels."""
+    implementations = {"python": rle}
+    if rle_impl is not rle:
+        implementations["cython"] = rle_impl
+    results = []
+    for name, channel in synthetic(width, height):
+        data = to_bytes(channel, 8)
+        for label, module in implementations.items():
+            encoded = module.encode_rows(data, height, width, 2)
+            counts = np.frombuffer(encoded, ">u2", height).astype(np.uint32)
+            payload = encoded[2 * height :]
+            out = bytearray(len(data))
+            results.append(
+                {
+                    "name": name,
+                    "implementation": label,
+                    "encode_mbps": throughput(
+                        len(data),
+                        measure(
+                            lambda: module.encode_rows(data, height, width, 2), repeat
+                        ),
+                    ),
+                    "decode_mbps": throughput(
+                        len(data),
+                        measure(
+                            lambda: module.decode_rows(payload, counts, width, out),
+                            repeat,
+                        ),
+                    ),
+                }
+            )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="PSD files, default: fixtures")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--size", default="512x512", help="size of synthetic channels, WxH"
+    )
+    parser.add_argument(
+        "--no-files", action="store_true", help="skip the real channels"
+    )
+    parser.add_argument("--output", help="write the JSON to a file")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    filenames = args.files or sorted(
+        glob.glob(
+            os.path.join(TEST_ROOT, "psd_files", "**", "*.ps[db]"), recursive=True
+        )
+    )
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "rle": "cython" if rle_impl is not rle else "python",
+            "repeat": args.repeat,
+        },
+        "codecs": run_synthetic(width, height, args.repeat)
+        + ([] if args.no_files else run_files(filenames, args.repeat)),
+        "rle": run_rle(width, height, args.repeat),
+    }
+
+    text = json.dumps(report, indent=2, allow_nan=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Benchmark of the compiled descriptor parser against the Python reader.
+
+Parses the descriptors in ``tests/descriptors`` and the PSD fixtures in
+``tests/psd_files`` with both decoders and prints the best time of each.
+The extension must be built first, e.g. ``pip install -e .``.
+
+Usage:
+
+    python tools/benchmark_descriptor.py [--repeat N] [FILE ...]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Any, Callable
+
+from psd_tools.psd import PSD, descriptor
+from psd_tools.psd.descriptor import Descriptor
+
+TEST_ROOT = os.path.join(os.path.dirname(__file__), os.pardir, "tests")
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(
+    label: str, func: Callable[[], Any], parser: Any, repeat: int
+) -> tuple[float, float]:
+    try:
+        descriptor._parser = None
+        python_time = measure(func, repeat)
+    finally:
+        descriptor._parser = parser
+    compiled_time = measure(func, repeat)
+    print(
+        "%-48s %10.2f %10.2f %7.2fx"
+        % (
+            label[-48:],
+            python_time * 1e3,
+            compiled_time * 1e3,
+            python_time / compiled_time,
+        )
+    )
+    return python_time, compiled_time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="PSD files, default: fixtures")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compiled = descriptor._parser
+    if compiled is None:
+        print("The _descriptor extension is not built.", file=sys.stderr)
+        return 1
+
+    descriptor_files = sorted(glob.glob(os.path.join(TEST_ROOT, "descriptors", "*")))
+    psd_files = args.files or sorted(
+        glob.glob(
+            os.path.join(TEST_ROOT, "psd_files", "**", "*.ps[db]"), recursive=True
+        )
+    )
+
+    print("%-48s %10s %10s %8s" % ("file", "python ms", "compiled ms", "speedup"))
+    totals = [0.0, 0.0]
+    for filename in descriptor_files + psd_files:
+        with open(filename, "rb") as f:
+            data = f.read()
+        if filename in descriptor_files:
+            kls: Any = Descriptor
+        else:
+            kls = PSD
+        try:
+            kls.frombytes(data)
+        except Exception as e:
+            print("%s: skipped (%s)" % (filename, e), file=sys.stderr)
+            continue
+        times = run(
+            os.path.relpath(filename, TEST_ROOT),
+            lambda: kls.frombytes(data),
+            compiled,
+            args.repeat,
+        )
+        totals = [total + t for total, t in zip(totals, times)]
+
+    print(
+        "%-48s %10.2f %10.2f %7.2fx"
+        % ("total", totals[0] * 1e3, totals[1] * 1e3, totals[0] / totals[1])
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())